@@ -8,8 +8,9 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from alembic import context
 
-# Import models for 'autogenerate' support
-from app.extensions import Base
+# Import models for 'autogenerate' support (importing the package registers every table)
+import app.models  # noqa: F401
+from app.models.base import Base
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,57 @@
+"""Add indexes for the hot query paths
+
+Revision ID: 957a9d122c01
+Revises: d73c783c4f81
+Create Date: 2026-10-18 09:00:00.000000
+
+Indexes are built with CREATE INDEX CONCURRENTLY so that writes to the
+tables are not blocked while they build. CONCURRENTLY cannot run inside a
+transaction, hence the autocommit block. IF NOT EXISTS makes a re-run after
+an interrupted build safe (an interrupted build leaves an INVALID index
+behind, which has to be dropped by hand first).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '957a9d122c01'
+down_revision: Union[str, Sequence[str], None] = 'd73c783c4f81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns/expressions, extra keyword arguments)
+INDEXES = [
+    # UserRepository.get_by_username: WHERE lower(username) = lower(:username)
+    ('ix_users_username_lower', 'users', [sa.text('lower(username)')], {}),
+    # UserSessionRepository.list_sessions_for_user, with or without revoked sessions
+    ('ix_user_sessions_user_id_last_active', 'user_sessions',
+     ['user_id', sa.text('last_active DESC'), sa.text('session_id DESC')], {}),
+    # Foreign keys used for lookups and joins
+    ('ix_course_registrations_course_id', 'course_registrations', ['course_id'], {}),
+    ('ix_course_registrations_student_id', 'course_registrations', ['student_id'], {}),
+    ('ix_timetables_course_id', 'timetables', ['course_id'], {}),
+    ('ix_timetables_classroom_id', 'timetables', ['classroom_id'], {}),
+    # Course registrations export: JOIN courses ... WHERE semester = :semester
+    ('ix_courses_semester', 'courses', ['semester'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,4 +1,9 @@
 # app/__init__.py
+import time
+
+# Taken when a process first imports the app, for the worker cold-start report
+BOOT_STARTED_AT = time.perf_counter()
+
 from sanic import Sanic
 from sanic_cors import CORS
 
@@ -11,13 +16,25 @@ def register_extensions(sanic_app: Sanic):
 
     extensions.cors = CORS(sanic_app,resources={r"/*": {"origins": "*"}})
 
+    from app.utils.jwt_utils import jwt_handler
+    jwt_handler.init_app(sanic_app)
+
 
 def register_listeners(sanic_app: Sanic):
-    from app.hooks.database import setup_db, close_db
+    from app.hooks.database import check_schema, setup_db, flush_write_behind, close_db
     from app.hooks.caching import setup_redis, close_redis
+    from app.hooks.startup_time import mark_listeners_start, report_cold_start
+
+    # Worker cold-start timing (must stay the first before_server_start listener)
+    sanic_app.register_listener(mark_listeners_start, "before_server_start")
+    sanic_app.register_listener(report_cold_start, "after_server_start")
+
+    # Schema revision/index check, once for all workers
+    sanic_app.register_listener(check_schema, "main_process_start")
 
     # Register database hooks
     sanic_app.register_listener(setup_db, "before_server_start")
+    sanic_app.register_listener(flush_write_behind, "before_server_stop")
     sanic_app.register_listener(close_db, "after_server_stop")
 
     # Register Redis hooks
@@ -33,7 +50,7 @@ def register_views(sanic_app: Sanic):
 def register_hooks(sanic_app: Sanic):
     from app.hooks.request_context import after_request
     from app.hooks.response_time import add_start_time, add_spent_time
-    from app.hooks.database import manage_db_session
+    from app.hooks.database import attach_db_session, release_db_session, route_db_reads
     from app.hooks.caching import inject_redis_client
     from app.hooks.request_auth import auth
 
@@ -45,8 +62,9 @@ def register_hooks(sanic_app: Sanic):
     sanic_app.register_middleware(add_spent_time, attach_to='response')
 
     # 2. Manages DB session lifecycle (commit, rollback, close)
-    # This should wrap the business logic to ensure transactions are handled correctly.
-    sanic_app.register_middleware(manage_db_session)
+    # The session is lazy: a connection is only checked out if the handler uses it.
+    sanic_app.register_middleware(attach_db_session, attach_to='request')
+    sanic_app.register_middleware(release_db_session, attach_to='response')
 
     # 3. Injects Redis client into the request context
     sanic_app.register_middleware(inject_redis_client, attach_to='request')
@@ -54,7 +72,10 @@ def register_hooks(sanic_app: Sanic):
     # 4. Authentication middleware
     sanic_app.register_middleware(auth, attach_to='request')
 
-    # 5. (Innermost) Generic post-request hook
+    # 5. Read replica routing (needs the user id set by `auth`)
+    sanic_app.register_middleware(route_db_reads, attach_to='request')
+
+    # 6. (Innermost) Generic post-request hook
     sanic_app.register_middleware(after_request, attach_to='response')
 
 
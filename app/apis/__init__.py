@@ -1,8 +1,9 @@
 # app/apis/__init__.py
 from sanic import Blueprint
 
+from .admin_bp import admin_bp
 from .auth_bp import auth_bp
 from .user_bp import user_bp
 
 # Group all blueprints under a single API object
-api = Blueprint.group(auth_bp, user_bp)
\ No newline at end of file
+api = Blueprint.group(auth_bp, user_bp, admin_bp)
\ No newline at end of file
@@ -1,7 +1,13 @@
 # app/apis/admin_bp.py
 from sanic import Blueprint
 from app.views.admin.admin_user_view import AdminUserListView, AdminUserDetailView
+from app.views.admin.export_view import (
+    AdminUserExportView, AdminUserSessionExportView, AdminCourseRegistrationExportView
+)
 from app.views.admin.session_management_view import AdminSessionManagementView
+from app.views.admin.system_view import (
+    AdminDatabasePoolView, AdminSlowQueryView, AdminRefreshCoalescingView, AdminCacheStatsView
+)
 
 # All routes in this blueprint will be prefixed with /api/v1/admin
 admin_bp = Blueprint('Admin', url_prefix='/admin')
@@ -18,4 +24,15 @@ admin_bp.add_route(
 admin_bp.add_route(
     AdminSessionManagementView.as_view(),
     '/users/<user_id:int>/sessions/<session_id:int>'
-)
\ No newline at end of file
+)
+
+# Routes for Admin System Monitoring
+admin_bp.add_route(AdminDatabasePoolView.as_view(), '/system/db-pool')
+admin_bp.add_route(AdminSlowQueryView.as_view(), '/system/slow-queries')
+admin_bp.add_route(AdminRefreshCoalescingView.as_view(), '/system/refresh-coalescing')
+admin_bp.add_route(AdminCacheStatsView.as_view(), '/system/cache')
+
+# Routes for streaming exports (?format=ndjson|csv)
+admin_bp.add_route(AdminUserExportView.as_view(), '/exports/users')
+admin_bp.add_route(AdminUserSessionExportView.as_view(), '/exports/users/<user_id:int>/sessions')
+admin_bp.add_route(AdminCourseRegistrationExportView.as_view(), '/exports/course-registrations')
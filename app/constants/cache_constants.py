@@ -0,0 +1,28 @@
+# app/constants/cache_constants.py
+from enum import Enum, IntEnum
+
+
+class CacheTier(Enum):
+    """Which tiers the @cache decorator reads and writes."""
+    L1 = "l1"      # Per-worker in-process LRU only
+    L2 = "l2"      # Redis only
+    BOTH = "both"  # In-process LRU in front of Redis
+
+
+class CacheFormat(IntEnum):
+    """Serialization of a cached value in Redis, as recorded in its header."""
+    NEGATIVE = 0  # A cached None/exception (NegativeEntry)
+    JSON = 1      # pydantic-core JSON bytes
+    MSGPACK = 2   # MessagePack of the JSON-mode dump (needs `msgpack`)
+
+
+class CacheCompression(IntEnum):
+    """Compression of a cached value in Redis, as recorded in its header."""
+    NONE = 0
+    ZLIB = 1
+    ZSTD = 2  # Needs `zstandard`
+
+
+# Cache tags (see `invalidate_tags`)
+USER_CACHE_TAG = "user:{user_id}"  # Every entry derived from a user's row
+ACCOUNT_CACHE_TAG = "account:{username}"  # The account lookup of a (lower-cased) username
@@ -0,0 +1,11 @@
+# app/constants/export_constants.py
+from enum import Enum
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def content_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv; charset=utf-8"
@@ -0,0 +1,10 @@
+# app/constants/pagination_constants.py
+from enum import Enum
+
+
+class CountStrategy(Enum):
+    """How `BaseRepository.get_paginated` computes `total_items`."""
+    EXACT = "exact"        # A separate SELECT count(*) before the data query
+    WINDOW = "window"      # count(*) OVER () in the data query: exact, one round trip
+    ESTIMATE = "estimate"  # Planner estimate (pg_class.reltuples) for unfiltered listings
+    CACHED = "cached"      # Exact count cached in Redis with a TTL
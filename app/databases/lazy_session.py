@@ -0,0 +1,188 @@
+# app/databases/lazy_session.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, ORMExecuteState
+
+from app.utils.count_cache_utils import invalidate_counts
+from app.utils.logger_utils import get_logger
+from app.utils.tiered_cache import tiered_cache
+
+logger = get_logger(__name__)
+
+# session.info keys of the cache tags to invalidate once the session's writes are
+# committed (see `invalidate_on_commit`); pending tags move to committed on commit
+PENDING_CACHE_TAGS = "pending_cache_tags"
+COMMITTED_CACHE_TAGS = "committed_cache_tags"
+# Likewise for the tables whose cached counts to drop (see `invalidate_counts_on_commit`)
+PENDING_COUNT_TABLES = "pending_count_tables"
+COMMITTED_COUNT_TABLES = "committed_count_tables"
+
+
+# While set, every LazySession forwards to this session instead of its own (see redirect_lazy_sessions)
+_redirect_to: ContextVar[AsyncSession | None] = ContextVar("lazy_session_redirect", default=None)
+
+
+@contextmanager
+def redirect_lazy_sessions(session: AsyncSession) -> Iterator[None]:
+    """
+    Makes every LazySession used within the block (in the current task context)
+    work on `session` instead. Lets code holding repositories bound to a
+    request's session keep running after that request has ended.
+    """
+    token = _redirect_to.set(session)
+    try:
+        yield
+    finally:
+        _redirect_to.reset(token)
+
+
+class WriteTrackingSession(Session):
+    """
+    A Session that records in `session.info["has_writes"]` whether it has
+    flushed or executed any INSERT/UPDATE/DELETE since its last commit/rollback,
+    and in `session.info["wrote"]` whether it has ever written at all.
+    """
+
+
+def mark_write(session: Session) -> None:
+    """Records a write on `session`; for writes made outside the ORM (e.g. COPY)."""
+    session.info["has_writes"] = True
+    session.info["wrote"] = True
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_flush(session: Session, _flush_context: Any) -> None:
+    mark_write(session)
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    # Anything that is not a SELECT (including textual SQL) is treated as a write
+    if not orm_execute_state.is_select:
+        mark_write(orm_execute_state.session)
+
+
+@event.listens_for(WriteTrackingSession, "after_commit")
+@event.listens_for(WriteTrackingSession, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    session.info["has_writes"] = False
+
+
+@event.listens_for(WriteTrackingSession, "after_commit")
+def _commit_cache_tags(session: Session) -> None:
+    for pending_key, committed_key in ((PENDING_CACHE_TAGS, COMMITTED_CACHE_TAGS),
+                                       (PENDING_COUNT_TABLES, COMMITTED_COUNT_TABLES)):
+        pending = session.info.pop(pending_key, None)
+        if pending:
+            session.info.setdefault(committed_key, set()).update(pending)
+
+
+@event.listens_for(WriteTrackingSession, "after_rollback")
+def _drop_cache_tags(session: Session) -> None:
+    session.info.pop(PENDING_CACHE_TAGS, None)
+    session.info.pop(PENDING_COUNT_TABLES, None)
+
+
+def invalidate_on_commit(session: "Session | AsyncSession | LazySession", *tags: str) -> None:
+    """
+    Queues cache tags (see `invalidate_tags`) to be invalidated once `session`
+    commits, and dropped if it rolls back. Invalidating before the commit
+    would let a concurrent read re-cache the old row until its TTL runs out.
+    """
+    session.info.setdefault(PENDING_CACHE_TAGS, set()).update(tags)
+
+
+def invalidate_counts_on_commit(session: "Session | AsyncSession | LazySession", table_name: str) -> None:
+    """Queues the cached counts of `table_name` to be dropped once `session` commits (see `invalidate_on_commit`)."""
+    session.info.setdefault(PENDING_COUNT_TABLES, set()).add(table_name)
+
+
+async def publish_committed_cache_tags(session: AsyncSession) -> None:
+    """Invalidates the tags and counts queued on `session` whose writes have been committed."""
+    info = session.sync_session.info
+    tables = info.pop(COMMITTED_COUNT_TABLES, None)
+    if tables:
+        await invalidate_counts(*sorted(tables))
+
+    tags = info.pop(COMMITTED_CACHE_TAGS, None)
+    if not tags:
+        return
+    try:
+        await tiered_cache.invalidate_tags(sorted(tags))
+    except Exception as exc:
+        logger.error(f"Failed to invalidate cache tags {sorted(tags)} after commit: {exc}")
+
+
+class LazySession:
+    """
+    A stand-in for `AsyncSession` that is attached to every request.
+
+    The real session (and with it, a pooled connection) is only created when
+    a repository first touches it; every attribute access is then forwarded
+    to that session. Requests that never use the database cost nothing.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self._session_maker = session_maker
+        self._session: AsyncSession | None = None
+        self._info: dict[str, Any] = {}
+
+    @property
+    def materialized(self) -> bool:
+        """True once the real session has been created."""
+        return self._session is not None
+
+    @property
+    def has_writes(self) -> bool:
+        """True if the session has pending, uncommitted writes."""
+        return self._session is not None and self._session.sync_session.info.get("has_writes", False)
+
+    @property
+    def wrote(self) -> bool:
+        """True if the session wrote anything during the request, committed or not."""
+        return self._session is not None and self._session.sync_session.info.get("wrote", False)
+
+    def prefer_replica(self, enabled: bool = True) -> None:
+        """
+        Lets reads run on a read replica (see RoutingSession). Must be called
+        before the session is first used; it has no effect afterwards.
+        """
+        self._info["prefer_replica"] = enabled
+
+    def _materialize(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_maker()
+            self._session.sync_session.info.update(self._info)
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined on LazySession itself
+        if name.startswith("__"):
+            raise AttributeError(name)
+        redirect = _redirect_to.get()
+        if redirect is not None:
+            return getattr(redirect, name)
+        return getattr(self._materialize(), name)
+
+    async def finalize(self, commit: bool) -> None:
+        """
+        Ends the request's unit of work.
+
+        Commits only when `commit` is True and something was written; otherwise
+        closing the session is enough, as it rolls back any read-only transaction
+        and returns the connection to the pool. Cache tags queued with
+        `invalidate_on_commit` are invalidated once their writes are committed.
+        """
+        if self._session is None:
+            return
+        try:
+            if commit and self.has_writes:
+                await self._session.commit()
+        finally:
+            await self._session.close()
+            # Whatever was committed (here or earlier in the request) is visible now
+            await publish_committed_cache_tags(self._session)
@@ -0,0 +1,64 @@
+# app/databases/migrate.py
+"""
+Brings the database schema up to date. Run before the application starts
+(the Docker image does):
+
+    python -m app.databases.migrate
+
+The migration history does not start from an empty database: its first
+revision (BASELINE_REVISION) only describes changes on top of a schema that
+was built with create_all. So, before `alembic upgrade head`:
+
+  * an empty database gets the current schema from create_all and is
+    stamped at the head, as Alembic recommends for new databases;
+  * a database built by create_all without migrations (no alembic_version)
+    is stamped at BASELINE_REVISION, so that only the later revisions run.
+"""
+import asyncio
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.databases.schema_check import DEFAULT_ALEMBIC_INI
+from app.models.base import Base
+from app.utils.logger_utils import get_logger
+from config import PostgreSQLConfig
+
+logger = get_logger(__name__)
+
+BASELINE_REVISION = "d73c783c4f81"
+
+
+async def _prepare(database_uri: str) -> str | None:
+    """Creates the schema of an empty database; returns the revision to stamp, if any."""
+    engine = create_async_engine(database_uri, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            tables = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+            if "alembic_version" in tables:
+                return None
+            if not tables & set(Base.metadata.tables):
+                await conn.run_sync(Base.metadata.create_all)
+                logger.info("Created the database schema with create_all.")
+                return "head"
+            logger.info(f"Database has tables but no migration history; stamping {BASELINE_REVISION}.")
+            return BASELINE_REVISION
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    alembic_config = AlembicConfig(str(DEFAULT_ALEMBIC_INI))
+    # Alembic's env.py runs its own event loop, so only the preparation runs in this one
+    stamp = asyncio.run(_prepare(PostgreSQLConfig.DATABASE_URI))
+    if stamp:
+        command.stamp(alembic_config, stamp)
+    command.upgrade(alembic_config, "head")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# app/databases/pool.py
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool and asyncpg driver settings, read from PostgreSQLConfig."""
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 5.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 500
+    statement_timeout_ms: int = 10000
+    jit: bool = False
+    application_name: str = "backend-training"
+
+    @classmethod
+    def from_config(cls, config: Any) -> "PoolSettings":
+        """Builds the settings from a Sanic config (or any mapping with a .get method)."""
+        return cls(
+            pool_size=config.get("DB_POOL_SIZE", cls.pool_size),
+            max_overflow=config.get("DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_timeout=config.get("DB_POOL_TIMEOUT", cls.pool_timeout),
+            pool_recycle=config.get("DB_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=config.get("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            statement_cache_size=config.get("DB_STATEMENT_CACHE_SIZE", cls.statement_cache_size),
+            statement_timeout_ms=config.get("DB_STATEMENT_TIMEOUT_MS", cls.statement_timeout_ms),
+            jit=config.get("DB_JIT", cls.jit),
+        )
+
+    def engine_kwargs(self, read_only: bool = False) -> dict[str, Any]:
+        """
+        Keyword arguments for `create_async_engine`.
+        With `read_only`, every transaction on the engine's connections is READ ONLY.
+        """
+        server_settings = {
+            "statement_timeout": str(self.statement_timeout_ms),
+            "jit": "on" if self.jit else "off",
+            "application_name": self.application_name,
+        }
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+
+        return {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": {
+                # SQLAlchemy's own prepared statement cache (per connection)
+                "prepared_statement_cache_size": self.statement_cache_size,
+                # asyncpg's internal cache, used for driver-level queries
+                "statement_cache_size": self.statement_cache_size,
+                "server_settings": server_settings,
+            },
+        }
+
+
+class PoolStats:
+    """Cumulative checkout counters for a single pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_checkout(self, wait_time: float) -> None:
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        if wait_time > self.wait_time_max:
+            self.wait_time_max = wait_time
+
+    def as_dict(self) -> dict[str, Any]:
+        avg = self.wait_time_total / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(avg * 1000, 3),
+            "wait_max_ms": round(self.wait_time_max * 1000, 3),
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    The default asyncio queue pool, plus timing of how long each checkout
+    waited for a free connection (including time spent opening a new one).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def status_dict(self) -> dict[str, Any]:
+        """Live pool occupancy plus cumulative checkout stats."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            **self.stats.as_dict(),
+        }
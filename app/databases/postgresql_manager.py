@@ -1,5 +1,6 @@
+import asyncio
 from contextlib import asynccontextmanager
-from typing import TypeAlias, Any, AsyncGenerator
+from typing import TypeAlias, Any, AsyncGenerator, Sequence
 
 # from sanic import Sanic
 from sqlalchemy.ext.asyncio import (
@@ -8,7 +9,10 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from app.models.base import Base
+from app.databases.lazy_session import LazySession, redirect_lazy_sessions, publish_committed_cache_tags
+from app.databases.pool import PoolSettings
+from app.databases.query_stats import instrument_engine
+from app.databases.routing_session import RoutingSession
 from app.exceptions import ServerError
 from app.utils.logger_utils import get_logger
 
@@ -19,31 +23,80 @@ AsyncSessionMaker: TypeAlias = async_sessionmaker[AsyncSession]
 
 
 class PostgreSQLManager:
-    """Manages PostgreSQL connection, engine, and sessions."""
+    """Manages PostgreSQL connections (a primary plus optional read replicas), engines, and sessions."""
 
     def __init__(self) -> None:
         self.engine: AsyncEngine | None = None
+        self.replica_engines: list[AsyncEngine] = []
         self.session_maker: AsyncSessionMaker | None = None
+        self.pool_settings: PoolSettings = PoolSettings()
 
-    async def setup(self, database_uri: str, debug: bool = False) -> None:
-        """Create DB engine, session maker"""
-        self.engine = create_async_engine(database_uri, echo=debug)
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.replica_engines)
+
+    async def setup(
+        self,
+        database_uri: str,
+        debug: bool = False,
+        pool_settings: PoolSettings | None = None,
+        replica_uris: Sequence[str] = ()
+    ) -> None:
+        """Create DB engines (primary and replicas), session maker"""
+        self.pool_settings = pool_settings or PoolSettings()
+        self.engine = create_async_engine(database_uri, echo=debug, **self.pool_settings.engine_kwargs())
+        # Replica connections default to READ ONLY transactions, so a misrouted write fails loudly
+        self.replica_engines = [
+            create_async_engine(uri, echo=debug, **self.pool_settings.engine_kwargs(read_only=True))
+            for uri in replica_uris
+        ]
+        for engine in (self.engine, *self.replica_engines):
+            instrument_engine(engine)
         self.session_maker = async_sessionmaker(
             bind=self.engine,
+            sync_session_class=RoutingSession,
+            replicas=self.replica_engines,
             autoflush=False,
             autocommit=False
         )
-        logger.info(f"Database engine initialized: {database_uri}")
+        logger.info(
+            f"Database engine initialized: {self.engine.url.render_as_string(hide_password=True)} "
+            f"(pool_size={self.pool_settings.pool_size}, max_overflow={self.pool_settings.max_overflow}, "
+            f"replicas={len(self.replica_engines)})"
+        )
 
-    async def create_tables(self) -> None:
-        """Creates all database tables defined in the models."""
+    async def warm_up(self) -> int:
+        """
+        Opens `pool_size` connections per engine concurrently and returns them to the pool,
+        so the first requests after a deploy don't each pay for a TCP + auth handshake.
+        Returns the number of connections that were opened.
+        """
         if not self.engine:
             raise ServerError("Database engine not initialized. Call setup() first.")
 
-        logger.info("Initializing database tables...")
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Database tables initialized successfully.")
+        engines = [self.engine, *self.replica_engines]
+        results = await asyncio.gather(
+            *(engine.connect() for engine in engines for _ in range(self.pool_settings.pool_size)),
+            return_exceptions=True
+        )
+        connections = [conn for conn in results if not isinstance(conn, BaseException)]
+        await asyncio.gather(*(conn.close() for conn in connections))
+
+        failures = [error for error in results if isinstance(error, BaseException)]
+        if failures:
+            logger.warning(f"Connection pool warm-up opened {len(connections)}/{len(results)} connections: {failures[0]}")
+        else:
+            logger.info(f"Connection pool warmed up with {len(connections)} connections.")
+        return len(connections)
+
+    def pool_status(self) -> dict[str, Any]:
+        """Returns live pool occupancy and checkout wait statistics for this worker."""
+        if not self.engine:
+            return {}
+        return {
+            "primary": self.engine.pool.status_dict(),
+            "replicas": [engine.pool.status_dict() for engine in self.replica_engines],
+        }
 
     @asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
@@ -60,12 +113,57 @@ class PostgreSQLManager:
             raise
         finally:
             await session.close()
+            await publish_committed_cache_tags(session)
+
+    @asynccontextmanager
+    async def read_only_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """
+        Provide a short-lived session for long-running reads such as exports.
+        Reads prefer a replica, nothing is committed, and the connection is
+        returned to the pool as soon as the block exits.
+        """
+        if not self.session_maker:
+            raise ServerError("Database not initialized. Call setup() first.")
+
+        session = self.session_maker()
+        session.sync_session.info["prefer_replica"] = True
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def detached_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """
+        Provide a session of its own to work started by a request but running
+        after it, such as a background cache refresh: request sessions
+        (LazySession) used within the block are redirected to it. Reads stay
+        on the primary and nothing is committed.
+        """
+        if not self.session_maker:
+            raise ServerError("Database not initialized. Call setup() first.")
+
+        session = self.session_maker()
+        try:
+            with redirect_lazy_sessions(session):
+                yield session
+        finally:
+            await session.close()
+
+    def lazy_session(self) -> LazySession:
+        """Provide a session that only opens a connection when first used."""
+        if not self.session_maker:
+            raise ServerError("Database not initialized. Call setup() first.")
+        return LazySession(self.session_maker)
 
     async def dispose(self) -> None:
         """Dispose of the database engine and close all connections."""
         if self.engine:
+            logger.info(f"Connection pool stats at shutdown: {self.pool_status()}")
+            for replica in self.replica_engines:
+                await replica.dispose()
             await self.engine.dispose()
-            logger.info("Database engine disposed.")
+            logger.info("Database engines disposed.")
 
 
 # A single, shared instance for the entire application
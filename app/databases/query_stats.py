@@ -0,0 +1,103 @@
+# app/databases/query_stats.py
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from sqlalchemy import Engine, event
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+# Called after every statement as observer(statement, parameters, duration, executemany, stats, engine)
+QueryObserver = Callable[[str, Any, float, bool, "QueryStats | None", Engine], None]
+_observers: list[QueryObserver] = []
+
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+")  # Not "::type" casts
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_GROUPS_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes SQL so that statements differing only in literal values or
+    in the length of IN/VALUES lists share a fingerprint.
+    """
+    normalized = _STRING_RE.sub("?", statement)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _LIST_RE.sub("(...)", normalized)
+    normalized = _REPEATED_GROUPS_RE.sub("(...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """Statements executed on behalf of one request: count, total DB time and fingerprints."""
+
+    def __init__(self, route: str | None = None) -> None:
+        self.route = route
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Fingerprints executed at least `threshold` times, the usual sign of an N+1 pattern."""
+        return {sql: n for sql, n in self.fingerprints.most_common() if n >= threshold}
+
+    def server_timing(self) -> str:
+        """The value of a Server-Timing header entry for the database."""
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+
+def start_query_stats(route: str | None = None) -> QueryStats:
+    """Starts collecting statistics for the current request (task context)."""
+    stats = QueryStats(route)
+    _current_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+# The start time lives on the statement's execution context, not on the (pooled)
+# connection, so a statement that raises leaves nothing behind
+_STARTED_AT = "_query_stats_started_at"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        setattr(context, _STARTED_AT, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement: str, parameters, context, executemany) -> None:
+    started_at = getattr(context, _STARTED_AT, None)
+    if started_at is None:
+        return
+    duration = time.perf_counter() - started_at
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    for observer in _observers:
+        observer(statement, parameters, duration, executemany, stats, conn.engine)
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Registers a callback run after every instrumented statement (must be cheap)."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def instrument_engine(engine: Engine | Any) -> None:
+    """Attaches the timing listeners to an engine (or an AsyncEngine's sync_engine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
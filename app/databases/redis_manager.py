@@ -7,18 +7,23 @@ class RedisManager:
 
     def __init__(self):
         self.pool: ConnectionPool | None = None
+        self.binary_pool: ConnectionPool | None = None
         self._client: Redis | None = None
+        self._binary_client: Redis | None = None
 
     def setup(self, host: str, port: int, db: int):
-        """Creates the connection pool."""
+        """Creates the connection pools: one decoding replies to str, one returning raw bytes."""
         self.pool = ConnectionPool(host=host, port=port, db=db, decode_responses=True)
+        self.binary_pool = ConnectionPool(host=host, port=port, db=db, decode_responses=False)
 
     async def close(self):
-        """Closes the connection pool."""
-        if self._client:
-            await self._client.close()
-        if self.pool:
-            await self.pool.disconnect()
+        """Closes the connection pools."""
+        for client in (self._client, self._binary_client):
+            if client:
+                await client.close()
+        for pool in (self.pool, self.binary_pool):
+            if pool:
+                await pool.disconnect()
 
     @property
     def client(self) -> Redis:
@@ -32,6 +37,18 @@ class RedisManager:
             self._client = Redis(connection_pool=self.pool)
         return self._client
 
+    @property
+    def binary_client(self) -> Redis:
+        """
+        A client whose replies are bytes, for binary values such as cache
+        entries (see CacheCodec). Keys and arguments may still be str.
+        """
+        if not self.binary_pool:
+            raise ServerError("Redis connection pool not initialized. Call setup() first.")
+        if not self._binary_client:
+            self._binary_client = Redis(connection_pool=self.binary_pool)
+        return self._binary_client
+
 
 # A single, shared instance for the entire application
 redis_manager = RedisManager()
@@ -0,0 +1,44 @@
+# app/databases/routing_session.py
+import random
+from typing import Any, Sequence
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.databases.lazy_session import WriteTrackingSession
+
+
+class RoutingSession(WriteTrackingSession):
+    """
+    A Session bound to the primary that can send reads to a read replica.
+
+    A SELECT goes to a replica when either the session prefers replicas
+    (`session.info["prefer_replica"]`, set for safe-method requests) or the
+    call asks for it explicitly via `bind_arguments={"routing": "replica"}`.
+    Flushes, DML, SELECT ... FOR UPDATE and every statement issued after the
+    session's first write go to the primary, so a request always reads its
+    own writes. One replica is picked per session and reused.
+    """
+
+    def __init__(self, *args: Any, replicas: Sequence[AsyncEngine] = (), **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._replicas: list[Engine] = [engine.sync_engine for engine in replicas]
+        self._replica: Engine | None = None
+
+    def get_bind(self, mapper=None, *, clause=None, bind=None, **kw):
+        routing = kw.pop("routing", None)
+        if bind is None and self._replicas and self._can_use_replica(clause, routing):
+            if self._replica is None:
+                self._replica = random.choice(self._replicas)
+            return self._replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kw)
+
+    def _can_use_replica(self, clause: Any, routing: str | None) -> bool:
+        if routing == "primary" or self._flushing or self.info.get("wrote"):
+            return False
+        if clause is None or isinstance(clause, UpdateBase):
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        return routing == "replica" or self.info.get("prefer_replica", False)
@@ -0,0 +1,67 @@
+# app/databases/schema_check.py
+from dataclasses import dataclass
+from pathlib import Path
+
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.models.base import Base
+
+DEFAULT_ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+_LIVE_INDEXES_SQL = text("""
+    SELECT t.relname AS table_name, i.relname AS index_name, x.indisvalid AS is_valid
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    WHERE n.nspname = current_schema()
+""")
+
+
+async def find_missing_indexes(engine: AsyncEngine) -> list[str]:
+    """
+    Compares the indexes declared on the models with the live database.
+
+    Returns "table.index" for every declared index that does not exist, or
+    exists but is INVALID (left behind by an interrupted CREATE INDEX CONCURRENTLY).
+    """
+    expected = {
+        (table.name, index.name)
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+    async with engine.connect() as conn:
+        rows = (await conn.execute(_LIVE_INDEXES_SQL)).all()
+    valid = {(row.table_name, row.index_name) for row in rows if row.is_valid}
+    return sorted(f"{table}.{index}" for table, index in expected - valid)
+
+
+@dataclass(frozen=True)
+class RevisionStatus:
+    """The database's Alembic revision(s) compared with the migration heads in the code."""
+    current: frozenset[str]
+    heads: frozenset[str]
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.current == self.heads
+
+
+def migration_heads(alembic_ini: str | Path = DEFAULT_ALEMBIC_INI) -> frozenset[str]:
+    """Reads the head revision(s) from the migration scripts; no database access."""
+    return frozenset(ScriptDirectory.from_config(AlembicConfig(str(alembic_ini))).get_heads())
+
+
+async def check_revision(engine: AsyncEngine, alembic_ini: str | Path = DEFAULT_ALEMBIC_INI) -> RevisionStatus:
+    """Compares the database's alembic_version with the code's heads using a single query."""
+    async with engine.connect() as conn:
+        try:
+            rows = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars().all()
+        except ProgrammingError:
+            rows = []  # Never migrated: no alembic_version table
+    return RevisionStatus(current=frozenset(rows), heads=migration_heads(alembic_ini))
@@ -0,0 +1,188 @@
+# app/databases/slow_queries.py
+import asyncio
+import json
+import random
+import sys
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime, date, UTC
+from typing import Any
+
+from greenlet import getcurrent
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.databases.query_stats import QueryStats, add_query_observer
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Statements that would change data under EXPLAIN ANALYZE; these are only planned
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "MERGE", "WITH")
+_REPOSITORY_PATH = "/app/repositories/"
+_MAX_PARAM_SETS = 3
+
+
+@dataclass
+class SlowQueryRecord:
+    at: str
+    duration_ms: float
+    sql: str
+    params: Any
+    repository: str | None
+    route: str | None
+    plan: str | None = None
+    plan_error: str | None = None
+
+
+def _redact_value(value: Any) -> Any:
+    """Keeps the shape of a parameter but never its text, which may be personal data or a secret."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        sets = list(parameters)
+        return {"sets": len(sets), "first": [redact_parameters(p, False) for p in sets[:_MAX_PARAM_SETS]]}
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _frames():
+    """
+    Yields the current stack, then the stack of the greenlet that spawned
+    this one: under the asyncio extension, repository coroutines are
+    suspended in the parent greenlet while the driver call runs.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    parent = getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def find_repository_caller() -> str | None:
+    """Returns "Repository.method" of the innermost public repository method on the stack."""
+    for frame in _frames():
+        code = frame.f_code
+        if _REPOSITORY_PATH in code.co_filename.replace("\\", "/") and not code.co_name.startswith("_"):
+            owner = frame.f_locals.get("self")
+            return f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+    return None
+
+
+class SlowQueryLog:
+    """
+    Captures statements slower than a threshold into a bounded ring buffer
+    (per worker) and, optionally, an NDJSON file, appended to in a worker
+    thread so the event loop never waits on the disk. A sample of the captured
+    statements is EXPLAINed on a separate connection in the background:
+    reads with ANALYZE and BUFFERS, writes with a plain EXPLAIN.
+    """
+
+    def __init__(self) -> None:
+        self.threshold = 0.2
+        self.explain_sample_rate = 0.0
+        self.file_path: str | None = None
+        self.records: deque[SlowQueryRecord] = deque(maxlen=200)
+        self._engines: dict[int, AsyncEngine] = {}
+        self._explaining = False
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def configure(
+        self,
+        *,
+        threshold_ms: float,
+        explain_sample_rate: float = 0.0,
+        buffer_size: int = 200,
+        file_path: str | None = None,
+        engines: tuple[AsyncEngine, ...] = ()
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.records = deque(self.records, maxlen=buffer_size)
+        self.file_path = file_path or None
+        self._engines = {id(engine.sync_engine): engine for engine in engines}
+        add_query_observer(self.observe)
+
+    def observe(self, statement: str, parameters: Any, duration: float, executemany: bool,
+                stats: QueryStats | None, engine: Engine) -> None:
+        if duration < self.threshold or statement.lstrip().upper().startswith("EXPLAIN"):
+            return
+
+        record = SlowQueryRecord(
+            at=datetime.now(UTC).isoformat(),
+            duration_ms=round(duration * 1000, 2),
+            sql=statement,
+            params=redact_parameters(parameters, executemany),
+            repository=find_repository_caller(),
+            route=stats.route if stats is not None else None,
+        )
+        self.records.append(record)
+        logger.warning(f"Slow query ({record.duration_ms} ms) in {record.repository or '?'} "
+                       f"on {record.route or '?'}: {statement[:200]}")
+
+        async_engine = self._engines.get(id(engine))
+        if (async_engine is not None and not executemany and not self._explaining
+                and random.random() < self.explain_sample_rate):
+            self._explaining = True  # One EXPLAIN at a time per worker
+            task = asyncio.get_running_loop().create_task(self._explain(async_engine, record, statement, parameters))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        else:
+            self._write(record)
+
+    async def _explain(self, engine: AsyncEngine, record: SlowQueryRecord, statement: str, parameters: Any) -> None:
+        is_write = statement.lstrip().upper().startswith(_WRITE_PREFIXES) or "FOR UPDATE" in statement.upper()
+        options = "" if is_write else "(ANALYZE, BUFFERS) "
+        try:
+            async with engine.connect() as conn:  # Rolled back on exit
+                result = await conn.exec_driver_sql(f"EXPLAIN {options}{statement}", parameters)
+                record.plan = "\n".join(row[0] for row in result)
+        except Exception as exc:
+            record.plan_error = str(exc)
+        finally:
+            self._explaining = False
+            self._write(record)
+
+    def _write(self, record: SlowQueryRecord) -> None:
+        if not self.file_path:
+            return
+        line = json.dumps(asdict(record), default=str) + "\n"
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append(line)  # No event loop (a synchronous script): nothing to block
+            return
+        task = loop.create_task(asyncio.to_thread(self._append, line))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _append(self, line: str) -> None:
+        try:
+            with open(self.file_path, "a", encoding="utf-8") as file:
+                file.write(line)
+        except OSError as exc:
+            logger.error(f"Failed to write slow query log {self.file_path}: {exc}")
+
+    def snapshot(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """The captured records, newest first."""
+        records = list(reversed(self.records))
+        return [asdict(record) for record in records[:limit]]
+
+
+# A single, shared instance for the entire application (per worker)
+slow_query_log = SlowQueryLog()
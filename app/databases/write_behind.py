@@ -0,0 +1,134 @@
+# app/databases/write_behind.py
+import asyncio
+from typing import Any, Dict, Type
+
+from app.databases.postgresql_manager import postgres_db
+from app.models.base import Base
+from app.repositories import BaseRepository
+from app.repositories.query_plan import query_plan_for
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class WriteBehindStats:
+    """Per-worker write-behind counters."""
+
+    def __init__(self) -> None:
+        self.touches = 0
+        self.coalesced = 0  # Touches merged into a row that was already pending
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failures = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(vars(self))
+
+
+class WriteBehindBuffer:
+    """
+    Collects informational column updates (e.g. users.last_login) per worker and
+    writes them in batches, instead of updating the row inside every request.
+
+    Touches are coalesced by (model, primary key), the latest value winning, and
+    flushed with BaseRepository.bulk_update (one UPDATE ... FROM (VALUES ...) per
+    model and column set) every `flush_interval` seconds, as soon as `max_pending`
+    rows are waiting, and on shutdown. Only use it for values that may be a few
+    seconds stale and may be lost if the worker is killed.
+    """
+
+    def __init__(self) -> None:
+        self.flush_interval = 5.0
+        self.max_pending = 5000
+        self.stats = WriteBehindStats()
+        self._pending: Dict[Type[Base], Dict[Any, Dict[str, Any]]] = {}
+        self._pending_rows = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_soon = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def configure(self, flush_interval_seconds: float, max_pending: int) -> None:
+        self.flush_interval = flush_interval_seconds
+        self.max_pending = max_pending
+
+    @property
+    def pending(self) -> int:
+        return self._pending_rows
+
+    def touch(self, model: Type[Base], pk: Any, **values: Any) -> None:
+        """Queues `values` for the row `pk` of `model`. Without a running flusher, nothing is queued."""
+        if self._task is None:
+            logger.warning(f"Write-behind buffer not started; dropping update of {model.__name__} {pk}")
+            return
+
+        self.stats.touches += 1
+        rows = self._pending.setdefault(model, {})
+        row = rows.get(pk)
+        if row is None:
+            rows[pk] = {query_plan_for(model).pk_name: pk, **values}
+            self._pending_rows += 1
+            if self._pending_rows >= self.max_pending:
+                self._flush_soon.set()
+        else:
+            row.update(values)
+            self.stats.coalesced += 1
+
+    async def flush(self) -> int:
+        """Writes every pending row; returns how many were written."""
+        async with self._flush_lock:
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+            written = 0
+            for model, rows in pending.items():
+                try:
+                    async with postgres_db.session_maker() as session:
+                        written += await BaseRepository(model, session).bulk_update(list(rows.values()))
+                        await session.commit()
+                except Exception as exc:
+                    self.stats.failures += 1
+                    logger.error(f"Write-behind flush of {len(rows)} {model.__name__} rows failed: {exc}", exc_info=exc)
+                    self._requeue(model, rows)
+            if pending:
+                self.stats.flushes += 1
+                self.stats.rows_flushed += written
+            return written
+
+    def _requeue(self, model: Type[Base], rows: Dict[Any, Dict[str, Any]]) -> None:
+        """Puts failed rows back, without overwriting values touched since."""
+        current = self._pending.setdefault(model, {})
+        for pk, row in rows.items():
+            if pk in current:
+                current[pk] = {**row, **current[pk]}
+            else:
+                current[pk] = row
+                self._pending_rows += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_soon.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_soon.clear()
+            # Shielded: a stop() arriving mid-flush must not lose the rows already taken out
+            await asyncio.shield(self.flush())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the periodic flush and writes whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        written = await self.flush()
+        if written:
+            logger.info(f"Write-behind buffer flushed {written} rows on shutdown.")
+
+
+# A single, shared instance for the entire application (per worker)
+write_behind = WriteBehindBuffer()
@@ -1,14 +1,27 @@
 # app/decorators/cache.py
+import asyncio
+import inspect
+import time
+from contextlib import nullcontext
 from functools import wraps
-from typing import Callable, Any, Type
+from typing import Callable, Any, Iterable, Type
 
 from pydantic import BaseModel
 
-from app.databases.redis_manager import redis_manager
+from app.constants.cache_constants import CacheTier
+from app.databases.postgresql_manager import postgres_db
 from app.utils.logger_utils import get_logger
+from app.utils.cache_codec import cache_codec
+from app.utils.tiered_cache import tiered_cache, refresh_due, NegativeEntry
 
 logger = get_logger(__name__)
 
+DEFAULT_L1_TTL = 60  # Seconds; L1 entries are capped at this unless `l1_ttl` says otherwise
+DEFAULT_EARLY_REFRESH = 1.0  # XFetch beta
+DEFAULT_LOCK_TTL = 5.0  # Seconds
+
+_LOCK_POLL_INTERVAL = 0.05
+
 
 def _generate_cache_key(
         prefix: str,
@@ -26,51 +39,282 @@ def _generate_cache_key(
     return ":".join(key_parts)
 
 
+def _is_method(func: Callable) -> bool:
+    params = list(inspect.signature(func).parameters)
+    return bool(params) and params[0] in ("self", "cls")
+
+
+def _detached_scope():
+    """A session of its own for a background refresh, if there is a database to open one on."""
+    if postgres_db.session_maker is None:
+        return nullcontext()
+    return postgres_db.detached_session()
+
+
 def cache(
         schema: Type[BaseModel],
         ttl: int,
-        prefix: str = "cache"
+        prefix: str = "cache",
+        tiers: CacheTier = CacheTier.BOTH,
+        l1_ttl: int | None = None,
+        key: Callable[..., Any] | None = None,
+        tags: Callable[..., Iterable[str]] | None = None,
+        stale_ttl: int = 0,
+        early_refresh: float = DEFAULT_EARLY_REFRESH,
+        lock_ttl: float = DEFAULT_LOCK_TTL,
+        negative_ttl: int = 0,
+        cache_exceptions: tuple[type[Exception], ...] = ()
     ):
     """
     A Pydantic-aware decorator for caching the results of an async function.
     The decorated function is expected to return an object that can be validated
     by the provided Pydantic schema.
 
+    Results are cached in a per-worker LRU (L1, holding validated schema
+    instances) in front of Redis (L2, holding entries encoded by CacheCodec:
+    JSON or MessagePack, compressed when large). An L1 hit costs neither a
+    round trip nor validation; L1 is skipped while invalidations cannot reach
+    the worker (see TieredCache).
+
+    Keys are "<prefix>:<key(...)>" when a key builder is given, e.g.
+    `key=lambda self, user_id: user_id`; otherwise they are derived from the
+    module, function name and arguments (without `self`/`cls`). Entries can be
+    tagged, e.g. `tags=lambda self, user_id: [f"user:{user_id}"]`, and dropped
+    from every tier on every worker with `invalidate_tags`. Code changing the
+    underlying rows should use `invalidate_on_commit` instead, so the entries
+    are only dropped once the change is visible to the reads that refill them.
+
+    An expiring entry is recomputed once, not once per caller: concurrent
+    misses in a worker wait for a single call of the function, and workers
+    wait for the one holding the key's Redis lock (up to `lock_ttl`). Fresh
+    entries are refreshed in the background shortly before they expire, with
+    a probability that grows with how long they took to compute (XFetch), and
+    with `stale_ttl` an expired entry is still served for that long while one
+    background task recomputes it. Background refreshes run after the request
+    that triggered them; request sessions (LazySession) used by the function
+    are redirected to a session of their own (see PostgreSQLManager.detached_session).
+
+    With `negative_ttl`, the absence of a result is cached too, for that
+    (usually shorter) time: a None result, or one of `cache_exceptions`
+    raised by the function, which is then re-raised (same class and message)
+    on every hit. Code creating what a negative entry stands for must drop it,
+    e.g. through a tag.
+
     :param schema: The Pydantic model to use for parsing the cached data.
     :param ttl: Time-to-live in seconds for the cache entry.
     :param prefix: A prefix for the cache key.
+    :param tiers: The tiers to use: L1 only, L2 only, or both.
+    :param l1_ttl: TTL of L1 entries; defaults to `ttl`, capped at DEFAULT_L1_TTL.
+    :param key: Builds the key suffix from the call's arguments (including `self`).
+    :param tags: Returns the tags of a call's entry, from its arguments (including `self`).
+    :param stale_ttl: Seconds past `ttl` during which the expired entry is served while it is recomputed.
+    :param early_refresh: XFetch beta; 0 disables early refreshes.
+    :param lock_ttl: Seconds other workers wait for a recompute in progress; 0 disables the Redis lock.
+    :param negative_ttl: Time-to-live in seconds of negative entries; 0 leaves them uncached.
+    :param cache_exceptions: Exceptions cached as negative entries (requires `negative_ttl`).
+        They must take the message as their only argument.
     """
+    use_l1 = tiers in (CacheTier.L1, CacheTier.BOTH)
+    use_l2 = tiers in (CacheTier.L2, CacheTier.BOTH)
+    local_ttl = l1_ttl if l1_ttl is not None else min(ttl, DEFAULT_L1_TTL)
+    stats = tiered_cache.stats
+    exception_types = {exc_type.__name__: exc_type for exc_type in cache_exceptions} if negative_ttl else {}
+    cacheable_exceptions = tuple(exception_types.values())
+
     def decorator(func: Callable):
-        @wraps(func)
-        async def decorated_function(*args: Any, **kwargs: Any):
-            cache_key = _generate_cache_key(prefix, func, *args, **kwargs)
-            redis_client = redis_manager.client
+        skip_first = _is_method(func)
+
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            if key is not None:
+                return f"{prefix}:{key(*args, **kwargs)}"
+            return _generate_cache_key(prefix, func, *(args[1:] if skip_first else args), **kwargs)
+
+        def remember_locally(entry_key: str, value: Any, entry_tags: tuple[str, ...], lifetime: float) -> None:
+            if use_l1 and tiered_cache.l1_available:
+                tiered_cache.local.set(entry_key, value, min(local_ttl, lifetime), entry_tags)
 
+        def read(raw: bytes) -> tuple[Any, float, float]:
+            """
+            Decodes a stored entry into (schema instance or NegativeEntry, fresh
+            until, compute seconds). The value is None if it cannot be used here.
+            """
+            value, fresh_until, delta = cache_codec.decode(raw, schema)
+            if isinstance(value, NegativeEntry) and (
+                    not negative_ttl or (value.error is not None and value.error[0] not in exception_types)):
+                value = None  # Negative caching (of that exception) was turned off since
+            return value, fresh_until, delta
+
+        def resolve(value: Any) -> Any:
+            """Turns a cached negative entry back into None or the exception it records."""
+            if not isinstance(value, NegativeEntry):
+                return value
+            stats.negative_hits += 1
+            if value.error is None:
+                return None
+            name, message = value.error
+            raise exception_types[name](message)
+
+        async def store_negative(entry_key: str, entry_tags: tuple[str, ...], negative: NegativeEntry,
+                                 delta: float) -> None:
             try:
-                # 1. Try to get from cache
-                cached_result = await redis_client.get(cache_key)
-                if cached_result:
-                    logger.debug(f"Cache HIT for key: {cache_key}")
-                    # Use the provided schema to parse the JSON back into a Pydantic model
-                    return schema.model_validate_json(cached_result)
+                remember_locally(entry_key, negative, entry_tags, negative_ttl)
+                if use_l2:
+                    entry = cache_codec.encode(negative, time.time() + negative_ttl, delta)
+                    await tiered_cache.set_l2(entry_key, entry, negative_ttl, entry_tags)
+                stats.negative_stores += 1
             except Exception as e:
-                logger.error(f"Redis GET failed for key {cache_key}: {e}")
+                logger.error(f"Redis SET failed for key {entry_key}: {e}")
 
-            logger.debug(f"Cache MISS for key: {cache_key}")
-            # 2. Cache miss: call the original function
-            result = await func(*args, **kwargs)
+        async def compute(args: tuple, kwargs: dict, entry_key: str, entry_tags: tuple[str, ...]) -> tuple[Any, Any]:
+            """Calls the function and stores its result. Returns (result, validated result or None)."""
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except cacheable_exceptions as exc:
+                await store_negative(entry_key, entry_tags, NegativeEntry.from_exception(exc),
+                                     time.perf_counter() - started)
+                raise
+            delta = time.perf_counter() - started
 
             if result is None:
-                return None
+                if negative_ttl:
+                    await store_negative(entry_key, entry_tags, NegativeEntry(), delta)
+                return None, None
 
             try:
-                # 3. Store the result in cache, using Pydantic's JSON export
+                # Store the result: validated for L1, encoded for Redis
                 validated_result = schema.model_validate(result)
-                await redis_client.set(cache_key, validated_result.model_dump_json(), ex=ttl)
+                remember_locally(entry_key, validated_result, entry_tags, ttl)
+                if use_l2:
+                    entry = cache_codec.encode(validated_result, time.time() + ttl, delta)
+                    await tiered_cache.set_l2(entry_key, entry, ttl + stale_ttl, entry_tags)
+                return result, validated_result
+            except Exception as e:
+                logger.error(f"Redis SET failed for key {entry_key}: {e}")
+                return result, None
+
+        async def wait_for_entry(entry_key: str, entry_tags: tuple[str, ...]) -> Any:
+            """Polls Redis while another worker recomputes the entry; None if it gave up or timed out."""
+            deadline = time.monotonic() + lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                raw, locked = await tiered_cache.poll_l2(entry_key)
+                if raw:
+                    value, fresh_until, _ = read(raw)
+                    if value is not None:
+                        remember_locally(entry_key, value, entry_tags, fresh_until - time.time())
+                    return value
+                if not locked:
+                    return None
+            return None
+
+        async def load(args: tuple, kwargs: dict, entry_key: str, entry_tags: tuple[str, ...],
+                       wait: bool = True) -> tuple[Any, Any]:
+            """
+            Recomputes an entry unless another worker holds its lock. Then it waits
+            for that worker's result (`wait`), or leaves the entry to it.
+            """
+            token = None
+            if use_l2 and lock_ttl:
+                try:
+                    token = await tiered_cache.acquire_lock(entry_key, lock_ttl)
+                    if token is None:
+                        if not wait:
+                            return None, None
+                        stats.lock_waits += 1
+                        value = await wait_for_entry(entry_key, entry_tags)
+                        if value is not None:
+                            return value, value
+                except Exception as e:
+                    stats.l2_errors += 1
+                    logger.error(f"Redis lock failed for key {entry_key}: {e}")
+
+            try:
+                return await compute(args, kwargs, entry_key, entry_tags)
+            finally:
+                if token is not None:
+                    try:
+                        await tiered_cache.release_lock(entry_key, token)
+                    except Exception as e:
+                        logger.error(f"Redis lock release failed for key {entry_key}: {e}")
+
+        async def load_once(args: tuple, kwargs: dict, entry_key: str, entry_tags: tuple[str, ...]) -> Any:
+            """A miss: concurrent callers in this worker share one recompute."""
+            task = tiered_cache.inflight.get(entry_key)
+            leader = task is None
+            if leader:
+                task = asyncio.get_running_loop().create_task(load(args, kwargs, entry_key, entry_tags))
+                tiered_cache.track_inflight(entry_key, task)
+            else:
+                stats.coalesced += 1
+            # Shielded: a caller going away must not cancel the recompute the others wait for
+            result, validated_result = await asyncio.shield(task)
+            # Others get the validated copy rather than an object tied to the leader's session
+            return resolve(result if leader or validated_result is None else validated_result)
+
+        async def refresh(args: tuple, kwargs: dict, entry_key: str, entry_tags: tuple[str, ...]) -> None:
+            try:
+                async with _detached_scope():
+                    await load(args, kwargs, entry_key, entry_tags, wait=False)
+            except cacheable_exceptions:
+                pass  # Stored as a negative entry
             except Exception as e:
-                logger.error(f"Redis SET failed for key {cache_key}: {e}")
+                stats.refresh_errors += 1
+                logger.warning(f"Background refresh failed for key {entry_key}: {e}")
 
-            return result
+        @wraps(func)
+        async def decorated_function(*args: Any, **kwargs: Any):
+            entry_key = cache_key(*args, **kwargs)
+            entry_tags = tuple(tags(*args, **kwargs)) if tags is not None else ()
+
+            # 1. Try the in-process tier: already validated, no round trip
+            if use_l1 and tiered_cache.l1_available:
+                found, value = tiered_cache.local.get(entry_key)
+                if found:
+                    stats.l1_hits += 1
+                    return resolve(value)
+                stats.l1_misses += 1
+
+            # 2. Try Redis
+            if use_l2:
+                try:
+                    cached_result = await tiered_cache.get_l2(entry_key)
+                    value, fresh_until, delta = read(cached_result) if cached_result else (None, 0.0, 0.0)
+                    if value is not None:
+                        logger.debug(f"Cache HIT for key: {entry_key}")
+                        now = time.time()
+                        if now < fresh_until:
+                            stats.l2_hits += 1
+                            if refresh_due(now, fresh_until, delta, early_refresh):
+                                if tiered_cache.run_in_background(entry_key, refresh(args, kwargs, entry_key, entry_tags)):
+                                    stats.early_refreshes += 1
+                            remember_locally(entry_key, value, entry_tags, fresh_until - now)
+                        else:
+                            # Expired, but within `stale_ttl`: serve it while it is recomputed
+                            stats.stale_served += 1
+                            tiered_cache.run_in_background(entry_key, refresh(args, kwargs, entry_key, entry_tags))
+                    else:
+                        stats.l2_misses += 1
+                except Exception as e:
+                    stats.l2_errors += 1
+                    value = None
+                    logger.error(f"Redis GET failed for key {entry_key}: {e}")
+                if value is not None:
+                    return resolve(value)
+
+            logger.debug(f"Cache MISS for key: {entry_key}")
+            # 3. Cache miss: call the original function, once for all concurrent callers
+            return await load_once(args, kwargs, entry_key, entry_tags)
 
         return decorated_function
     return decorator
+
+
+async def invalidate_tags(*tags: str) -> int:
+    """
+    Drops every cached entry carrying any of `tags` (e.g. "user:42") from both
+    tiers on every worker, right away. Returns the number of Redis entries
+    deleted. After writes in a transaction, use `invalidate_on_commit`
+    (app.databases.lazy_session) so this runs once they are committed.
+    """
+    return await tiered_cache.invalidate_tags(list(tags))
@@ -3,6 +3,11 @@ from sanic import Sanic, Request
 from sanic.exceptions import SanicException
 
 from app.databases.redis_manager import redis_manager
+from app.services.refresh_coalescer import refresh_coalescer
+from app.utils.revocation_snapshot import revocation_snapshot
+from app.utils.revocation_store import revocation_pruner
+from app.utils.cache_codec import cache_codec
+from app.utils.tiered_cache import tiered_cache
 from app.utils.logger_utils import get_logger
 
 logger = get_logger(__name__)
@@ -28,9 +33,33 @@ async def setup_redis(app: Sanic):
     await redis_manager.client.ping()
     logger.info(f"Redis connection pool successfully created at {redis_host}:{redis_port}.")
 
+    refresh_coalescer.configure(
+        grace_seconds=app.config.get("AUTH_REFRESH_GRACE_SECONDS", 10),
+        wait_ms=app.config.get("AUTH_REFRESH_WAIT_MS", 3000)
+    )
+    revocation_snapshot.configure(
+        enabled=app.config.get("JWT_REVOCATION_SNAPSHOT", True),
+        max_entries=app.config.get("JWT_REVOCATION_SNAPSHOT_MAX_ENTRIES", 1000000)
+    )
+    revocation_snapshot.start()
+    revocation_pruner.start()  # Independent of the snapshot: the user revocation hash has no TTL
+    tiered_cache.configure(
+        l1_enabled=app.config.get("CACHE_L1_ENABLED", True),
+        l1_max_entries=app.config.get("CACHE_L1_MAX_ENTRIES", 10000)
+    )
+    tiered_cache.start()
+    cache_codec.configure(
+        codec=app.config.get("CACHE_CODEC", "json"),
+        compression=app.config.get("CACHE_COMPRESSION", "zlib"),
+        compress_min_bytes=app.config.get("CACHE_COMPRESS_MIN_BYTES", 1024)
+    )
+
 
 async def close_redis(_app: Sanic):
     """Hook to close the Redis connection pool."""
+    await revocation_snapshot.stop()
+    await revocation_pruner.stop()
+    await tiered_cache.stop()
     logger.info("Closing Redis connection pool...")
     await redis_manager.close()
     logger.info("Redis connection pool closed.")
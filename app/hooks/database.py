@@ -1,18 +1,108 @@
 # app/hooks/database.py
-from sanic import Sanic, Request
+from sanic import Sanic, Request, HTTPResponse
+from sanic.response import json
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
+from app.databases.pool import PoolSettings
 from app.databases.postgresql_manager import postgres_db
+from app.databases.slow_queries import slow_query_log
+from app.databases.write_behind import write_behind
+from app.databases.schema_check import find_missing_indexes, check_revision
+from app.exceptions import ServerError
+from app.models.base import Base
+from app.databases.redis_manager import redis_manager
+from app.schemas.response_schema import GenericResponse
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+
+def _recent_write_key(user_id) -> str:
+    return f"db_recent_write:{user_id}"
+
+
+async def check_schema(app: Sanic):
+    """
+    Runs once in the main process, before any worker starts: compares the
+    database's Alembic revision with the migrations in the code and reports
+    missing indexes. With DB_SCHEMA_CHECK=strict, a lagging database stops
+    the server from starting. Schema changes themselves are left to
+    `python -m app.databases.migrate`; with DB_CREATE_TABLES, missing tables
+    are also created with create_all.
+    """
+    mode = app.config.get("DB_SCHEMA_CHECK", "warn")
+    create_tables = app.config.get("DB_CREATE_TABLES", True)
+    if mode == "off" and not create_tables:
+        return
+
+    engine = create_async_engine(app.config.get("DATABASE_URI"), poolclass=NullPool)
+    try:
+        if create_tables:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            logger.info("Database tables created with create_all (DB_CREATE_TABLES).")
+        if mode == "off":
+            return
+
+        status = await check_revision(engine)
+        if not status.up_to_date:
+            message = (
+                f"Database schema revision {sorted(status.current) or 'none'} does not match "
+                f"the code's migration head {sorted(status.heads)}. Run `python -m app.databases.migrate`."
+            )
+            if mode == "strict":
+                raise ServerError(message)
+            logger.warning(message)
+
+        missing_indexes = await find_missing_indexes(engine)
+        if missing_indexes:
+            logger.warning(
+                f"Database is missing indexes declared on the models: {', '.join(missing_indexes)}. "
+                "Run `python -m app.databases.migrate` to create them."
+            )
+    finally:
+        await engine.dispose()
 
 
 async def setup_db(app: Sanic):
     """
-    This hook initializes the database connection and creates tables.
-    It runs once before the server starts.
+    This hook initializes the database connection in each worker.
+    It warms the connection pool so the worker accepts traffic with its
+    connections already open. Schema checks run once in `check_schema`.
     """
     db_uri = app.config.get("DATABASE_URI")
     debug = app.config.get("DEBUG", False)
-    await postgres_db.setup(database_uri=db_uri, debug=debug)
-    await postgres_db.create_tables()
+    pool_settings = PoolSettings.from_config(app.config)
+    await postgres_db.setup(
+        database_uri=db_uri,
+        debug=debug,
+        pool_settings=pool_settings,
+        replica_uris=app.config.get("DB_REPLICA_URIS", [])
+    )
+    slow_query_log.configure(
+        threshold_ms=app.config.get("DB_SLOW_QUERY_MS", 200),
+        explain_sample_rate=app.config.get("DB_SLOW_QUERY_EXPLAIN_SAMPLE", 0.0),
+        buffer_size=app.config.get("DB_SLOW_QUERY_BUFFER", 200),
+        file_path=app.config.get("DB_SLOW_QUERY_LOG_FILE"),
+        engines=(postgres_db.engine, *postgres_db.replica_engines)
+    )
+
+    write_behind.configure(
+        flush_interval_seconds=app.config.get("DB_WRITE_BEHIND_INTERVAL", 5),
+        max_pending=app.config.get("DB_WRITE_BEHIND_MAX_PENDING", 5000)
+    )
+    write_behind.start()
+
+    if app.config.get("DB_POOL_WARMUP", True):
+        await postgres_db.warm_up()
+
+
+async def flush_write_behind(_app: Sanic):
+    """Writes the buffered column updates while the connection pool is still open."""
+    await write_behind.stop()
 
 
 async def close_db(_app: Sanic):
@@ -22,12 +112,55 @@ async def close_db(_app: Sanic):
     await postgres_db.dispose()
 
 
-async def manage_db_session(request: Request, handler):
+async def attach_db_session(request: Request):
+    """
+    Attaches a lazy DB session to the request. No connection is checked out
+    until a repository actually uses it, so preflights, docs, rejected
+    requests and Redis-only endpoints never touch the pool.
     """
-    Creates a new DB session for a request, handles commit/rollback,
-    and closes it, using a context manager from the PostgreSQLManager.
+    request.ctx.db_session = postgres_db.lazy_session()
+
+
+async def route_db_reads(request: Request):
     """
-    async with postgres_db.get_session() as session:
-        request.ctx.db_session = session
-        response = await handler(request)
-    return response
\ No newline at end of file
+    Lets safe-method requests read from a replica, unless the authenticated
+    user wrote recently, in which case their reads stay on the primary
+    (read-your-writes). Must run after the `auth` middleware.
+    """
+    if not postgres_db.has_replicas or request.method not in SAFE_METHODS:
+        return
+
+    user_id = getattr(request.ctx, "user_id", None)
+    if user_id is not None and await redis_manager.client.exists(_recent_write_key(user_id)):
+        return
+
+    request.ctx.db_session.prefer_replica()
+
+
+async def release_db_session(request: Request, response: HTTPResponse):
+    """
+    Commits the request's session if it wrote anything and the request
+    succeeded, then closes it. A failed commit replaces the response with a 500.
+    After a write, the user's reads are pinned to the primary for a short window.
+    """
+    db_session = getattr(request.ctx, "db_session", None)
+    if db_session is None:
+        return
+
+    try:
+        await db_session.finalize(commit=response.status < 400)
+    except Exception as exc:
+        logger.error(f"Failed to commit DB session for {request.path}: {exc}", exc_info=exc)
+        error_response = GenericResponse(
+            status="error",
+            message="An internal server error occurred."
+        )
+        return json(error_response.model_dump(exclude_none=True), status=500)
+
+    user_id = getattr(request.ctx, "user_id", None)
+    if postgres_db.has_replicas and db_session.wrote and user_id is not None:
+        window = request.app.config.get("DB_READ_YOUR_WRITES_SECONDS", 5)
+        try:
+            await redis_manager.client.set(_recent_write_key(user_id), 1, ex=window)
+        except Exception as exc:
+            logger.error(f"Failed to set recent-write marker for user {user_id}: {exc}")
@@ -3,6 +3,7 @@ import time
 
 from sanic import Request
 
+from app.databases.query_stats import start_query_stats, current_query_stats
 from app.utils.logger_utils import get_logger
 
 logger = get_logger('Middleware')
@@ -10,6 +11,20 @@ logger = get_logger('Middleware')
 
 async def add_start_time(request: Request):
     request.headers['start_time'] = time.time()
+    # Collects the SQL statements run while handling this request (see app.databases.query_stats)
+    start_query_stats(request.uri_template or request.path)
+
+
+def _check_query_budget(request: Request, stats) -> None:
+    """Warns when the request ran more statements than its route's budget, or repeated one (N+1)."""
+    config = request.app.config
+    route = request.uri_template or request.path
+    budget = config.get("DB_QUERY_BUDGETS", {}).get(route, config.get("DB_QUERY_BUDGET", 20))
+    if stats.count > budget:
+        logger.warning(f"{request.method} {route} ran {stats.count} SQL statements (budget {budget})")
+
+    for sql, times in stats.repeated(config.get("DB_N_PLUS_ONE_THRESHOLD", 3)).items():
+        logger.warning(f"{request.method} {route} ran the same statement {times} times (possible N+1): {sql[:200]}")
 
 
 async def add_spent_time(request: Request, response):
@@ -19,12 +34,20 @@ async def add_spent_time(request: Request, response):
             spend_time = round((time.time() - timestamp), 3)
             response.headers['latency'] = spend_time
 
-            msg = "{status} {method} {path} {query} {latency}s".format(
+            stats = current_query_stats()
+            db_summary = ""
+            if stats is not None:
+                response.headers['Server-Timing'] = stats.server_timing()
+                db_summary = f" db={stats.count}q/{stats.total_time * 1000:.1f}ms"
+                _check_query_budget(request, stats)
+
+            msg = "{status} {method} {path} {query} {latency}s{db}".format(
                 status=response.status,
                 method=request.method,
                 path=request.path,
                 query=request.query_string,
-                latency=spend_time
+                latency=spend_time,
+                db=db_summary
             )
             if response.status >= 400:
                 logger.error(msg)
@@ -33,4 +56,4 @@ async def add_spent_time(request: Request, response):
             else:
                 logger.info(msg)
     except Exception as ex:
-        logger.exception(ex)
\ No newline at end of file
+        logger.exception(ex)
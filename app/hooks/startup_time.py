@@ -0,0 +1,26 @@
+# app/hooks/startup_time.py
+import os
+import time
+
+from sanic import Sanic
+
+from app import BOOT_STARTED_AT
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+async def mark_listeners_start(app: Sanic):
+    """Registered as the first before_server_start listener."""
+    app.ctx.listeners_started_at = time.perf_counter()
+
+
+async def report_cold_start(app: Sanic):
+    """Logs how long this worker took from importing the app to accepting connections."""
+    ready_at = time.perf_counter()
+    listeners_started_at = getattr(app.ctx, "listeners_started_at", ready_at)
+    logger.info(
+        f"Worker {os.getpid()} cold start: {(ready_at - BOOT_STARTED_AT) * 1000:.0f} ms "
+        f"(import and app setup {(listeners_started_at - BOOT_STARTED_AT) * 1000:.0f} ms, "
+        f"startup listeners {(ready_at - listeners_started_at) * 1000:.0f} ms)"
+    )
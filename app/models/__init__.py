@@ -11,6 +11,7 @@ from .address import Address
 from .admin import Admin
 from .curriculum import Curriculum
 from .curriculum_subject import CurriculumSubject
+from .user_session import UserSession
 
 __all__ = [
     'User',
@@ -24,5 +25,6 @@ __all__ = [
     'Timetable',
     'Address',
     'Curriculum',
-    'CurriculumSubject'
+    'CurriculumSubject',
+    'UserSession'
 ]
\ No newline at end of file
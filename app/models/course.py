@@ -16,7 +16,7 @@ class Course(Base):
 
     course_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)  # "Tin học đại cương - Lớp 01"
-    semester: Mapped[str] = mapped_column(String(50), nullable=False)  # "HK1-2025"
+    semester: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # "HK1-2025"
     max_students: Mapped[int] = mapped_column(Integer, default=50)
 
     # --- Foreign Keys ---
@@ -24,8 +24,8 @@ class CourseRegistration(Base):
     )
 
     # --- Foreign Keys ---
-    student_id: Mapped[str] = mapped_column(String(20), ForeignKey('students.student_id'), nullable=False)
-    course_id: Mapped[int] = mapped_column(Integer, ForeignKey('courses.course_id'), nullable=False)
+    student_id: Mapped[str] = mapped_column(String(20), ForeignKey('students.student_id'), nullable=False, index=True)
+    course_id: Mapped[int] = mapped_column(Integer, ForeignKey('courses.course_id'), nullable=False, index=True)
 
     # --- Relationships ---
     student: Mapped["Student"] = relationship(back_populates="registrations")
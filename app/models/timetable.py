@@ -19,8 +19,8 @@ class Timetable(Base):
     end_time: Mapped[time] = mapped_column(Time, nullable=False)
 
     # --- Foreign Keys ---
-    course_id: Mapped[int] = mapped_column(Integer, ForeignKey('courses.course_id'), nullable=False)
-    classroom_id: Mapped[int] = mapped_column(Integer, ForeignKey('classrooms.classroom_id'), nullable=True)
+    course_id: Mapped[int] = mapped_column(Integer, ForeignKey('courses.course_id'), nullable=False, index=True)
+    classroom_id: Mapped[int] = mapped_column(Integer, ForeignKey('classrooms.classroom_id'), nullable=True, index=True)
 
     # --- Relationships ---
     course: Mapped["Course"] = relationship(back_populates="timetables")
@@ -1,6 +1,6 @@
 # app/models/user.py
 from datetime import datetime, UTC
-from sqlalchemy import String, Integer, DateTime, Boolean
+from sqlalchemy import String, Integer, DateTime, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.sqltypes import Enum as SQLEnum
 from typing import TYPE_CHECKING
@@ -12,10 +12,15 @@ if TYPE_CHECKING:
     from .student import Student
     from .lecturer import Lecturer
     from .admin import Admin
+    from .user_session import UserSession
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Serves the case-insensitive lookup in UserRepository.get_by_username
+        Index("ix_users_username_lower", text("lower(username)")),
+    )
 
     user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -37,6 +42,7 @@ class User(Base):
     student_profile: Mapped["Student"] = relationship(back_populates="user", cascade="all, delete-orphan")
     lecturer_profile: Mapped["Lecturer"] = relationship(back_populates="user", cascade="all, delete-orphan")
     admin_profile: Mapped["Admin"] = relationship(back_populates="user", cascade="all, delete-orphan")
+    sessions: Mapped[list["UserSession"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         return f"<User username={self.username}, role={self.user_role}>"
\ No newline at end of file
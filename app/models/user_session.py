@@ -1,5 +1,5 @@
 from datetime import datetime, UTC
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -18,6 +18,11 @@ class UserSession(Base):
     Việc "thu hồi" (revoke) một session chính là thu hồi Refresh Token tương ứng.
     """
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # list_sessions_for_user: a user's sessions, most recently active first (session_id breaks ties).
+        # Also serves the active-only listing, which filters `revoked` within the user's entries.
+        Index("ix_user_sessions_user_id_last_active", "user_id", text("last_active DESC"), text("session_id DESC")),
+    )
 
     session_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -1,27 +1,52 @@
 # app/repositories/__init__.py
 import math
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Sequence, AsyncIterator
+from pydantic import BaseModel, ConfigDict, SecretStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update
-from sqlalchemy.inspection import inspect
+from sqlalchemy import select, func, insert, update, values, and_, or_, tuple_, table, column, cast, BigInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 
+from app.constants.pagination_constants import CountStrategy
+from app.databases.lazy_session import mark_write, invalidate_counts_on_commit
+from app.exceptions import BadRequest
 from app.models.base import Base
+from app.repositories.query_plan import query_plan_for
+from app.utils.count_cache_utils import get_cached_count, set_cached_count
+from app.utils.cursor_utils import encode_cursor, decode_cursor, coerce_cursor_values
 
 # --- Generic Type Variables ---
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Rows per statement for bulk operations; keeps bind parameters well under asyncpg's 32767 limit
+BULK_CHUNK_SIZE = 1000
+# Rows fetched per round trip from a server-side cursor when streaming
+STREAM_BATCH_SIZE = 1000
+
 
 # --- Standardized Pagination Result Schema ---
 class PaginationResult(BaseModel, Generic[ModelType]):
-    """Standardized schema for paginated query results."""
+    """
+    Standardized schema for paginated query results.
+
+    Offset pagination fills in the totals and `current_page`; cursor (keyset)
+    pagination leaves them empty and returns `next_cursor`/`prev_cursor` instead.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     items: List[ModelType]
-    total_items: int
-    total_pages: int
-    current_page: int
+    total_items: Optional[int] = None
+    total_pages: Optional[int] = None
+    current_page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    # False when total_items is a planner estimate or a possibly stale cached count
+    total_is_exact: bool = True
 
 
 # --- The New BaseRepository ---
@@ -33,17 +58,43 @@ class BaseRepository(Generic[ModelType]):
     It operates within a given session and never commits.
     """
 
-    def __init__(self, model: Type[ModelType], session: AsyncSession):
+    # Below this many (estimated) rows, an exact count is cheap enough to always take
+    ESTIMATE_MIN_ROWS = 10_000
+
+    def __init__(self, model: Type[ModelType], session: AsyncSession, use_replica: bool = False):
         """
         Initializes the repository with the SQLAlchemy model and a session.
 
         :param model: The SQLAlchemy model class.
         :param session: The SQLAlchemy AsyncSession for this request.
+        :param use_replica: Run this repository's reads on a read replica (in a
+            READ ONLY transaction) when one is configured, even outside GET requests.
         """
         self.model = model
         self.session = session
-        # Inspect the model to find the name of the primary key column
-        self.pk_name = inspect(self.model).primary_key[0].name
+        # Primary key, soft-delete column and filter/sort whitelist, computed once per model
+        self._plan = query_plan_for(model)
+        self.pk_name = self._plan.pk_name
+        # Passed to Session.get_bind via RoutingSession; None keeps the session's default routing
+        self._read_bind_arguments = {"routing": "replica"} if use_replica else None
+
+    async def _execute_read(self, stmt, params: Optional[Dict[str, Any]] = None):
+        """Executes a SELECT, allowing it to be routed to a read replica."""
+        return await self.session.execute(stmt, params, bind_arguments=self._read_bind_arguments)
+
+    def _resolve_sort(self, sort_by: Optional[List[str]]) -> List[tuple[Any, bool]]:
+        """
+        Turns sort specs into (column, descending) pairs, ignoring unknown fields.
+        Accepts "field", "-field", "field_asc" and "field_desc".
+        """
+        keys = []
+        for sort_field in sort_by or []:
+            descending = sort_field.startswith("-") or sort_field.endswith("_desc")
+            field_name = sort_field.removeprefix("-").removesuffix("_desc").removesuffix("_asc")
+            column = self._plan.columns.get(field_name)
+            if column is not None:
+                keys.append((column, descending))
+        return keys
 
     def _apply_filters_and_sort(
         self,
@@ -54,35 +105,54 @@ class BaseRepository(Generic[ModelType]):
     ):
         """Applies filtering, sorting, and soft-delete logic to a statement."""
         # 1. Apply soft-delete filter by default
-        if hasattr(self.model, "is_deleted") and not include_deleted:
-            stmt = stmt.where(self.model.is_deleted == False)
+        if not include_deleted:
+            stmt = self._plan.active_only(stmt)
 
-        # 2. Apply dynamic filters
+        # 2. Apply dynamic filters (unknown fields are ignored)
         if filters:
             for field, value in filters.items():
-                if hasattr(self.model, field):
-                    stmt = stmt.where(getattr(self.model, field) == value)
+                column = self._plan.columns.get(field)
+                if column is not None:
+                    stmt = stmt.where(column == value)
 
         # 3. Apply dynamic sorting
-        if sort_by:
-            for sort_field in sort_by:
-                direction = "desc" if sort_field.endswith("_desc") else "asc"
-                field_name = sort_field.removesuffix("_desc").removesuffix("_asc")
-                if hasattr(self.model, field_name):
-                    column = getattr(self.model, field_name)
-                    stmt = stmt.order_by(getattr(column, direction)())
+        for column, descending in self._resolve_sort(sort_by):
+            stmt = stmt.order_by(column.desc() if descending else column.asc())
         return stmt
 
+    @staticmethod
+    def _python_type(column) -> type | None:
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return None
+
+    @staticmethod
+    def _keyset_predicate(keys: List[tuple[Any, bool]], values: List[Any], backwards: bool):
+        """
+        Builds the WHERE clause selecting rows strictly after `values` in the
+        sort order given by `keys` (or strictly before it, when going backwards).
+        """
+        descending = [desc != backwards for _, desc in keys]
+        columns = [column for column, _ in keys]
+
+        # Uniform direction: a row-value comparison, which PostgreSQL serves from a composite index
+        if all(descending) or not any(descending):
+            row = tuple_(*columns)
+            return row < tuple(values) if descending[0] else row > tuple(values)
+
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        clauses = []
+        for i, column in enumerate(columns):
+            conditions = [columns[j] == values[j] for j in range(i)]
+            conditions.append(column < values[i] if descending[i] else column > values[i])
+            clauses.append(and_(*conditions))
+        return or_(*clauses)
+
     async def get_by_id(self, record_id: Any, include_deleted: bool = False) -> Optional[ModelType]:
         """Gets a single record by its primary key."""
-        pk_column = getattr(self.model, self.pk_name)
-        query = select(self.model).where(pk_column == record_id)
-        
-        # Apply soft-delete logic only if the model supports it
-        if hasattr(self.model, "is_deleted") and not include_deleted:
-            query = query.where(self.model.is_deleted == False)
-            
-        result = await self.session.execute(query)
+        query = self._plan.by_pk if include_deleted else self._plan.by_pk_active
+        result = await self._execute_read(query, {"pk": record_id})
         return result.scalars().first()
 
     async def get_many(
@@ -97,9 +167,38 @@ class BaseRepository(Generic[ModelType]):
         """Gets multiple records with filtering, sorting, and limit/offset."""
         stmt = self._apply_filters_and_sort(select(self.model), filters, sort_by, include_deleted)
         stmt = stmt.offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
+        result = await self._execute_read(stmt)
         return list(result.scalars().all())
 
+    async def _count(self, filters: Optional[Dict[str, Any]], include_deleted: bool) -> int:
+        """Runs an exact SELECT count(*) over the filtered set."""
+        count_stmt = self._apply_filters_and_sort(
+            select(func.count()).select_from(self.model),
+            filters,
+            include_deleted=include_deleted
+        )
+        return (await self._execute_read(count_stmt)).scalar_one()
+
+    async def _fetch_with_window_count(self, data_stmt) -> tuple[List[ModelType], Optional[int]]:
+        """
+        Runs the data query with count(*) OVER () attached, returning the page
+        and the total size of the filtered set in a single round trip.
+        The total is None when the page is empty (e.g. past the last page).
+        """
+        stmt = data_stmt.add_columns(func.count().over().label("total_count"))
+        rows = (await self._execute_read(stmt)).all()
+        total = rows[0].total_count if rows else None
+        return [row[0] for row in rows], total
+
+    def _estimated_rows_subquery(self):
+        """Scalar subquery returning the planner's row estimate for the model's table."""
+        pg_class = table("pg_class", column("oid"), column("reltuples"))
+        return (
+            select(cast(pg_class.c.reltuples, BigInteger))
+            .where(pg_class.c.oid == func.to_regclass(self.model.__table__.fullname))
+            .scalar_subquery()
+        )
+
     async def get_paginated(
         self,
         *,
@@ -108,19 +207,23 @@ class BaseRepository(Generic[ModelType]):
         filters: Optional[Dict[str, Any]] = None,
         sort_by: Optional[List[str]] = None,
         include_deleted: bool = False,
+        count_strategy: CountStrategy = CountStrategy.WINDOW,
     ) -> PaginationResult[ModelType]:
-        """Gets a paginated list of records."""
+        """
+        Gets a paginated list of records.
+
+        `count_strategy` picks how `total_items` is computed:
+        - WINDOW (default): count(*) OVER () in the data query, one round trip.
+        - EXACT: a separate SELECT count(*) before the data query.
+        - ESTIMATE: the table's pg_class.reltuples, fetched alongside the data.
+          Only used for unfiltered listings of tables above ESTIMATE_MIN_ROWS;
+          otherwise an exact count is taken. `total_is_exact` is False when used.
+        - CACHED: an exact count cached in Redis for a short TTL, invalidated
+          by `create` and `soft_delete`.
+        """
         if page < 1: page = 1
         if page_size < 1: page_size = 10
 
-        # Create and apply filters to the count query
-        count_stmt = self._apply_filters_and_sort(
-            select(func.count()).select_from(self.model),
-            filters,
-            include_deleted=include_deleted
-        )
-        total_items = (await self.session.execute(count_stmt)).scalar_one()
-
         # Create and apply filters/sort to the data query
         data_stmt = self._apply_filters_and_sort(
             select(self.model),
@@ -129,8 +232,37 @@ class BaseRepository(Generic[ModelType]):
             include_deleted
         )
         data_stmt = data_stmt.offset((page - 1) * page_size).limit(page_size)
-        result = await self.session.execute(data_stmt)
-        items = list(result.scalars().all())
+
+        total_items: Optional[int] = None
+        total_is_exact = True
+        table_name = self.model.__table__.name
+
+        if count_strategy == CountStrategy.ESTIMATE and not filters:
+            stmt = data_stmt.add_columns(self._estimated_rows_subquery().label("estimated_total"))
+            rows = (await self._execute_read(stmt)).all()
+            items = [row[0] for row in rows]
+            estimate = rows[0].estimated_total if rows else None
+            if estimate is not None and estimate >= self.ESTIMATE_MIN_ROWS:
+                total_items, total_is_exact = estimate, False
+        elif count_strategy == CountStrategy.CACHED:
+            total_items = await get_cached_count(table_name, filters, include_deleted)
+            if total_items is not None:
+                items = list((await self._execute_read(data_stmt)).scalars().all())
+                total_is_exact = False  # May lag behind changes other than create/soft_delete
+            else:
+                items, total_items = await self._fetch_with_window_count(data_stmt)
+                if total_items is None:
+                    total_items = await self._count(filters, include_deleted)
+                await set_cached_count(table_name, filters, include_deleted, total_items)
+        elif count_strategy == CountStrategy.EXACT:
+            total_items = await self._count(filters, include_deleted)
+            items = list((await self._execute_read(data_stmt)).scalars().all())
+        else:
+            items, total_items = await self._fetch_with_window_count(data_stmt)
+
+        if total_items is None:
+            # Empty page (or a small/unanalyzed table in ESTIMATE mode): only count when it can be non-zero
+            total_items = 0 if page == 1 and not items else await self._count(filters, include_deleted)
 
         return PaginationResult(
             items=items,
@@ -138,28 +270,150 @@ class BaseRepository(Generic[ModelType]):
             total_pages=math.ceil(total_items / page_size) if total_items > 0 else 0,
             current_page=page,
             page_size=page_size,
+            total_is_exact=total_is_exact,
+        )
+
+    async def get_keyset_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[List[str]] = None,
+        include_deleted: bool = False,
+    ) -> PaginationResult[ModelType]:
+        """
+        Gets a page of records using keyset (cursor) pagination.
+
+        The cursor encodes the boundary row's sort keys plus the primary key as
+        a tiebreaker, so each page is a bounded index range scan whose cost does
+        not grow with depth. Sort columns are expected to be non-nullable.
+        """
+        if page_size < 1: page_size = 10
+
+        keys = self._resolve_sort(sort_by)
+        pk_column = self._plan.pk_column
+        if not any(column is pk_column for column, _ in keys):
+            keys.append((pk_column, keys[-1][1] if keys else False))
+
+        stmt = self._apply_filters_and_sort(select(self.model), filters, include_deleted=include_deleted)
+
+        backwards = False
+        if cursor:
+            values, direction = decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise BadRequest("Pagination cursor does not match the requested sort order.")
+            values = coerce_cursor_values(values, [self._python_type(column) for column, _ in keys])
+            backwards = direction == "prev"
+            stmt = stmt.where(self._keyset_predicate(keys, values, backwards))
+
+        # Going backwards, scan in reverse order and flip the page afterwards
+        order = [column.desc() if desc != backwards else column.asc() for column, desc in keys]
+        stmt = stmt.order_by(*order).limit(page_size + 1)
+
+        result = await self._execute_read(stmt)
+        items = list(result.scalars().all())
+        has_more = len(items) > page_size
+        items = items[:page_size]
+        if backwards:
+            items.reverse()
+
+        def _cursor_for(row: ModelType, direction: str) -> str:
+            return encode_cursor([getattr(row, column.key) for column, _ in keys], direction)
+
+        # A forward page has a next page if more rows were found, and a previous
+        # page if it was reached through a cursor; a backward page mirrors that.
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else cursor is not None
+
+        next_cursor = prev_cursor = None
+        if items:
+            if has_next:
+                next_cursor = _cursor_for(items[-1], "next")
+            if has_prev:
+                prev_cursor = _cursor_for(items[0], "prev")
+
+        return PaginationResult(
+            items=items,
+            page_size=page_size,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    async def stream_batches(
+        self,
+        stmt,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Runs `stmt` on a server-side cursor and yields its rows in batches of
+        at most `batch_size`, so only one batch is held in memory at a time.
+        Select plain columns rather than entities to keep ORM objects out of
+        the session's identity map.
+        """
+        result = await self.session.stream(
+            stmt.execution_options(yield_per=batch_size),
+            bind_arguments=self._read_bind_arguments
         )
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    async def stream_columns(
+        self,
+        columns: List[Any],
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[List[str]] = None,
+        include_deleted: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Streams `columns` of the filtered records (ordered by primary key by default) in batches."""
+        stmt = self._apply_filters_and_sort(select(*columns), filters, sort_by or [self.pk_name], include_deleted)
+        async for batch in self.stream_batches(stmt, batch_size):
+            yield batch
+
+    def _to_row(self, data: BaseModel | Dict[str, Any], exclude_unset: bool = False) -> Dict[str, Any]:
+        """
+        Turns a schema or dict into a column -> value mapping for INSERT/UPDATE.
+        Secret values are unwrapped and keys that are not table columns
+        (e.g. nested profile data) are dropped.
+        """
+        fields = data.model_dump(exclude_unset=exclude_unset) if isinstance(data, BaseModel) else dict(data)
+        columns = self.model.__table__.columns
+        return {
+            key: value.get_secret_value() if isinstance(value, SecretStr) else value
+            for key, value in fields.items()
+            if key in columns
+        }
 
     async def create(self, data: CreateSchemaType) -> ModelType:
-        """Creates a new record from a Pydantic schema."""
-        instance = self.model(**data.model_dump())
-        self.session.add(instance)
-        await self.session.flush()  # Flush to get DB-generated values like ID
-        await self.session.refresh(instance) # Refresh to load all columns
+        """
+        Creates a new record from a Pydantic schema.
+        A single INSERT ... RETURNING loads DB-generated values into the instance.
+        """
+        stmt = insert(self.model).returning(self.model)
+        instance = (await self.session.scalars(stmt, [self._to_row(data)])).one()
+        invalidate_counts_on_commit(self.session, self.model.__table__.name)
         return instance
 
     async def update(self, record_id: Any, data: UpdateSchemaType) -> Optional[ModelType]:
-        """Updates an existing record from a Pydantic schema."""
-        instance = await self.get_by_id(record_id)
-        if instance:
-            # Use exclude_unset to only update fields that were provided in the request
-            update_data = data.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(instance, key, value)
-            self.session.add(instance)
-            await self.session.flush()
-            await self.session.refresh(instance)
-        return instance
+        """
+        Updates an existing record from a Pydantic schema with a single
+        UPDATE ... RETURNING. Returns None if the record does not exist.
+        """
+        # Use exclude_unset to only update fields that were provided in the request
+        update_data = self._to_row(data, exclude_unset=True)
+        if not update_data:
+            return await self.get_by_id(record_id)
+
+        stmt = update(self.model).where(self._plan.pk_column == record_id).values(**update_data)
+        stmt = self._plan.active_only(stmt)
+        # populate_existing refreshes the instance if it is already in the session
+        stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+        return (await self.session.scalars(stmt)).one_or_none()
 
     async def delete(self, record_id: Any) -> bool:
         """Performs a hard delete of a record."""
@@ -176,13 +430,12 @@ class BaseRepository(Generic[ModelType]):
         Assumes the model has an `is_deleted` boolean field.
         This is more efficient as it performs a direct UPDATE without a SELECT.
         """
-        if not hasattr(self.model, "is_deleted"):
+        if not self._plan.has_soft_delete:
             raise AttributeError(f"Model {self.model.__name__} does not have 'is_deleted' attribute.")
 
-        pk_column = getattr(self.model, self.pk_name)
         stmt = (
             update(self.model)
-            .where(pk_column == record_id)
+            .where(self._plan.pk_column == record_id)
             .where(self.model.is_deleted == False)
             .values(is_deleted=True)
         )
@@ -190,5 +443,183 @@ class BaseRepository(Generic[ModelType]):
 
         if result.rowcount > 0:
             await self.session.flush()
+            invalidate_counts_on_commit(self.session, self.model.__table__.name)
             return True
-        return False
\ No newline at end of file
+        return False
+
+    # --- Bulk Operations ---
+
+    @staticmethod
+    def _chunks(rows: List[Dict[str, Any]], chunk_size: int):
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    async def bulk_create(
+        self,
+        items: Sequence[BaseModel | Dict[str, Any]],
+        *,
+        returning: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[ModelType] | int:
+        """
+        Inserts many records with multi-row INSERT statements, `chunk_size` rows each.
+
+        With `returning` the created instances (with DB-generated values) are
+        returned; otherwise only the number of inserted rows, which skips
+        building ORM objects. Column defaults are applied as for `create`.
+        """
+        rows = [self._to_row(item) for item in items]
+        if not rows:
+            return [] if returning else 0
+
+        created: List[ModelType] = []
+        for chunk in self._chunks(rows, chunk_size):
+            if returning:
+                result = await self.session.scalars(insert(self.model).returning(self.model), chunk)
+                created.extend(result.all())
+            else:
+                await self.session.execute(insert(self.model), chunk)
+
+        invalidate_counts_on_commit(self.session, self.model.__table__.name)
+        return created if returning else len(rows)
+
+    async def bulk_upsert(
+        self,
+        items: Sequence[BaseModel | Dict[str, Any]],
+        *,
+        conflict_columns: List[str],
+        update_columns: Optional[List[str]] = None,
+        returning: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[ModelType] | int:
+        """
+        Inserts many records, updating those that collide on `conflict_columns`
+        (INSERT ... ON CONFLICT DO UPDATE). `conflict_columns` must be covered
+        by a unique constraint or index, e.g. ["username"] for users.
+
+        :param update_columns: Columns overwritten on conflict. Defaults to every
+            given column except the conflict and primary key columns. An empty
+            list turns the statement into ON CONFLICT DO NOTHING.
+        :return: The inserted/updated instances, or the number of affected rows.
+        """
+        rows = [self._to_row(item) for item in items]
+        # A single statement cannot touch the same row twice: keep the last row per key
+        deduplicated: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            if any(col not in row for col in conflict_columns):
+                raise BadRequest(f"bulk_upsert requires '{', '.join(conflict_columns)}' on every item.")
+            deduplicated[tuple(row[col] for col in conflict_columns)] = row
+        rows = list(deduplicated.values())
+        if not rows:
+            return [] if returning else 0
+
+        if update_columns is None:
+            skip = set(conflict_columns) | {self.pk_name}
+            update_columns = [key for key in rows[0] if key not in skip]
+
+        affected: List[ModelType] = []
+        affected_count = 0
+        for chunk in self._chunks(rows, chunk_size):
+            stmt = pg_insert(self.model)
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={col: stmt.excluded[col] for col in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+            if returning:
+                # populate_existing refreshes instances already in the identity map
+                result = await self.session.scalars(
+                    stmt.returning(self.model), chunk, execution_options={"populate_existing": True}
+                )
+                affected.extend(result.all())
+            else:
+                result = await self.session.execute(stmt, chunk)
+                affected_count += result.rowcount
+
+        invalidate_counts_on_commit(self.session, self.model.__table__.name)
+        return affected if returning else affected_count
+
+    async def bulk_update(
+        self,
+        items: Sequence[BaseModel | Dict[str, Any]],
+        *,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> int:
+        """
+        Updates many records by primary key with one UPDATE ... FROM (VALUES ...)
+        statement per chunk. Every item must contain the primary key; rows are
+        grouped by the set of columns they update.
+
+        This is a Core statement: instances already loaded in the session are
+        not refreshed. Returns the number of updated rows.
+        """
+        table = self.model.__table__
+        groups: Dict[tuple[str, ...], List[Dict[str, Any]]] = {}
+        for item in items:
+            row = self._to_row(item)
+            if self.pk_name not in row:
+                raise BadRequest(f"bulk_update requires '{self.pk_name}' on every item.")
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        updated = 0
+        for names, rows in groups.items():
+            update_names = [name for name in names if name != self.pk_name]
+            if not update_names:
+                continue
+            for chunk in self._chunks(rows, chunk_size):
+                data = values(*(column(name, table.c[name].type) for name in names), name="v").data(
+                    [tuple(row[name] for name in names) for row in chunk]
+                )
+                stmt = (
+                    update(table)
+                    .where(table.c[self.pk_name] == data.c[self.pk_name])
+                    .values({name: data.c[name] for name in update_names})
+                )
+                result = await self.session.execute(stmt)
+                updated += result.rowcount
+        return updated
+
+    async def copy_insert(self, items: Sequence[BaseModel | Dict[str, Any]]) -> int:
+        """
+        Fastest path for large inserts that need nothing back: streams the rows
+        with PostgreSQL COPY through the asyncpg connection of the session's
+        current transaction. Python-side column defaults are filled in, but no
+        ORM events run and conflicts fail the whole COPY. Returns the row count.
+        """
+        rows = [self._to_row(item) for item in items]
+        if not rows:
+            return 0
+
+        table = self.model.__table__
+        defaulted = [
+            col for col in table.columns
+            if col.default is not None and not col.default.is_sequence and not col.default.is_clause_element
+        ]
+        names = list(dict.fromkeys([*(key for row in rows for key in row), *(col.name for col in defaulted)]))
+        records = []
+        for row in rows:
+            for col in defaulted:
+                if col.name not in row:
+                    row[col.name] = col.default.arg(None) if col.default.is_callable else col.default.arg
+            records.append(tuple(self._copy_value(table.c[name], row.get(name)) for name in names))
+
+        connection = await self.session.connection()  # Joins (or begins) the session's transaction
+        raw_connection = await connection.get_raw_connection()
+        status = await raw_connection.driver_connection.copy_records_to_table(
+            table.name, schema_name=table.schema, columns=names, records=records
+        )
+        mark_write(self.session.sync_session)
+        invalidate_counts_on_commit(self.session, table.name)
+        return int(status.split()[-1])  # "COPY <n>"
+
+    @staticmethod
+    def _copy_value(col: Any, value: Any) -> Any:
+        """Adapts a value the way SQLAlchemy would bind it, since COPY bypasses it."""
+        if isinstance(value, Enum):
+            return value.name  # SQLAlchemy's Enum type stores member names
+        if isinstance(value, datetime) and value.tzinfo is not None and not getattr(col.type, "timezone", True):
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
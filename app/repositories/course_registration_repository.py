@@ -0,0 +1,40 @@
+# app/repositories/course_registration_repository.py
+from typing import Sequence, AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.course_registration import CourseRegistration
+from app.repositories import BaseRepository, STREAM_BATCH_SIZE
+
+
+class CourseRegistrationRepository(BaseRepository[CourseRegistration]):
+    """Repository for CourseRegistration model-specific database operations."""
+
+    def __init__(self, session: AsyncSession, use_replica: bool = False):
+        super().__init__(CourseRegistration, session, use_replica)
+
+    async def stream_for_semester(
+        self,
+        semester: str,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Streams every registration for the courses of a semester, with the course details."""
+        stmt = (
+            select(
+                CourseRegistration.registration_id,
+                CourseRegistration.student_id,
+                CourseRegistration.course_id,
+                Course.name.label("course_name"),
+                Course.subject_id,
+                CourseRegistration.status,
+                CourseRegistration.registration_time,
+            )
+            .join(Course, Course.course_id == CourseRegistration.course_id)
+            .where(Course.semester == semester)
+            .order_by(CourseRegistration.registration_id)
+        )
+        async for batch in self.stream_batches(stmt, batch_size):
+            yield batch
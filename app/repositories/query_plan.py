@@ -0,0 +1,62 @@
+# app/repositories/query_plan.py
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Type
+
+from sqlalchemy import select, bindparam, Select
+from sqlalchemy.inspection import inspect
+
+from app.models.base import Base
+
+
+@dataclass(frozen=True)
+class ModelQueryPlan:
+    """
+    Everything BaseRepository needs to know about a model, computed once per model.
+
+    `columns` is the whitelist of filterable/sortable attributes (mapped
+    columns only). `by_pk` and `by_pk_active` are prebuilt SELECTs taking the
+    primary key as the `pk` bind parameter; as the same statement objects are
+    reused, SQLAlchemy's compiled cache and asyncpg's prepared statements are
+    hit on every call instead of building and hashing a new statement.
+    """
+    model: Type[Base]
+    pk_name: str
+    pk_column: Any
+    soft_delete_column: Any | None
+    columns: dict[str, Any]
+    by_pk: Select
+    by_pk_active: Select
+
+    @property
+    def has_soft_delete(self) -> bool:
+        return self.soft_delete_column is not None
+
+    def active_only(self, stmt):
+        """Adds the soft-delete predicate to `stmt`, if the model supports soft deletes."""
+        if self.soft_delete_column is None:
+            return stmt
+        return stmt.where(self.soft_delete_column == False)
+
+
+@cache
+def query_plan_for(model: Type[Base]) -> ModelQueryPlan:
+    """Returns the (cached) query plan of a model."""
+    mapper = inspect(model)
+    pk_name = mapper.primary_key[0].name
+    columns = {attr.key: getattr(model, attr.key) for attr in mapper.column_attrs}
+    pk_column = columns[pk_name]
+    soft_delete_column = columns.get("is_deleted")
+
+    by_pk = select(model).where(pk_column == bindparam("pk"))
+    by_pk_active = by_pk if soft_delete_column is None else by_pk.where(soft_delete_column == False)
+
+    return ModelQueryPlan(
+        model=model,
+        pk_name=pk_name,
+        pk_column=pk_column,
+        soft_delete_column=soft_delete_column,
+        columns=columns,
+        by_pk=by_pk,
+        by_pk_active=by_pk_active,
+    )
@@ -1,25 +1,35 @@
 # app/repositories/user_repository.py
 from datetime import datetime, UTC
+from functools import cache
 from typing import Optional, Any
 
-from sqlalchemy import select, func, update
+from sqlalchemy import select, func, update, bindparam, Select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert
 
+from app.exceptions import BadRequest
 from app.models.user import User
-from app.models.address import Address
 from app.repositories import BaseRepository
+from app.repositories.query_plan import query_plan_for
 from app.schemas.users.user_schema import ProfileUpdateSchema, AddressUpdateSchema
 
 
+@cache
+def _by_username_stmt(include_deleted: bool) -> Select:
+    """The login lookup, built once and reused with `username` as a bind parameter."""
+    stmt = select(User).where(func.lower(User.username) == func.lower(bindparam("username")))
+    if not include_deleted:
+        stmt = query_plan_for(User).active_only(stmt)
+    return stmt.limit(1)
+
+
 class UserRepository(BaseRepository[User]):
     """
     Repository for User model-specific database operations.
     Inherits all common CRUD, pagination, and soft-delete logic from BaseRepository.
     """
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(User, session)
+    def __init__(self, session: AsyncSession, use_replica: bool = False):
+        super().__init__(User, session, use_replica)
 
     async def get_by_username(self, username: str, include_deleted: bool = False) -> Optional[User]:
         """
@@ -29,13 +39,7 @@ class UserRepository(BaseRepository[User]):
         if not username:
             return None
 
-        # Build the initial statement with the username filter
-        stmt = select(self.model).where(func.lower(self.model.username) == func.lower(username))
-
-        # Use the base class's helper to apply standard filters (like soft-delete)
-        stmt = self._apply_filters_and_sort(stmt, include_deleted=include_deleted)
-
-        result = await self.session.execute(stmt.limit(1))
+        result = await self._execute_read(_by_username_stmt(include_deleted), {"username": username})
         return result.scalars().first()
 
     async def activate_user(self, user_id: Any) -> bool:
@@ -125,34 +129,24 @@ class UserRepository(BaseRepository[User]):
 
     async def update_user_profile(self, user_id: Any, profile_data: ProfileUpdateSchema) -> Optional[User]:
         """
-        Updates a user's profile and their associated address.
+        Updates a user's profile in one UPDATE ... RETURNING.
+
+        Users have no address relation in this schema, so an address in the
+        payload is rejected rather than silently dropped.
         """
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
+        if profile_data.address is not None:
+            raise BadRequest("Updating the address is not supported.")
 
-        # Update user's direct fields
         update_values = profile_data.model_dump(exclude_unset=True, exclude={'address'})
-        if update_values:
-            q = update(User).where(User.user_id == user_id).values(**update_values, updated_at=func.now())
-            await self.session.execute(q)
-
-        # Handle address update
-        if profile_data.address:
-            address_data = profile_data.address.model_dump(exclude_unset=True)
-            if address_data:
-                # Check if user already has an address
-                if user.address_id:
-                    # Update existing address
-                    q = update(Address).where(Address.address_id == user.address_id).values(**address_data, updated_at=func.now())
-                    await self.session.execute(q)
-                else:
-                    # Create new address and link to user
-                    insert_stmt = insert(Address).values(**address_data).returning(Address.address_id)
-                    result = await self.session.execute(insert_stmt)
-                    new_address_id = result.scalar_one()
-                    await self.session.execute(update(User).where(User.user_id == user_id).values(address_id=new_address_id, updated_at=func.now()))
-        
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
\ No newline at end of file
+        update_values = {key: value for key, value in update_values.items() if key in User.__table__.columns}
+        if not update_values:
+            return await self.get_by_id(user_id)
+
+        stmt = (
+            update(User)
+            .where(User.user_id == user_id)
+            .values(**update_values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        return (await self.session.scalars(stmt)).one_or_none()
@@ -2,11 +2,14 @@
 from datetime import datetime, UTC
 from typing import Optional, Any
 
-from sqlalchemy import update, delete, select
+from sqlalchemy import update, delete, select, insert, and_, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.databases.lazy_session import invalidate_counts_on_commit
+from app.models.user import User
 from app.models.user_session import UserSession
 from app.repositories import BaseRepository, PaginationResult
+from app.repositories.query_plan import query_plan_for
 
 
 class UserSessionRepository(BaseRepository[UserSession]):
@@ -16,30 +19,135 @@ class UserSessionRepository(BaseRepository[UserSession]):
     and their corresponding refresh tokens.
     """
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(UserSession, session)
+    def __init__(self, session: AsyncSession, use_replica: bool = False):
+        super().__init__(UserSession, session, use_replica)
 
     async def get_by_jti(self, jti: str) -> Optional[UserSession]:
         """Fetches a session by its Refresh Token JTI."""
-        return await self.get_one_or_none(jti=jti)
+        stmt = select(self.model).where(self.model.jti == jti)
+        return (await self._execute_read(stmt)).scalar_one_or_none()
+
+    async def rotate_refresh_token(
+        self,
+        old_jti: str,
+        new_jti: str,
+        expires_at: datetime,
+        ip_address: Optional[str],
+        user_agent: Optional[str]
+    ) -> Optional[Row]:
+        """
+        Swaps a session's refresh token JTI in a single conditional UPDATE ... FROM users:
+        the row only changes if the old JTI is current, unrevoked and unexpired and the
+        user is active, so of two concurrent refreshes of the same token exactly one wins.
+
+        Returns (session_id, user_id, user_role) of the rotated session, or None if nothing
+        matched (see `get_rotation_state` for why).
+        """
+        now = datetime.now(UTC)
+        stmt = (
+            update(UserSession)
+            .where(UserSession.jti == old_jti)
+            .where(UserSession.revoked == False)
+            .where(UserSession.expires_at > now)
+            .where(UserSession.user_id == User.user_id)
+            .where(User.is_active == True)
+            .values(
+                jti=new_jti,
+                expires_at=expires_at,
+                last_active=now,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            .returning(UserSession.session_id, UserSession.user_id, User.user_role)
+        )
+        stmt = query_plan_for(User).active_only(stmt)
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def get_rotation_state(self, jti: str) -> Optional[Row]:
+        """
+        Explains a failed rotation: (user_id, revoked, expires_at, user_active) of the session
+        holding `jti`, or None if no session holds it (any more).
+        """
+        user_plan = query_plan_for(User)
+        user_active = User.is_active == True
+        if user_plan.has_soft_delete:
+            user_active = and_(user_active, user_plan.soft_delete_column == False)
+        stmt = (
+            select(UserSession.user_id, UserSession.revoked, UserSession.expires_at, user_active.label("user_active"))
+            .join(User, User.user_id == UserSession.user_id)
+            .where(UserSession.jti == jti)
+        )
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def open_session_for_login(
+        self,
+        user_id: Any,
+        jti: str,
+        expires_at: datetime,
+        ip_address: Optional[str],
+        user_agent: Optional[str]
+    ) -> UserSession:
+        """
+        Inserts the session row of a successful login, with RETURNING. Where the
+        model tracks failed login attempts, a data-modifying CTE clears them in
+        the same statement (only touching the user row if there is anything to
+        clear). last_login is not written here: it goes through the write-behind
+        buffer (see AuthService.login).
+        """
+        stmt = insert(UserSession).values(
+            user_id=user_id,
+            jti=jti,
+            expires_at=expires_at,
+            last_active=datetime.now(UTC),
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        if hasattr(User, "failed_login_attempts"):
+            reset_attempts = (
+                update(User)
+                .where(User.user_id == user_id)
+                .where(User.failed_login_attempts > 0)
+                .values(failed_login_attempts=0)
+                .returning(User.user_id)
+                .cte("reset_attempts")
+            )
+            stmt = stmt.add_cte(reset_attempts)
+        stmt = stmt.returning(UserSession)
+        user_session = (await self.session.scalars(stmt)).one()
+        invalidate_counts_on_commit(self.session, self.model.__table__.name)
+        return user_session
 
     async def list_sessions_for_user(
         self,
         user_id: Any,
         page: int = 1,
         page_size: int = 10,
-        include_revoked: bool = False
+        include_revoked: bool = False,
+        cursor: Optional[str] = None,
+        use_cursor: bool = False
     ) -> PaginationResult[UserSession]:
-        """Lists all sessions for a user, with pagination."""
+        """
+        Lists all sessions for a user, with pagination.
+        Uses keyset pagination when a cursor is given or `use_cursor` is set.
+        """
         filters = {"user_id": user_id}
         if not include_revoked:
             filters["revoked"] = False
 
+        sort_by = ["-last_active"]  # Show most recently active first
+        if cursor is not None or use_cursor:
+            return await self.get_keyset_page(
+                cursor=cursor,
+                page_size=page_size,
+                filters=filters,
+                sort_by=sort_by
+            )
+
         return await self.get_paginated(
             page=page,
             page_size=page_size,
             filters=filters,
-            sort_by=["-last_active"]  # Show most recently active first
+            sort_by=sort_by
         )
 
     async def revoke_session_by_id(self, session_id: Any, user_id: Any) -> bool:
@@ -55,6 +163,8 @@ class UserSessionRepository(BaseRepository[UserSession]):
             .values(revoked=True)
         )
         result = await self.session.execute(stmt)
+        if result.rowcount > 0:
+            invalidate_counts_on_commit(self.session, self.model.__table__.name)
         return result.rowcount > 0
 
     async def revoke_all_for_user(self, user_id: Any, except_jti: Optional[str] = None) -> int:
@@ -66,11 +176,15 @@ class UserSessionRepository(BaseRepository[UserSession]):
             update(self.model)
             .where(self.model.user_id == user_id)
             .where(self.model.revoked == False)
+            .values(revoked=True)
         )
         if except_jti:
             stmt = stmt.where(self.model.jti != except_jti)
 
         result = await self.session.execute(stmt)
+        if result.rowcount:
+            # Revoked sessions drop out of the default (active only) listing
+            invalidate_counts_on_commit(self.session, self.model.__table__.name)
         return result.rowcount
 
     async def prune_expired_sessions(self) -> int:
@@ -81,6 +195,8 @@ class UserSessionRepository(BaseRepository[UserSession]):
         now = datetime.now(UTC)
         stmt = delete(self.model).where(self.model.expires_at < now)
         result = await self.session.execute(stmt)
+        if result.rowcount:
+            invalidate_counts_on_commit(self.session, self.model.__table__.name)
         return result.rowcount
 
     async def is_revoked(self, jti: str) -> bool:
@@ -0,0 +1,8 @@
+# app/schemas/auth/account_schema.py
+from app.schemas import BaseSchema
+
+
+class AccountStatus(BaseSchema):
+    """What registration and OTP requests need to know about an existing account."""
+    user_id: int
+    is_active: bool
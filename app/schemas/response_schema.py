@@ -1,6 +1,6 @@
 # app/schemas/response_schema.py
 from typing import Generic, TypeVar, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 T = TypeVar('T')
 
@@ -11,3 +11,24 @@ class GenericResponse(BaseModel, Generic[T]):
     status: str = "success"
     message: Optional[str] = None
     data: Optional[T] = None
+
+
+class PaginatedData(BaseModel, Generic[T]):
+    """
+    The `data` payload of a paginated listing. Offset pages carry totals and
+    `current_page`; cursor pages carry `next_cursor`/`prev_cursor` instead.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[T]
+    total_items: Optional[int] = None
+    total_pages: Optional[int] = None
+    current_page: Optional[int] = None
+    page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total_is_exact: bool = True
+
+
+class PaginationResponse(GenericResponse[PaginatedData[T]], Generic[T]):
+    """A GenericResponse whose data is a page of items."""
@@ -1,14 +1,19 @@
 # app/services/auth_service.py
-from datetime import datetime, UTC, timedelta
+import uuid
+from datetime import datetime, UTC
 from typing import Any
 import jwt
 from pydantic import BaseModel as PydanticBase, SecretStr, EmailStr
 
-from app.databases.redis_manager import redis_manager
+from app.constants.cache_constants import ACCOUNT_CACHE_TAG, USER_CACHE_TAG
+from app.databases.lazy_session import invalidate_on_commit
+from app.databases.write_behind import write_behind
+from app.decorators.cache import cache
 from app.exceptions import Unauthorized, Forbidden, Conflict, NotFound
-from app.models.user_session import UserSession
+from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.repositories.user_session_repository import UserSessionRepository
+from app.schemas.auth.account_schema import AccountStatus
 from app.schemas.auth.login_schema import LoginRequest
 from app.schemas.auth.otp_schema import OTPRequest, OtpAction, OTPVerifyRequest
 from app.schemas.auth.register_schema import RegisterRequest
@@ -19,6 +24,7 @@ from app.utils.password_utils import verify_password, hash_password
 from app.utils.jwt_utils import jwt_handler
 from app.services.email_service import email_service
 from app.services.otp_service import otp_service
+from app.services.refresh_coalescer import refresh_coalescer
 
 
 # A private schema for creating user records
@@ -32,6 +38,31 @@ class _UserCreateSchema(PydanticBase):
 
 class AuthService:
 
+    @staticmethod
+    def account_cache_tag(username: str) -> str:
+        """The cache tag of the cached account lookup of a username (see find_account)."""
+        return ACCOUNT_CACHE_TAG.format(username=username.lower())
+
+    @classmethod
+    @cache(
+        schema=AccountStatus,
+        ttl=300,
+        negative_ttl=60,
+        prefix="account",
+        key=lambda cls, username, user_repo: username.lower(),
+        tags=lambda cls, username, user_repo: [AuthService.account_cache_tag(username)]
+    )
+    async def find_account(cls, username: str, user_repo: UserRepository) -> User | AccountStatus | None:
+        """
+        Looks up the account of a username, if any. Unknown usernames are cached
+        too, so registration and password-reset requests probing made-up emails
+        (enumeration scans, bots) stop reaching the database. Anything creating,
+        activating or deactivating an account must drop its `account_cache_tag`
+        with `invalidate_on_commit`, so a lookup racing the commit cannot
+        re-cache the account as missing.
+        """
+        return await user_repo.get_by_username(username)
+
     @classmethod
     async def register_user(
             cls,
@@ -39,7 +70,7 @@ class AuthService:
             user_repo: UserRepository
     ):
         """Handles the first step of registration: creating an inactive user and sending a verification OTP."""
-        existing_user = await user_repo.get_by_username(reg_data.email)
+        existing_user = await cls.find_account(reg_data.email, user_repo)
         if existing_user and existing_user.is_active:
             raise Conflict("An account with this email already exists.")
 
@@ -52,7 +83,10 @@ class AuthService:
                 last_name=reg_data.last_name,
                 is_active=False
             )
-            await user_repo.create(user_create_data)
+            new_user = await user_repo.create(user_create_data)
+            invalidate_on_commit(
+                user_repo.session, cls.account_cache_tag(reg_data.email), USER_CACHE_TAG.format(user_id=new_user.user_id)
+            )
 
         # Proceed to send OTP for the new or existing inactive user
         otp_request_data = OTPRequest(email=reg_data.email, action=OtpAction.REGISTER)
@@ -68,38 +102,32 @@ class AuthService:
             user_agent: str | None
     ) -> TokenData:
         """Handles user login, creates tokens, and records the user session in the database."""
+        # Round trip 1: the user, needed before the (threaded) bcrypt check
         user = await user_repo.get_by_username(login_data.username)
-        if not user or not verify_password(login_data.password.get_secret_value(), user.password):
+        if not user or not await verify_password(login_data.password, user.password):
             raise Unauthorized("Invalid username or password")
 
         if not user.is_active:
             raise Forbidden("Account is not active. Please verify your email.")
 
-        if hasattr(user, 'failed_login_attempts') and user.failed_login_attempts > 0:
-            await user_repo.reset_failed_attempts(user.user_id)
-
-        await user_repo.update_last_login(user.user_id)
-
-        access_token, refresh_token, access_jti, refresh_jti, expires_in = jwt_handler.create_tokens(
-            user_id=user.user_id, user_role=user.user_role.value)
+        tokens = jwt_handler.create_tokens(user_id=user.user_id, user_role=user.user_role.value)
 
-        refresh_payload = jwt.decode(refresh_token, options={"verify_signature": False})
-        refresh_expires_at = datetime.fromtimestamp(refresh_payload.get('exp'), tz=UTC)
-
-        session = UserSession(
+        # Round trip 2: the session insert (and failed attempts reset, where tracked)
+        await session_repo.open_session_for_login(
             user_id=user.user_id,
-            jti=refresh_jti,
-            expires_at=refresh_expires_at,
+            jti=tokens.refresh_jti,
+            expires_at=tokens.refresh_expires_at,
             ip_address=ip_address,
             user_agent=user_agent
         )
-        await session_repo.create(session)
+        # Informational only: batched with other logins instead of locking the user row now
+        write_behind.touch(User, user.user_id, last_login=datetime.now(UTC))
 
         return TokenData(
-            access_token=access_token,
-            refresh_token=refresh_token,
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token,
             token_type="bearer",
-            expires_in_minutes=expires_in,
+            expires_in_minutes=tokens.expires_in,
         )
 
     @classmethod
@@ -124,7 +152,7 @@ class AuthService:
             user_id = payload.get("sub")
 
             session = await session_repo.get_by_jti(refresh_jti)
-            if session and session.user_id == user_id:
+            if session and str(session.user_id) == user_id:  # `sub` is a string claim
                 session.revoked = True
                 await session_repo.session.commit()
         except (jwt.PyJWTError, Unauthorized, NotFound):
@@ -138,7 +166,6 @@ class AuthService:
             cls,
             old_refresh_token: str,
             session_repo: UserSessionRepository,
-            user_repo: UserRepository,
             ip_address: str | None,
             user_agent: str | None
     ) -> TokenData:
@@ -148,40 +175,73 @@ class AuthService:
         except (jwt.PyJWTError, Unauthorized) as e:
             raise Unauthorized("Invalid or expired refresh token") from e
 
-        user_id = payload.get("sub")
         old_jti = payload.get("jti")
+        # Tabs refreshing with the same cookie share one rotation instead of tripping reuse detection
+        return await refresh_coalescer.rotate_once(
+            old_jti,
+            lambda: cls._rotate(session_repo, old_jti, payload.get("sub"), ip_address, user_agent)
+        )
 
-        session = await session_repo.get_by_jti(old_jti)
-
-        if not session or session.revoked:
-            await session_repo.revoke_all_for_user(user_id)
-            await cls.revoke_all_access_tokens_for_user(user_id)
-            raise Forbidden("Compromised refresh token detected. All sessions have been logged out.")
-
-        user = await user_repo.get_by_id(user_id)
-        if not user or not user.is_active:
-            raise Unauthorized("User account is inactive or not found.")
-
-        access_token, new_refresh_token, access_jti, new_refresh_jti, expires_in = jwt_handler.create_tokens(
-            user_id=user.user_id, user_role=user.user_role.value)
-
-        new_refresh_payload = jwt.decode(new_refresh_token, options={"verify_signature": False})
-        new_expires_at = datetime.fromtimestamp(new_refresh_payload.get('exp'), tz=UTC)
-
-        session.jti = new_refresh_jti
-        session.expires_at = new_expires_at
-        session.last_active = datetime.now(UTC)
-        session.ip_address = ip_address
-        session.user_agent = user_agent
+    @classmethod
+    async def _rotate(
+            cls,
+            session_repo: UserSessionRepository,
+            old_jti: str,
+            user_id: Any,
+            ip_address: str | None,
+            user_agent: str | None
+    ) -> TokenData:
+        """Rotates the refresh token and commits, so the new pair can be shared right away."""
+        issued_at = datetime.now(UTC)
+        new_jti = str(uuid.uuid4())
+
+        # One round trip: the UPDATE only matches a current, unrevoked session of an active user
+        rotated = await session_repo.rotate_refresh_token(
+            old_jti=old_jti,
+            new_jti=new_jti,
+            expires_at=issued_at + jwt_handler.refresh_token_lifetime,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        if rotated is None:
+            await cls._handle_failed_rotation(session_repo, old_jti, user_id)
         await session_repo.session.commit()
 
+        tokens = jwt_handler.create_tokens(
+            user_id=rotated.user_id,
+            user_role=rotated.user_role.value,
+            refresh_jti=new_jti,
+            issued_at=issued_at
+        )
+
         return TokenData(
-            access_token=access_token,
-            refresh_token=new_refresh_token,
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token,
             token_type="bearer",
-            expires_in_minutes=expires_in
+            expires_in_minutes=tokens.expires_in
         )
 
+    @classmethod
+    async def _handle_failed_rotation(cls, session_repo: UserSessionRepository, old_jti: str, user_id: Any):
+        """
+        Works out why a rotation matched no row and raises accordingly. A refresh token
+        that is revoked or no longer current has been used before: treat it as stolen
+        and log the user out everywhere.
+        """
+        state = await session_repo.get_rotation_state(old_jti)
+
+        if state is None or state.revoked:
+            owner_id = state.user_id if state is not None else int(user_id)
+            await session_repo.revoke_all_for_user(owner_id)
+            # Committed here, as the error response would roll the request's session back
+            await session_repo.session.commit()
+            await cls.revoke_all_access_tokens_for_user(owner_id)
+            raise Forbidden("Compromised refresh token detected. All sessions have been logged out.")
+
+        if not state.user_active:
+            raise Unauthorized("User account is inactive or not found.")
+        raise Unauthorized("Invalid or expired refresh token")
+
     @classmethod
     async def request_otp(
             cls,
@@ -190,7 +250,7 @@ class AuthService:
     ):
         """Handles the business logic for requesting an OTP using Redis."""
         if otp_data.action == OtpAction.RESET_PASSWORD:
-            user = await user_repo.get_by_username(otp_data.email)
+            user = await cls.find_account(otp_data.email, user_repo)
             if not user:
                 raise NotFound("No account found with this email address.")
 
@@ -243,9 +303,11 @@ class AuthService:
 
         if not user.is_active:
             await user_repo.activate_user(user.user_id)
+            invalidate_on_commit(
+                user_repo.session, cls.account_cache_tag(user.username), USER_CACHE_TAG.format(user_id=user.user_id)
+            )
 
     @classmethod
     async def revoke_all_access_tokens_for_user(cls, user_id: Any):
         """Instantly invalidates all access tokens for a user by setting a revocation timestamp in Redis."""
-        key = f"user_revoke_all_timestamp:{user_id}"
-        await redis_manager.client.set(key, int(datetime.now(UTC).timestamp()), ex=timedelta(days=31))
\ No newline at end of file
+        await jwt_handler.revoke_all_for_user(user_id)
\ No newline at end of file
@@ -0,0 +1,81 @@
+# app/services/export_service.py
+import csv
+import io
+import json
+from datetime import datetime, date
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.export_constants import ExportFormat
+from app.models.user import User
+from app.models.user_session import UserSession
+from app.repositories.course_registration_repository import CourseRegistrationRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.user_session_repository import UserSessionRepository
+
+# Exported user columns; the password hash is deliberately left out
+USER_EXPORT_COLUMNS = [
+    User.user_id, User.username, User.email, User.first_name, User.last_name,
+    User.user_role, User.is_active, User.created_at, User.last_login,
+]
+SESSION_EXPORT_COLUMNS = [
+    UserSession.session_id, UserSession.user_id, UserSession.revoked, UserSession.created_at,
+    UserSession.expires_at, UserSession.last_active, UserSession.ip_address, UserSession.user_agent,
+]
+
+
+def _plain(value: Any) -> Any:
+    """Converts a column value to a JSON/CSV-friendly primitive."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class ExportService:
+    """
+    Streams whole tables (or large filtered subsets) as NDJSON or CSV.
+
+    Rows are read as plain column tuples from a server-side cursor and
+    encoded one batch at a time, so memory use does not grow with the export.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def users(self) -> AsyncIterator[Sequence[Row]]:
+        return UserRepository(self.session).stream_columns(USER_EXPORT_COLUMNS)
+
+    def user_sessions(self, user_id: int) -> AsyncIterator[Sequence[Row]]:
+        return UserSessionRepository(self.session).stream_columns(
+            SESSION_EXPORT_COLUMNS, filters={"user_id": user_id}
+        )
+
+    def course_registrations(self, semester: str) -> AsyncIterator[Sequence[Row]]:
+        return CourseRegistrationRepository(self.session).stream_for_semester(semester)
+
+    @staticmethod
+    async def encode(batches: AsyncIterator[Sequence[Row]], export_format: ExportFormat) -> AsyncIterator[str]:
+        """Encodes each batch of rows into one chunk of the requested format."""
+        header_written = False
+        async for batch in batches:
+            if not batch:
+                continue
+            if export_format is ExportFormat.NDJSON:
+                yield "".join(
+                    json.dumps({key: _plain(value) for key, value in row._mapping.items()}) + "\n"
+                    for row in batch
+                )
+                continue
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not header_written:
+                writer.writerow(batch[0]._fields)
+                header_written = True
+            writer.writerows([_plain(value) for value in row] for row in batch)
+            yield buffer.getvalue()
@@ -0,0 +1,125 @@
+# app/services/refresh_coalescer.py
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from pydantic import ValidationError
+
+from app.databases.redis_manager import redis_manager
+from app.exceptions import Conflict
+from app.schemas.auth.token_schema import TokenData
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+_PENDING = "pending"
+_POLL_INTERVAL = 0.05
+
+
+class RefreshCoalescingStats:
+    """Per-worker counters of coalesced token refreshes."""
+
+    def __init__(self) -> None:
+        self.rotations = 0  # Refreshes that rotated the token themselves
+        self.coalesced = 0  # Refreshes answered with another request's rotation
+        self.waited = 0  # ...of which had to wait for that rotation to finish
+        self.wait_timeouts = 0
+        self.failures = 0  # Rotations that raised; a waiting request then takes over as leader
+        self.reelections = 0  # Waiting requests that took over after the leader failed
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(vars(self))
+
+
+class RefreshCoalescer:
+    """
+    Single-flight for refresh token rotation, keyed by the old refresh JTI.
+
+    Browsers with several tabs refresh with the same cookie at the same time.
+    The first request claims `refresh_rotation:<old jti>` in Redis and rotates;
+    requests arriving within the grace window wait for it and receive the same
+    token pair instead of tripping reuse detection (which would log the user
+    out everywhere). The result is only published once the rotation is
+    committed, so a shared refresh token always exists in the database.
+    """
+    _KEY_PREFIX = "refresh_rotation"
+
+    def __init__(self) -> None:
+        self.grace_seconds = 10
+        self.wait_seconds = 3.0
+        self.stats = RefreshCoalescingStats()
+
+    def configure(self, grace_seconds: int, wait_ms: int) -> None:
+        self.grace_seconds = grace_seconds
+        self.wait_seconds = wait_ms / 1000
+
+    @classmethod
+    def _get_key(cls, old_jti: str) -> str:
+        return f"{cls._KEY_PREFIX}:{old_jti}"
+
+    async def rotate_once(self, old_jti: str, rotate: Callable[[], Awaitable[TokenData]]) -> TokenData:
+        """
+        Runs `rotate` unless another request is already rotating (or just rotated)
+        the same refresh token, in which case that request's token pair is returned.
+        `rotate` must commit before returning.
+        """
+        if self.grace_seconds <= 0:
+            return await rotate()
+
+        key = self._get_key(old_jti)
+        deadline = time.monotonic() + self.wait_seconds
+        waited_for_leader = False
+        while True:
+            if await redis_manager.client.set(key, _PENDING, nx=True, ex=self.grace_seconds):
+                if waited_for_leader:
+                    self.stats.reelections += 1
+                return await self._lead(key, rotate)
+
+            shared = await self._wait_for(key, deadline)
+            if shared is not None:
+                self.stats.coalesced += 1
+                return shared
+
+            # The leader failed (or its record expired): elect a new one with SET NX
+            # again rather than letting every waiter rotate, as all but one of them
+            # would then trip reuse detection and revoke every session of the user
+            waited_for_leader = True
+
+    async def _lead(self, key: str, rotate: Callable[[], Awaitable[TokenData]]) -> TokenData:
+        try:
+            tokens = await rotate()
+        except Exception:
+            self.stats.failures += 1
+            await redis_manager.client.delete(key)
+            raise
+
+        self.stats.rotations += 1
+        await redis_manager.client.set(key, tokens.model_dump_json(), xx=True, ex=self.grace_seconds)
+        return tokens
+
+    async def _wait_for(self, key: str, deadline: float) -> TokenData | None:
+        """Waits for the leader's token pair until `deadline`; None if the record disappears."""
+        waited = False
+        while True:
+            value = await redis_manager.client.get(key)
+            if value is None:
+                return None
+            if value != _PENDING:
+                if waited:
+                    self.stats.waited += 1
+                try:
+                    return TokenData.model_validate_json(value)
+                except ValidationError:
+                    logger.warning(f"Discarding unreadable refresh rotation record {key}")
+                    await redis_manager.client.delete(key)
+                    return None
+
+            if time.monotonic() >= deadline:
+                self.stats.wait_timeouts += 1
+                raise Conflict("A refresh for this token is already in progress. Please retry.")
+            waited = True
+            await asyncio.sleep(_POLL_INTERVAL)
+
+
+# A single, shared instance for the entire application (per worker)
+refresh_coalescer = RefreshCoalescer()
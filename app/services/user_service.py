@@ -2,6 +2,9 @@
 from typing import Any
 from pydantic import SecretStr
 
+from app.constants.cache_constants import USER_CACHE_TAG
+from app.constants.pagination_constants import CountStrategy
+from app.databases.lazy_session import invalidate_on_commit
 from app.decorators.cache import cache
 from app.exceptions import NotFound, Conflict, Unauthorized
 from app.models.user import User
@@ -18,7 +21,21 @@ class UserService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
 
-    @cache(schema=UserRead, ttl=300, prefix="user_profile")
+    @staticmethod
+    def cache_tag(user_id: Any) -> str:
+        """The cache tag of every cached entry derived from a user's row."""
+        return USER_CACHE_TAG.format(user_id=user_id)
+
+    @cache(
+        schema=UserRead,
+        ttl=300,
+        stale_ttl=60,
+        negative_ttl=30,
+        cache_exceptions=(NotFound,),
+        prefix="user_profile",
+        key=lambda self, user_id: user_id,
+        tags=lambda self, user_id: [UserService.cache_tag(user_id)]
+    )
     async def get_user_by_id(self, user_id: int) -> User:
         """Fetches a user by their ID. Raises NotFound if the user does not exist."""
         user = await self.user_repo.get_by_id(user_id)
@@ -39,7 +56,7 @@ class UserService:
         if not user:
             raise NotFound("Authenticated user not found.")
 
-        if verify_password(data.old_password.get_secret_value(), user.password):
+        if not await verify_password(data.old_password, user.password):
             raise Unauthorized("Invalid old password.")
 
         hashed_new_password = hash_password(data.new_password.get_secret_value())
@@ -48,19 +65,34 @@ class UserService:
 
         await session_repo.revoke_all_for_user(user.user_id)
         await AuthService.revoke_all_access_tokens_for_user(user.user_id)
+        invalidate_on_commit(user_repo.session, cls.cache_tag(user.user_id))
 
     async def update_user_profile(self, user_id: Any, profile_data: ProfileUpdateSchema) -> User:
         """Updates a user's profile information."""
         updated_user = await self.user_repo.update_user_profile(user_id, profile_data)
         if not updated_user:
             raise NotFound(f"User with id {user_id} not found.")
+        invalidate_on_commit(self.user_repo.session, self.cache_tag(user_id))
         return updated_user
 
     # --- Admin Management Methods ---
 
-    async def list_all_users(self, page: int, page_size: int):
-        """Lists all users with pagination for admin purposes."""
-        return await self.user_repo.get_paginated(page=page, page_size=page_size)
+    async def list_all_users(
+        self,
+        page: int,
+        page_size: int,
+        cursor: str | None = None,
+        use_cursor: bool = False,
+        count_strategy: CountStrategy = CountStrategy.ESTIMATE
+    ):
+        """
+        Lists all users with pagination for admin purposes.
+        Uses keyset pagination when a cursor is given or `use_cursor` is set.
+        Offset pages compute their total with `count_strategy`.
+        """
+        if cursor is not None or use_cursor:
+            return await self.user_repo.get_keyset_page(cursor=cursor, page_size=page_size)
+        return await self.user_repo.get_paginated(page=page, page_size=page_size, count_strategy=count_strategy)
 
     async def create_user_by_admin(self, user_data: AdminUserCreateSchema) -> User:
         """Creates a new user by an admin."""
@@ -79,6 +111,10 @@ class UserService:
             last_name=user_data.last_name
         )
         new_user = await self.user_repo.create(user_create_for_repo)
+        # Drop what was cached about the user not existing, once the user is visible
+        invalidate_on_commit(
+            self.user_repo.session, self.cache_tag(new_user.user_id), AuthService.account_cache_tag(new_user.username)
+        )
         return new_user
 
     async def get_user_details_by_admin(self, user_id: int) -> User:
@@ -90,13 +126,15 @@ class UserService:
 
     async def update_user_by_admin(self, user_id: int, update_data: AdminUserUpdateSchema) -> User:
         """Updates a user's information by an admin."""
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise NotFound(f"User with id {user_id} not found.")
-        
         user_update_for_repo = UserUpdate(**update_data.model_dump(exclude_unset=True))
-        
+
+        # A single UPDATE ... RETURNING; None means the user does not exist
         updated_user = await self.user_repo.update(user_id, user_update_for_repo)
+        if not updated_user:
+            raise NotFound(f"User with id {user_id} not found.")
+        invalidate_on_commit(
+            self.user_repo.session, self.cache_tag(user_id), AuthService.account_cache_tag(updated_user.username)
+        )
         return updated_user
 
     async def delete_user_by_admin(self, user_id: int, session_repo: UserSessionRepository) -> None:
@@ -111,3 +149,4 @@ class UserService:
         
         await session_repo.revoke_all_for_user(user_id)
         await AuthService.revoke_all_access_tokens_for_user(user_id)
+        invalidate_on_commit(self.user_repo.session, self.cache_tag(user_id), AuthService.account_cache_tag(user.username))
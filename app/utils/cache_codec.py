@@ -0,0 +1,133 @@
+# app/utils/cache_codec.py
+import struct
+import zlib
+from typing import Any, Type
+
+from pydantic import BaseModel
+
+from app.constants.cache_constants import CacheFormat, CacheCompression
+from app.utils.logger_utils import get_logger
+from app.utils.tiered_cache import NegativeEntry, decode_entry
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for CACHE_CODEC=msgpack
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for CACHE_COMPRESSION=zstd
+    zstandard = None
+
+logger = get_logger(__name__)
+
+# magic, header version, format, compression, fresh until (epoch seconds), compute seconds
+_HEADER = struct.Struct("!2sBBBdf")
+_MAGIC = b"\xca\xc4"  # Never the start of a text entry (JSON, "e1|..." or "!...")
+_VERSION = 1
+
+_ZLIB_LEVEL = 1  # Cached values are written on the request path: favour speed over ratio
+_ZSTD_LEVEL = 3
+
+
+class CacheCodec:
+    """
+    Turns @cache entries into the bytes stored in Redis and back.
+
+    Every entry starts with a small binary header recording how its body was
+    serialized and compressed, along with its logical expiry and compute time
+    (see TieredCache). Readers follow the header, not the current settings, so
+    the codec can be changed without flushing Redis; entries without a header
+    are the former UTF-8 text entries and are still read.
+
+    Bodies of at least `compress_min_bytes` are compressed (large lists gain
+    most), and kept compressed only if that made them smaller.
+    """
+
+    def __init__(self) -> None:
+        self.format = CacheFormat.JSON
+        self.compression = CacheCompression.ZLIB
+        self.compress_min_bytes = 1024
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    def configure(self, codec: str, compression: str, compress_min_bytes: int) -> None:
+        """Selects the format and compression of new entries; unavailable options fall back with a warning."""
+        self.format = CacheFormat[codec.upper()]
+        if self.format is CacheFormat.MSGPACK and msgpack is None:
+            logger.warning("CACHE_CODEC=msgpack but the msgpack package is not installed; using JSON.")
+            self.format = CacheFormat.JSON
+
+        self.compression = CacheCompression[compression.upper()]
+        if self.compression is CacheCompression.ZSTD and zstandard is None:
+            logger.warning("CACHE_COMPRESSION=zstd but the zstandard package is not installed; using zlib.")
+            self.compression = CacheCompression.ZLIB
+        self.compress_min_bytes = compress_min_bytes
+
+    # --- Encoding ---
+
+    def encode(self, value: BaseModel | NegativeEntry, fresh_until: float, delta: float) -> bytes:
+        if isinstance(value, NegativeEntry):
+            fmt, body = CacheFormat.NEGATIVE, value.encode().encode()
+        elif self.format is CacheFormat.MSGPACK:
+            fmt, body = CacheFormat.MSGPACK, msgpack.packb(value.model_dump(mode="json"))
+        else:
+            fmt, body = CacheFormat.JSON, value.__pydantic_serializer__.to_json(value)
+
+        compression = CacheCompression.NONE
+        if self.compression is not CacheCompression.NONE and len(body) >= self.compress_min_bytes:
+            compressed = self._compress(body)
+            if len(compressed) < len(body):
+                compression, body = self.compression, compressed
+
+        return _HEADER.pack(_MAGIC, _VERSION, fmt, compression, fresh_until, delta) + body
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.compression is CacheCompression.ZSTD:
+            if self._zstd_compressor is None:
+                self._zstd_compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            return self._zstd_compressor.compress(body)
+        return zlib.compress(body, _ZLIB_LEVEL)
+
+    # --- Decoding ---
+
+    def decode(self, raw: bytes, schema: Type[BaseModel]) -> tuple[Any, float, float]:
+        """
+        Returns (schema instance or NegativeEntry, fresh until, compute seconds).
+        The value is None if the entry cannot be read here (an unknown header
+        version, or a codec this worker lacks); callers treat that as a miss.
+        """
+        if not raw.startswith(_MAGIC):
+            payload, fresh_until, delta = decode_entry(raw.decode())
+            negative = NegativeEntry.decode(payload)
+            return (negative or schema.model_validate_json(payload)), fresh_until, delta
+
+        _, version, fmt, compression, fresh_until, delta = _HEADER.unpack_from(raw)
+        if version != _VERSION:
+            return None, fresh_until, delta
+        body = self._decompress(compression, raw[_HEADER.size:])
+        if body is None:
+            return None, fresh_until, delta
+
+        if fmt == CacheFormat.JSON:
+            return schema.model_validate_json(body), fresh_until, delta
+        if fmt == CacheFormat.NEGATIVE:
+            return NegativeEntry.decode(body.decode()), fresh_until, delta
+        if fmt == CacheFormat.MSGPACK and msgpack is not None:
+            return schema.model_validate(msgpack.unpackb(body)), fresh_until, delta
+        return None, fresh_until, delta
+
+    def _decompress(self, compression: int, body: bytes) -> bytes | None:
+        if compression == CacheCompression.NONE:
+            return body
+        if compression == CacheCompression.ZLIB:
+            return zlib.decompress(body)
+        if compression == CacheCompression.ZSTD and zstandard is not None:
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = zstandard.ZstdDecompressor()
+            return self._zstd_decompressor.decompress(body)
+        return None
+
+
+# A single, shared instance for the entire application (per worker)
+cache_codec = CacheCodec()
@@ -0,0 +1,73 @@
+# app/utils/count_cache_utils.py
+import hashlib
+import json
+import time
+from typing import Any, Optional
+
+from app.databases.redis_manager import redis_manager
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+COUNT_CACHE_TTL = 60  # Seconds a cached count is served before it is recomputed
+
+
+def _table_key(table_name: str) -> str:
+    # One hash per table, so invalidating every cached count of a table is a single DEL
+    return f"count_cache:{table_name}"
+
+
+def _fingerprint(filters: Optional[dict[str, Any]], include_deleted: bool) -> str:
+    raw = json.dumps([sorted((filters or {}).items()), include_deleted], default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+async def get_cached_count(
+        table_name: str,
+        filters: Optional[dict[str, Any]],
+        include_deleted: bool,
+        ttl: int = COUNT_CACHE_TTL
+) -> Optional[int]:
+    """Returns the cached count for a filtered listing, or None if missing or older than `ttl`."""
+    try:
+        cached = await redis_manager.client.hget(_table_key(table_name), _fingerprint(filters, include_deleted))
+    except Exception as e:
+        logger.error(f"Redis HGET failed for count cache of {table_name}: {e}")
+        return None
+
+    if not cached:
+        return None
+    count, stored_at = cached.split(":")
+    if time.time() - float(stored_at) > ttl:
+        return None
+    return int(count)
+
+
+async def set_cached_count(
+        table_name: str,
+        filters: Optional[dict[str, Any]],
+        include_deleted: bool,
+        count: int,
+        ttl: int = COUNT_CACHE_TTL
+) -> None:
+    """Stores an exact count, stamped with the time it was computed."""
+    key = _table_key(table_name)
+    try:
+        pipe = redis_manager.client.pipeline(transaction=False)
+        pipe.hset(key, _fingerprint(filters, include_deleted), f"{count}:{time.time()}")
+        pipe.expire(key, ttl)
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"Redis HSET failed for count cache of {table_name}: {e}")
+
+
+async def invalidate_counts(*table_names: str) -> None:
+    """
+    Drops every cached count for the given tables, in a single DEL. Called
+    once the writes that changed them (created or soft-deleted rows) have
+    been committed; see `invalidate_counts_on_commit`.
+    """
+    try:
+        await redis_manager.client.delete(*(_table_key(table_name) for table_name in table_names))
+    except Exception as e:
+        logger.error(f"Redis DEL failed for count cache of {', '.join(table_names)}: {e}")
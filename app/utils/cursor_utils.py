@@ -0,0 +1,105 @@
+# app/utils/cursor_utils.py
+import base64
+import json
+from datetime import datetime, date
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Literal
+
+from app.exceptions import BadRequest
+
+CursorDirection = Literal["next", "prev"]
+
+
+def _encode_value(value: Any) -> Any:
+    """Makes a sort-key value JSON-safe, tagging types JSON cannot round-trip."""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Enum):
+        # SQLAlchemy's Enum type binds enum members by name
+        return {"$enum": value.name}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$enum" in value:
+            return value["$enum"]
+        raise ValueError("Unknown cursor value type")
+    return value
+
+
+def encode_cursor(values: list[Any], direction: CursorDirection) -> str:
+    """
+    Encodes the sort-key values of a boundary row into an opaque, URL-safe cursor.
+
+    :param values: The row's sort-key values, primary key last.
+    :param direction: "next" to continue after the row, "prev" to page back before it.
+    """
+    payload = {"k": [_encode_value(value) for value in values], "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list[Any], CursorDirection]:
+    """Decodes a cursor produced by `encode_cursor`. Raises BadRequest if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload["k"], list):
+            raise TypeError("Cursor keys must be a list")
+        values = [_decode_value(value) for value in payload["k"]]
+        direction = payload["d"]
+    except (ValueError, KeyError, TypeError):
+        raise BadRequest("Invalid pagination cursor.")
+
+    if direction not in ("next", "prev"):
+        raise BadRequest("Invalid pagination cursor.")
+    return values, direction
+
+
+def _coerce_value(value: Any, python_type: type | None) -> Any:
+    if python_type is None:
+        # Unknown column type: accept scalars only, never nested lists or objects
+        if isinstance(value, (str, int, float, date)):
+            return value
+        raise ValueError("Unsupported cursor value")
+    if issubclass(python_type, Enum):
+        python_type[value]  # Cursors carry enum members by name; KeyError/TypeError if not one
+        return value
+    if python_type is bool:
+        if isinstance(value, bool):
+            return value
+    elif python_type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif python_type in (float, Decimal):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return python_type(value)
+    elif python_type is date:
+        if isinstance(value, date) and not isinstance(value, datetime):
+            return value
+    elif isinstance(value, python_type):
+        return value
+    raise ValueError("Cursor value does not match its sort column")
+
+
+def coerce_cursor_values(values: list[Any], python_types: list[type | None]) -> list[Any]:
+    """
+    Checks decoded cursor values against the Python types of their sort
+    columns (None where unknown), so a forged cursor is rejected with
+    BadRequest instead of failing in the driver. Sort columns are
+    non-nullable, so None is never valid.
+    """
+    try:
+        if len(values) != len(python_types) or any(value is None for value in values):
+            raise ValueError("Cursor does not match the sort order")
+        return [_coerce_value(value, python_type) for value, python_type in zip(values, python_types)]
+    except (ValueError, KeyError, TypeError):
+        raise BadRequest("Invalid pagination cursor.")
@@ -1,16 +1,74 @@
 import jwt
+import time
 from datetime import datetime, timedelta, UTC
 import uuid
-from typing import Literal, Optional
+from typing import Any, Literal, Optional, NamedTuple
 
 from sanic import Sanic
 
 from app.databases.redis_manager import redis_manager
 from app.exceptions import Unauthorized
+from app.utils.revocation_snapshot import revocation_snapshot
+from app.utils.revocation_store import revocation_store, USER_REVOCATION_LIFETIME
+
+
+class IssuedTokens(NamedTuple):
+    """A freshly signed access/refresh token pair and the claims callers need to persist."""
+    access_token: str
+    refresh_token: str
+    access_jti: str
+    refresh_jti: str
+    expires_in: float  # Access token lifetime, in minutes
+    access_expires_at: datetime
+    refresh_expires_at: datetime
+
+
+class RevocationVerdictCache:
+    """
+    Per-worker cache of "not revoked" verdicts, keyed by JTI, for a very short TTL.
+
+    A revocation made by another worker is only seen here once the verdict
+    expires, so the TTL is the window in which a revoked token still works;
+    revocations made by this worker evict the affected entries immediately.
+    Revoked verdicts are never cached. Disabled with a TTL of 0.
+    """
+
+    def __init__(self, ttl_ms: int = 0, max_entries: int = 10000):
+        self.ttl = ttl_ms / 1000
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, str]] = {}  # jti -> (expires at, user id)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def is_known_valid(self, jti: str) -> bool:
+        entry = self._entries.get(jti)
+        if entry is None:
+            return False
+        if entry[0] <= time.monotonic():
+            del self._entries[jti]
+            return False
+        return True
+
+    def remember_valid(self, jti: str, user_id: str) -> None:
+        if len(self._entries) >= self.max_entries:
+            # Insertion order: drop the oldest entry
+            del self._entries[next(iter(self._entries))]
+        self._entries[jti] = (time.monotonic() + self.ttl, user_id)
+
+    def forget(self, jti: str) -> None:
+        self._entries.pop(jti, None)
+
+    def forget_user(self, user_id: Any) -> None:
+        user_id = str(user_id)
+        for jti in [jti for jti, (_, owner) in self._entries.items() if owner == user_id]:
+            del self._entries[jti]
 
 
 class JWTHandler:
     def __init__(self, app: Optional[Sanic] = None):
+        self.verdicts = RevocationVerdictCache()
         if app:
             self.init_app(app)
 
@@ -18,18 +76,37 @@ class JWTHandler:
         self.app = app
         self.config = app.config
         self.redis = redis_manager
+        self.verdicts = RevocationVerdictCache(
+            ttl_ms=self._get_config_value('JWT_REVOCATION_CACHE_MS', 0),
+            max_entries=self._get_config_value('JWT_REVOCATION_CACHE_SIZE', 10000)
+        )
 
     def _get_config_value(self, key: str, default=None):
         return self.config.get(key, default)
 
-    def create_tokens(self, user_id: str, user_role: str | None = None):
+    @property
+    def refresh_token_lifetime(self) -> timedelta:
+        return timedelta(days=self._get_config_value('JWT_REFRESH_TOKEN_EXPIRES_DAYS', 30))
+
+    def create_tokens(
+        self,
+        user_id: str,
+        user_role: str | None = None,
+        refresh_jti: str | None = None,
+        issued_at: datetime | None = None
+    ) -> IssuedTokens:
+        """
+        Signs a new access/refresh token pair. `refresh_jti` and `issued_at` let
+        a caller that already persisted the refresh token's JTI and expiry
+        (see AuthService.refresh_tokens) sign a token matching that row.
+        """
         access_token_jti = str(uuid.uuid4())
-        refresh_token_jti = str(uuid.uuid4())
+        refresh_token_jti = refresh_jti or str(uuid.uuid4())
 
         access_expires_delta = timedelta(minutes=self._get_config_value('JWT_ACCESS_TOKEN_EXPIRES_MINUTES', 15))
-        refresh_expires_delta = timedelta(days=self._get_config_value('JWT_REFRESH_TOKEN_EXPIRES_DAYS', 30))
+        refresh_expires_delta = self.refresh_token_lifetime
 
-        issued_at_time = datetime.now(UTC)
+        issued_at_time = issued_at or datetime.now(UTC)
 
         access_payload = {
             'token_type': 'access',
@@ -55,12 +132,14 @@ class JWTHandler:
         access_token = jwt.encode(access_payload, secret_key, algorithm=algorithm)
         refresh_token = jwt.encode(refresh_payload, secret_key, algorithm=algorithm)
 
-        return (
-            access_token,
-            refresh_token,
-            access_token_jti,
-            refresh_token_jti,
-            access_expires_delta.total_seconds() / 60
+        return IssuedTokens(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            access_jti=access_token_jti,
+            refresh_jti=refresh_token_jti,
+            expires_in=access_expires_delta.total_seconds() / 60,
+            access_expires_at=access_payload['exp'],
+            refresh_expires_at=refresh_payload['exp']
         )
 
     async def verify(self, token: str, token_type: Literal['access', 'refresh'] = 'access', check_revocation: bool = True):
@@ -78,29 +157,50 @@ class JWTHandler:
             raise Unauthorized(f"Invalid token type. Expected '{token_type}'.")
 
         if check_revocation:
-            # 1. Check for global revocation (password change, etc.)
-            user_id = payload.get('sub')
-            iat = payload.get('iat')
-            global_revoke_key = f"user_revoke_all_timestamp:{user_id}"
-            last_global_revoke_ts = await self.redis.client.get(global_revoke_key)
-
-            if last_global_revoke_ts and iat < int(last_global_revoke_ts):
-                raise Unauthorized("Token has been revoked by a security event.")
-
-            # 2. Check for individual token revocation (logout)
-            jti = payload.get('jti')
-            is_revoked = await self.redis.client.get(f"revoked_jti:{jti}")
-            if is_revoked:
-                raise Unauthorized("Token has been revoked.")
+            await self._check_revocation(payload)
 
         return payload
 
+    async def _check_revocation(self, payload: dict) -> None:
+        """
+        Rejects tokens revoked individually (logout) or by a user-wide security
+        event (password change, etc.). Answered from the worker's revocation
+        snapshot when it is complete, otherwise with one Redis round trip.
+        """
+        jti = payload.get('jti')
+        user_id = payload.get('sub')
+        if revocation_snapshot.ready:
+            reason = revocation_snapshot.check(jti, user_id, payload.get('iat'))
+            if reason:
+                raise Unauthorized(reason)
+            return
+
+        if self.verdicts.enabled and self.verdicts.is_known_valid(jti):
+            return
+
+        last_global_revoke_ts, is_revoked = await revocation_store.lookup(jti, payload.get('exp'), user_id)
+        if last_global_revoke_ts is not None and payload.get('iat') < last_global_revoke_ts:
+            raise Unauthorized("Token has been revoked by a security event.")
+        if is_revoked:
+            raise Unauthorized("Token has been revoked.")
+
+        if self.verdicts.enabled:
+            self.verdicts.remember_valid(jti, user_id)
+
     async def revoke(self, jti: str, exp: datetime):
-        """Revokes a token by adding its JTI to a denylist in Redis with a TTL."""
+        """Revokes a token by adding its JTI to the denylist bucket of its expiry minute."""
+        self.verdicts.forget(jti)
+        if exp > datetime.now(UTC):
+            await revocation_store.revoke_jti(jti, exp.timestamp())
+            await revocation_snapshot.publish_jti(jti, exp.timestamp())
+
+    async def revoke_all_for_user(self, user_id: Any):
+        """Revokes every token of a user issued before now, by storing a revocation timestamp in Redis."""
+        self.verdicts.forget_user(user_id)
         now = datetime.now(UTC)
-        ttl = exp - now
-        if ttl.total_seconds() > 0:
-            await self.redis.client.setex(f"revoked_jti:{jti}", int(ttl.total_seconds()), "revoked")
+        revoked_at = int(now.timestamp())
+        await revocation_store.revoke_user(str(user_id), revoked_at)
+        await revocation_snapshot.publish_user(str(user_id), revoked_at, (now + USER_REVOCATION_LIFETIME).timestamp())
 
 jwt_handler = JWTHandler()
 
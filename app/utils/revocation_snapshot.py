@@ -0,0 +1,194 @@
+# app/utils/revocation_snapshot.py
+import asyncio
+import json
+import time
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.databases.redis_manager import redis_manager
+from app.utils.logger_utils import get_logger
+from app.utils.revocation_store import revocation_store
+
+logger = get_logger(__name__)
+
+REVOCATION_CHANNEL = "auth:revocations"
+
+_PRUNE_INTERVAL = 30.0
+_MAX_BACKOFF = 30.0
+
+
+class RevocationSnapshot:
+    """
+    A per-worker, in-memory copy of the token revocation state kept in Redis:
+    revoked JTIs (until the token would have expired anyway) and per-user
+    revoke-all timestamps (for as long as Redis keeps them).
+
+    It is loaded from Redis when the worker starts and kept current through the
+    `auth:revocations` pub/sub channel, which `JWTHandler.revoke` and
+    `JWTHandler.revoke_all_for_user` publish to. The subscription is made
+    before loading, so nothing published in between is missed; after a lost
+    connection the snapshot is reloaded the same way.
+
+    `ready` is only True while the snapshot is known to be complete. Until
+    then (startup, reconnects, or more than `max_entries` entries) callers
+    must ask Redis instead.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.max_entries = 1_000_000
+        self.ready = False
+        self.resyncs = 0
+        self._full = False
+        self._jtis: dict[str, float] = {}  # jti -> expires at (epoch seconds)
+        self._users: dict[str, tuple[int, float]] = {}  # user id -> (revoked at, expires at)
+        self._task: asyncio.Task | None = None
+
+    def configure(self, enabled: bool, max_entries: int) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._users)
+
+    # --- Lookups ---
+
+    def check(self, jti: str, user_id: str, issued_at: int) -> str | None:
+        """Returns why the token is revoked, or None if it is not. Only meaningful while `ready`."""
+        revoked_all = self._users.get(user_id)
+        if revoked_all is not None and issued_at < revoked_all[0]:
+            return "Token has been revoked by a security event."
+        if jti in self._jtis:
+            return "Token has been revoked."
+        return None
+
+    # --- Updates ---
+
+    def apply_jti(self, jti: str, expires_at: float) -> None:
+        if expires_at > time.time() and self._has_room(jti not in self._jtis):
+            self._jtis[jti] = expires_at
+
+    def apply_user(self, user_id: str, revoked_at: int, expires_at: float) -> None:
+        current = self._users.get(user_id)
+        if current is not None and current[0] >= revoked_at:
+            return
+        if expires_at > time.time() and self._has_room(current is None):
+            self._users[user_id] = (revoked_at, expires_at)
+
+    def _has_room(self, adds_entry: bool) -> bool:
+        if adds_entry and len(self) >= self.max_entries:
+            if not self._full:
+                logger.warning(f"Revocation snapshot is full ({self.max_entries} entries); falling back to Redis.")
+            self._full = True
+            self.ready = False
+            return False
+        return True
+
+    def prune(self) -> None:
+        """Drops entries that can no longer affect a valid token."""
+        now = time.time()
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        self._users = {user_id: entry for user_id, entry in self._users.items() if entry[1] > now}
+
+    def _apply_message(self, data: str) -> None:
+        try:
+            event = json.loads(data)
+            if event["type"] == "jti":
+                self.apply_jti(event["jti"], event["exp"])
+            elif event["type"] == "user":
+                self.apply_user(event["user_id"], event["ts"], event["exp"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed revocation event: {data!r}")
+
+    # --- Publishing ---
+
+    async def publish_jti(self, jti: str, expires_at: float) -> None:
+        """Announces a revoked JTI to every worker (this one included, immediately)."""
+        self.apply_jti(jti, expires_at)
+        event = {"type": "jti", "jti": jti, "exp": expires_at}
+        await redis_manager.client.publish(REVOCATION_CHANNEL, json.dumps(event))
+
+    async def publish_user(self, user_id: str, revoked_at: int, expires_at: float) -> None:
+        """Announces a user-wide revocation to every worker (this one included, immediately)."""
+        self.apply_user(user_id, revoked_at, expires_at)
+        event = {"type": "user", "user_id": user_id, "ts": revoked_at, "exp": expires_at}
+        await redis_manager.client.publish(REVOCATION_CHANNEL, json.dumps(event))
+
+    # --- Loading from Redis ---
+
+    async def resync(self) -> None:
+        """Replaces the snapshot with the revocations currently stored in Redis."""
+        self.ready = False
+        self._full = False
+        self._jtis, self._users = {}, {}
+
+        async for batch in revocation_store.iter_revoked_jtis():
+            for jti, expires_at in batch:
+                self.apply_jti(jti, expires_at)
+        async for batch in revocation_store.iter_user_revocations():
+            for user_id, revoked_at, expires_at in batch:
+                self.apply_user(user_id, revoked_at, expires_at)
+
+        self.ready = not self._full
+        self.resyncs += 1
+        logger.info(f"Revocation snapshot loaded: {len(self._jtis)} JTIs, {len(self._users)} users"
+                    f"{'' if self.ready else ' (incomplete, using Redis)'}.")
+
+    # --- Lifecycle ---
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = redis_manager.client.pubsub()
+            try:
+                # Subscribe first: events published while loading are queued, then replayed
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                await self.resync()
+                backoff = 1.0
+                last_prune = time.monotonic()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_PRUNE_INTERVAL)
+                    if message is not None:
+                        self._apply_message(message["data"])
+                    if time.monotonic() - last_prune >= _PRUNE_INTERVAL:
+                        self.prune()
+                        last_prune = time.monotonic()
+                        if self._full and len(self) < self.max_entries * 0.9:
+                            await self.resync()  # Room again after expiries: try to become complete
+            except (RedisError, OSError) as exc:
+                self.ready = False
+                logger.warning(f"Revocation snapshot lost its subscription ({exc}); retrying in {backoff:.0f}s.")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF)
+            finally:
+                self.ready = False
+                await pubsub.aclose()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.ready = False
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "jtis": len(self._jtis),
+            "users": len(self._users),
+            "max_entries": self.max_entries,
+            "resyncs": self.resyncs,
+        }
+
+
+# A single, shared instance for the entire application (per worker)
+revocation_snapshot = RevocationSnapshot()
@@ -0,0 +1,239 @@
+# app/utils/revocation_store.py
+import asyncio
+import math
+import time
+from datetime import timedelta
+from typing import AsyncIterator
+
+from redis.exceptions import RedisError
+
+from app.databases.redis_manager import redis_manager
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Revoked JTIs: one hash per expiry minute, field = JTI. The whole hash expires
+# (a minute after) its tokens do, so nothing is stored per token but the field.
+JTI_BUCKET_PREFIX = "revoked_jtis:"
+# User-wide revocations: a single hash, field = user id, value = revocation timestamp
+USER_REVOCATIONS_KEY = "user_revoke_all"
+# How long a user-wide revocation matters: longer than any refresh token lives
+USER_REVOCATION_LIFETIME = timedelta(days=31)
+
+# The former one-key-per-revocation layout. Still read until its keys have expired.
+LEGACY_JTI_KEY_PREFIX = "revoked_jti:"
+LEGACY_USER_KEY_PREFIX = "user_revoke_all_timestamp:"
+
+# Deletes the given user revocations only if still older than ARGV[1], so a
+# revocation re-issued while the prune was scanning survives
+_PRUNE_SCRIPT = """
+local removed = 0
+for i = 2, #ARGV do
+    local value = redis.call('HGET', KEYS[1], ARGV[i])
+    if value and tonumber(value) < tonumber(ARGV[1]) then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
+_BUCKET_SLACK = 60  # Seconds a bucket outlives its tokens, for clock skew between hosts
+_PRUNE_LOCK_TTL = 3600
+_PRUNE_CHECK_INTERVAL = 300  # Seconds between attempts to take the hourly prune lock
+_SCAN_BATCH = 1000
+
+
+def expiry_bucket(expires_at: float) -> int:
+    """The minute (since the epoch) by the end of which a token expiring at `expires_at` is dead."""
+    return math.ceil(expires_at / 60)
+
+
+class RevocationStore:
+    """
+    Compact Redis layout for token revocations. Compared with a string key per
+    revoked JTI (key name, TTL and object overhead each), a field in a small
+    per-minute hash costs little more than the JTI itself, and expired
+    revocations go away a whole bucket at a time. `namespace` prefixes every key
+    (used by the memory report to stay clear of live data).
+    """
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+
+    def bucket_key(self, minute: int) -> str:
+        return f"{self.namespace}{JTI_BUCKET_PREFIX}{minute}"
+
+    @property
+    def users_key(self) -> str:
+        return f"{self.namespace}{USER_REVOCATIONS_KEY}"
+
+    async def revoke_jti(self, jti: str, expires_at: float) -> None:
+        minute = expiry_bucket(expires_at)
+        key = self.bucket_key(minute)
+        async with redis_manager.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, jti, 1)
+            pipe.expireat(key, minute * 60 + _BUCKET_SLACK)
+            await pipe.execute()
+
+    async def revoke_user(self, user_id: str, revoked_at: int) -> None:
+        await redis_manager.client.hset(self.users_key, user_id, revoked_at)
+
+    async def lookup(self, jti: str, expires_at: float, user_id: str) -> tuple[int | None, bool]:
+        """
+        Returns (the user's latest revoke-all timestamp or None, whether the JTI
+        is revoked) in one round trip, consulting the legacy keys as well.
+        """
+        async with redis_manager.client.pipeline(transaction=False) as pipe:
+            pipe.hget(self.users_key, user_id)
+            pipe.hexists(self.bucket_key(expiry_bucket(expires_at)), jti)
+            pipe.mget(f"{self.namespace}{LEGACY_USER_KEY_PREFIX}{user_id}", f"{self.namespace}{LEGACY_JTI_KEY_PREFIX}{jti}")
+            revoked_at, jti_revoked, (legacy_revoked_at, legacy_jti_revoked) = await pipe.execute()
+
+        timestamps = [int(value) for value in (revoked_at, legacy_revoked_at) if value is not None]
+        return (max(timestamps) if timestamps else None), bool(jti_revoked or legacy_jti_revoked)
+
+    # --- Bulk reads (RevocationSnapshot) ---
+
+    async def iter_revoked_jtis(self) -> AsyncIterator[list[tuple[str, float]]]:
+        """Yields batches of (jti, expires at) for every stored revocation, legacy keys included."""
+        client = redis_manager.client
+        keys: list[str] = []
+        async for key in client.scan_iter(match=f"{self.namespace}{JTI_BUCKET_PREFIX}*", count=_SCAN_BATCH):
+            keys.append(key)
+            if len(keys) >= _SCAN_BATCH:
+                yield await self._bucket_fields(keys)
+                keys = []
+        if keys:
+            yield await self._bucket_fields(keys)
+
+        keys = []
+        async for key in client.scan_iter(match=f"{self.namespace}{LEGACY_JTI_KEY_PREFIX}*", count=_SCAN_BATCH):
+            keys.append(key)
+            if len(keys) >= _SCAN_BATCH:
+                yield await self._legacy_jtis(keys)
+                keys = []
+        if keys:
+            yield await self._legacy_jtis(keys)
+
+    async def _bucket_fields(self, keys: list[str]) -> list[tuple[str, float]]:
+        async with redis_manager.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hkeys(key)
+            replies = await pipe.execute()
+        prefix = f"{self.namespace}{JTI_BUCKET_PREFIX}"
+        return [
+            (jti, int(key.removeprefix(prefix)) * 60)
+            for key, jtis in zip(keys, replies)
+            for jti in jtis
+        ]
+
+    async def _legacy_jtis(self, keys: list[str]) -> list[tuple[str, float]]:
+        async with redis_manager.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pttl(key)
+            ttls = await pipe.execute()
+        now = time.time()
+        prefix = f"{self.namespace}{LEGACY_JTI_KEY_PREFIX}"
+        return [(key.removeprefix(prefix), now + ttl / 1000) for key, ttl in zip(keys, ttls) if ttl > 0]
+
+    async def iter_user_revocations(self) -> AsyncIterator[list[tuple[str, int, float]]]:
+        """Yields batches of (user id, revoked at, relevant until), legacy keys included."""
+        lifetime = USER_REVOCATION_LIFETIME.total_seconds()
+        batch: list[tuple[str, int, float]] = []
+        async for user_id, value in redis_manager.client.hscan_iter(self.users_key, count=_SCAN_BATCH):
+            batch.append((user_id, int(value), int(value) + lifetime))
+            if len(batch) >= _SCAN_BATCH:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+        keys: list[str] = []
+        async for key in redis_manager.client.scan_iter(match=f"{self.namespace}{LEGACY_USER_KEY_PREFIX}*", count=_SCAN_BATCH):
+            keys.append(key)
+            if len(keys) >= _SCAN_BATCH:
+                yield await self._legacy_users(keys)
+                keys = []
+        if keys:
+            yield await self._legacy_users(keys)
+
+    async def _legacy_users(self, keys: list[str]) -> list[tuple[str, int, float]]:
+        async with redis_manager.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            replies = await pipe.execute()
+        now = time.time()
+        prefix = f"{self.namespace}{LEGACY_USER_KEY_PREFIX}"
+        return [
+            (key.removeprefix(prefix), int(value), now + ttl / 1000)
+            for key, value, ttl in zip(keys, replies[::2], replies[1::2])
+            if value is not None and ttl > 0
+        ]
+
+    # --- Maintenance ---
+
+    async def prune_user_revocations(self) -> int:
+        """
+        Removes user-wide revocations older than any token still alive. A hash has
+        no per-field TTL, so this runs periodically; a lock lets only one worker
+        do it per hour. Returns the number of removed entries.
+        """
+        client = redis_manager.client
+        if not await client.set(f"{self.users_key}:prune_lock", 1, nx=True, ex=_PRUNE_LOCK_TTL):
+            return 0
+
+        prune = client.register_script(_PRUNE_SCRIPT)
+        cutoff = int(time.time() - USER_REVOCATION_LIFETIME.total_seconds())
+        stale: list[str] = []
+        removed = 0
+        async for user_id, value in client.hscan_iter(self.users_key, count=_SCAN_BATCH):
+            if int(value) < cutoff:
+                stale.append(user_id)
+            if len(stale) >= _SCAN_BATCH:
+                removed += await prune(keys=[self.users_key], args=[cutoff, *stale])
+                stale = []
+        if stale:
+            removed += await prune(keys=[self.users_key], args=[cutoff, *stale])
+        return removed
+
+
+class RevocationPruner:
+    """
+    Runs `prune_user_revocations` periodically in every worker, whether or not
+    the revocation snapshot is enabled or connected; the store's lock keeps
+    the actual prune to once an hour across workers. Redis errors are logged
+    and retried at the next interval.
+    """
+
+    def __init__(self, store: RevocationStore):
+        self.store = store
+        self.pruned = 0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.pruned += await self.store.prune_user_revocations()
+            except (RedisError, OSError) as exc:
+                logger.warning(f"Pruning user revocations failed ({exc}); retrying in {_PRUNE_CHECK_INTERVAL}s.")
+            await asyncio.sleep(_PRUNE_CHECK_INTERVAL)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Single, shared instances for the entire application
+revocation_store = RevocationStore()
+revocation_pruner = RevocationPruner(revocation_store)
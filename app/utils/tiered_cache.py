@@ -0,0 +1,375 @@
+# app/utils/tiered_cache.py
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from redis.exceptions import RedisError
+
+from app.databases.redis_manager import redis_manager
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+TAG_KEY_PREFIX = "cache_tag:"
+LOCK_KEY_PREFIX = "cache_lock:"
+_MAX_BACKOFF = 30.0
+
+# Former text L2 entries: "<prefix><fresh until>|<compute seconds>|<payload>", or
+# before that the bare payload. Still read; new entries are written by CacheCodec.
+_ENTRY_PREFIX = "e1|"
+# Payloads of negative entries; never the start of a JSON document
+_NEGATIVE_PREFIX = "!"
+
+# Stores a value and records its key in each tag set (KEYS[2..]). A tag set lives
+# as long as its longest-lived member: its TTL is only ever raised.
+_SET_WITH_TAGS_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+"""
+
+# Deletes every key recorded in the given tag sets, and the sets themselves
+_INVALIDATE_TAGS_SCRIPT = """
+local deleted = 0
+for i = 1, #KEYS do
+    local members = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #members, 500 do
+        deleted = deleted + redis.call('DEL', unpack(members, j, math.min(j + 499, #members)))
+    end
+    redis.call('DEL', KEYS[i])
+end
+return deleted
+"""
+
+# Releases a recompute lock only if it is still held with the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def decode_entry(raw: str) -> tuple[str, float, float]:
+    """
+    Returns (payload, fresh until, compute seconds). Entries written before the
+    envelope count as fresh for as long as Redis keeps them.
+    """
+    if not raw.startswith(_ENTRY_PREFIX):
+        return raw, math.inf, 0.0
+    fresh_until, delta, payload = raw[len(_ENTRY_PREFIX):].split("|", 2)
+    return payload, float(fresh_until), float(delta)
+
+
+def refresh_due(now: float, fresh_until: float, delta: float, beta: float, rand: float | None = None) -> bool:
+    """
+    Probabilistic early expiration (XFetch): a fresh entry is recomputed ahead
+    of its expiry with a probability that grows as the expiry nears and with
+    the cost of recomputing it (`delta`), so one caller refreshes it before
+    everyone misses at once. `beta` > 1 favours earlier refreshes; 0 disables them.
+    """
+    if beta <= 0 or delta <= 0:
+        return False
+    if rand is None:
+        rand = random.random()
+    return now - delta * beta * math.log(max(rand, 1e-12)) >= fresh_until
+
+
+class NegativeEntry:
+    """
+    A cached absence of a result: the function returned None, or raised one of
+    its cacheable exceptions, recorded in `error` as (class name, message).
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: tuple[str, str] | None = None):
+        self.error = error
+
+    @classmethod
+    def from_exception(cls, exc: Exception) -> "NegativeEntry":
+        return cls((type(exc).__name__, str(exc)))
+
+    def encode(self) -> str:
+        return _NEGATIVE_PREFIX + json.dumps(self.error)
+
+    @classmethod
+    def decode(cls, payload: str) -> "NegativeEntry | None":
+        """The negative entry in `payload`, or None if it holds a value."""
+        if not payload.startswith(_NEGATIVE_PREFIX):
+            return None
+        error = json.loads(payload[len(_NEGATIVE_PREFIX):])
+        return cls(tuple(error) if error else None)
+
+
+class LocalCache:
+    """
+    A per-worker LRU of already-validated objects with a TTL per entry, and an
+    index of the entries carrying each tag. Values are shared between callers
+    and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any, tuple[str, ...]]] = OrderedDict()  # key -> (expires at, value, tags)
+        self._tags: dict[str, set[str]] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (found, value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, tags: tuple[str, ...] = ()) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+
+    def delete_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self.delete(list(self._tags.get(tag, ())))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+
+class CacheStats:
+    """Per-worker hit/miss counters of the @cache decorator, per tier."""
+
+    def __init__(self) -> None:
+        self.l1_hits = 0
+        self.l1_misses = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.invalidations = 0
+        self.negative_hits = 0  # Hits on a cached None or exception, in either tier
+        self.negative_stores = 0
+        self.coalesced = 0  # Misses that waited for a recompute already running in this worker
+        self.lock_waits = 0  # Misses that waited for a recompute running in another worker
+        self.stale_served = 0
+        self.early_refreshes = 0
+        self.refresh_errors = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(vars(self))
+
+
+class TieredCache:
+    """
+    The in-process tier (L1) shared by every @cache-decorated function of a
+    worker, and its invalidation across workers and nodes.
+
+    `invalidate` drops keys from Redis (L2) and from this worker's L1, then
+    publishes them on the `cache:invalidate` channel so every other worker
+    drops them from its L1 too. If the subscription is lost, messages may have
+    been missed, so L1 is cleared when it is re-established.
+
+    It also tracks the recomputes in progress: `inflight` holds the one task
+    per key that concurrent misses in this worker wait for, and `refreshing`
+    the keys being refreshed in the background.
+    """
+
+    def __init__(self) -> None:
+        self.local = LocalCache()
+        self.stats = CacheStats()
+        self.l1_enabled = True
+        self.inflight: dict[str, asyncio.Task] = {}
+        self.refreshing: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+        self._subscribed = False
+        self._task: asyncio.Task | None = None
+
+    def configure(self, l1_enabled: bool, l1_max_entries: int) -> None:
+        self.l1_enabled = l1_enabled
+        self.local.max_entries = l1_max_entries
+
+    @property
+    def l1_available(self) -> bool:
+        """L1 entries are only safe while invalidations can reach this worker."""
+        return self.l1_enabled and self._subscribed
+
+    async def get_l2(self, key: str) -> bytes | None:
+        return await redis_manager.binary_client.get(key)
+
+    async def set_l2(self, key: str, payload: bytes, ttl: int, tags: tuple[str, ...] = ()) -> None:
+        """Stores an encoded entry in Redis, recording it in the Redis set of each tag."""
+        if not tags:
+            await redis_manager.binary_client.set(key, payload, ex=ttl)
+            return
+        script = redis_manager.binary_client.register_script(_SET_WITH_TAGS_SCRIPT)
+        await script(keys=[key, *(f"{TAG_KEY_PREFIX}{tag}" for tag in tags)], args=[payload, ttl])
+
+    async def invalidate(self, keys: list[str]) -> None:
+        """Drops keys from both tiers on every worker."""
+        if not keys:
+            return
+        self.stats.invalidations += len(keys)
+        self.local.delete(keys)
+        client = redis_manager.client
+        await client.delete(*keys)
+        await client.publish(INVALIDATION_CHANNEL, json.dumps({"keys": keys}))
+
+    async def invalidate_tags(self, tags: list[str]) -> int:
+        """
+        Drops every entry carrying one of `tags` from both tiers on every worker.
+        Costs O(keys in the tags): Redis keeps a set of keys per tag, and each
+        worker its own tag index for L1. Returns the number of Redis keys deleted.
+        """
+        if not tags:
+            return 0
+        self.local.delete_tags(tags)
+        client = redis_manager.client
+        script = client.register_script(_INVALIDATE_TAGS_SCRIPT)
+        deleted = await script(keys=[f"{TAG_KEY_PREFIX}{tag}" for tag in tags])
+        self.stats.invalidations += deleted
+        await client.publish(INVALIDATION_CHANNEL, json.dumps({"tags": tags}))
+        return deleted
+
+    # --- Recomputes ---
+
+    def track_inflight(self, key: str, task: asyncio.Task) -> None:
+        """Registers the recompute of a missing key, until it finishes."""
+        self.inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight_done(key, done))
+
+    def _inflight_done(self, key: str, task: asyncio.Task) -> None:
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved by the waiters; marked here in case they were all cancelled
+
+    def run_in_background(self, key: str, coro) -> bool:
+        """Starts a background refresh of `key` unless one is already running; returns whether it started."""
+        if key in self.refreshing:
+            coro.close()
+            return False
+        self.refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+
+        def done(_task: asyncio.Task) -> None:
+            self._background.discard(_task)
+            self.refreshing.discard(key)
+
+        task.add_done_callback(done)
+        return True
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        """Takes the cross-worker recompute lock of `key` for `ttl` seconds; returns its token, or None if held."""
+        token = uuid.uuid4().hex
+        acquired = await redis_manager.client.set(f"{LOCK_KEY_PREFIX}{key}", token, nx=True, px=int(ttl * 1000))
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        script = redis_manager.client.register_script(_RELEASE_LOCK_SCRIPT)
+        await script(keys=[f"{LOCK_KEY_PREFIX}{key}"], args=[token])
+
+    async def poll_l2(self, key: str) -> tuple[bytes | None, bool]:
+        """Returns (the stored entry or None, whether its recompute lock is still held) in one round trip."""
+        async with redis_manager.binary_client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.exists(f"{LOCK_KEY_PREFIX}{key}")
+            raw, locked = await pipe.execute()
+        return raw, bool(locked)
+
+    def _apply_message(self, data: str) -> None:
+        try:
+            message = json.loads(data)
+            self.local.delete(message.get("keys", ()))
+            self.local.delete_tags(message.get("tags", ()))
+        except (ValueError, AttributeError, TypeError):
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = redis_manager.client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.local.clear()  # Anything cached before (re)subscribing may have missed an invalidation
+                self._subscribed = True
+                backoff = 1.0
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30.0)
+                    if message is not None:
+                        self._apply_message(message["data"])
+            except (RedisError, OSError) as exc:
+                self._subscribed = False
+                logger.warning(f"Cache invalidation subscription lost ({exc}); retrying in {backoff:.0f}s.")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF)
+            finally:
+                self._subscribed = False
+                await pubsub.aclose()
+
+    def start(self) -> None:
+        if self.l1_enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._background):
+            task.cancel()
+        self.local.clear()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "l1_enabled": self.l1_available,
+            "l1_entries": len(self.local),
+            "l1_max_entries": self.local.max_entries,
+            "l1_evictions": self.local.evictions,
+            "inflight": len(self.inflight),
+            "refreshing": len(self.refreshing),
+            **self.stats.as_dict(),
+        }
+
+
+# A single, shared instance for the entire application (per worker)
+tiered_cache = TieredCache()
@@ -5,6 +5,7 @@ from sanic.views import HTTPMethodView
 from sanic_ext import openapi
 from sanic_ext.extensions.openapi.types import Schema
 
+from app.constants.pagination_constants import CountStrategy
 from app.decorators.auth import protected
 from app.decorators.validate_request import validate_request
 from app.repositories.user_repository import UserRepository
@@ -19,7 +20,10 @@ class AdminUserListView(HTTPMethodView):
 
     @openapi.definition(
         summary="List all users (Admin only).",
-        description="Retrieves a paginated list of all user accounts in the system.",
+        description="Retrieves a paginated list of all user accounts in the system. "
+                    "Pass `pagination=cursor` or a `cursor` for keyset pagination. "
+                    "`count` picks how the total is computed: `estimate` (default), `exact`, `window` or `cached`; "
+                    "`total_is_exact` is false when the total is approximate.",
         response=Schema(PaginationResponse[AdminUserResponseSchema]),
         tag="Admin"
     )
@@ -35,14 +39,29 @@ class AdminUserListView(HTTPMethodView):
             page = 1
             page_size = 10
 
-        paginated_result = await user_service.list_all_users(page=page, page_size=page_size)
+        # ?pagination=cursor (or any ?cursor=...) switches to keyset pagination
+        cursor = request.args.get("cursor")
+        use_cursor = request.args.get("pagination") == "cursor"
 
-        response = PaginationResponse(
+        try:
+            count_strategy = CountStrategy(request.args.get("count", CountStrategy.ESTIMATE.value))
+        except ValueError:
+            count_strategy = CountStrategy.ESTIMATE
+
+        paginated_result = await user_service.list_all_users(
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            use_cursor=use_cursor,
+            count_strategy=count_strategy
+        )
+
+        response = PaginationResponse[AdminUserResponseSchema](
             status="success",
             message="Users retrieved successfully.",
             data=paginated_result
         )
-        return json(response.model_dump(by_alias=True), status=200)
+        return json(response.model_dump(mode="json", by_alias=True), status=200)
 
     @openapi.definition(
         summary="Create a new user (Admin only).",
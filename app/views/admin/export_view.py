@@ -0,0 +1,95 @@
+# app/views/admin/export_view.py
+import re
+
+from sanic.request import Request
+from sanic.views import HTTPMethodView
+from sanic_ext import openapi
+
+from app.constants.export_constants import ExportFormat
+from app.databases.postgresql_manager import postgres_db
+from app.decorators.auth import protected
+from app.exceptions import BadRequest
+from app.services.export_service import ExportService
+from app.utils.logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Semesters look like "HK1-2025"; anything else could break out of the quoted download filename
+_SEMESTER_RE = re.compile(r"[A-Za-z0-9_-]{1,50}")
+
+
+def _get_export_format(request: Request) -> ExportFormat:
+    try:
+        return ExportFormat(request.args.get("format", ExportFormat.NDJSON.value))
+    except ValueError:
+        raise BadRequest("Unsupported export format. Use 'ndjson' or 'csv'.")
+
+
+async def _stream_export(request: Request, filename: str, build_batches) -> None:
+    """
+    Streams an export to the client. The export runs on its own short-lived
+    session, so the connection is held only while rows are being sent.
+    """
+    export_format = _get_export_format(request)
+    async with postgres_db.read_only_session() as session:
+        service = ExportService(session)
+        batches = build_batches(service)
+        response = await request.respond(
+            content_type=export_format.content_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+        )
+        try:
+            async for chunk in service.encode(batches, export_format):
+                await response.send(chunk)
+        except Exception:
+            # Headers are already sent, so the best we can do is cut the stream short
+            logger.exception(f"Export {filename} failed mid-stream")
+            raise
+        finally:
+            await response.eof()
+
+
+class AdminUserExportView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Export all users (Admin only).",
+        description="Streams every user account as NDJSON (default) or CSV (`format=csv`).",
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Streams all users."""
+        await _stream_export(request, "users", lambda service: service.users())
+
+
+class AdminUserSessionExportView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Export a user's sessions (Admin only).",
+        description="Streams every login session of a user, including revoked ones, as NDJSON or CSV.",
+        tag="Admin"
+    )
+    async def get(self, request: Request, user_id: int):
+        """Streams all sessions of a user."""
+        await _stream_export(request, f"user_{user_id}_sessions", lambda service: service.user_sessions(user_id))
+
+
+class AdminCourseRegistrationExportView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Export course registrations of a semester (Admin only).",
+        description="Streams every course registration of the semester given by `semester` (e.g. HK1-2025) as NDJSON or CSV.",
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Streams all registrations of a semester."""
+        semester = request.args.get("semester")
+        if not semester:
+            raise BadRequest("The 'semester' query parameter is required.")
+        if not _SEMESTER_RE.fullmatch(semester):
+            raise BadRequest("Invalid 'semester'; expected letters, digits, '-' or '_' (e.g. HK1-2025).")
+        await _stream_export(
+            request, f"registrations_{semester}", lambda service: service.course_registrations(semester)
+        )
@@ -18,7 +18,8 @@ class AdminSessionManagementView(HTTPMethodView):
 
     @openapi.definition(
         summary="List all sessions for a specific user.",
-        description="Allows an admin to retrieve a paginated list of all login sessions for any user.",
+        description="Allows an admin to retrieve a paginated list of all login sessions for any user. "
+                    "Pass `pagination=cursor` or a `cursor` for keyset pagination.",
         response=Schema(PaginationResponse[SessionResponse]),
         tag="Admin"
     )
@@ -33,19 +34,25 @@ class AdminSessionManagementView(HTTPMethodView):
             page = 1
             page_size = 10
 
+        # ?pagination=cursor (or any ?cursor=...) switches to keyset pagination
+        cursor = request.args.get("cursor")
+        use_cursor = request.args.get("pagination") == "cursor"
+
         paginated_result = await session_repo.list_sessions_for_user(
             user_id=user_id,
             page=page,
             page_size=page_size,
-            include_revoked=True  # Admins can see revoked sessions
+            include_revoked=True,  # Admins can see revoked sessions
+            cursor=cursor,
+            use_cursor=use_cursor
         )
 
-        response = PaginationResponse(
+        response = PaginationResponse[SessionResponse](
             status="success",
             message=f"Successfully retrieved sessions for user {user_id}.",
             data=paginated_result
         )
-        return json(response.model_dump(by_alias=True), status=200)
+        return json(response.model_dump(mode="json", by_alias=True), status=200)
 
     @openapi.definition(
         summary="Revoke a specific user session.",
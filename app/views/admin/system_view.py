@@ -0,0 +1,98 @@
+# app/views/admin/system_view.py
+from sanic.request import Request
+from sanic.response import json
+from sanic.views import HTTPMethodView
+from sanic_ext import openapi
+from sanic_ext.extensions.openapi.types import Schema
+
+from app.databases.postgresql_manager import postgres_db
+from app.databases.slow_queries import slow_query_log
+from app.decorators.auth import protected
+from app.schemas.response_schema import GenericResponse
+from app.services.refresh_coalescer import refresh_coalescer
+from app.utils.tiered_cache import tiered_cache
+
+
+class AdminDatabasePoolView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Database connection pool statistics (Admin only).",
+        description="Returns the live connection pool occupancy and checkout wait times of the worker serving the request.",
+        response=Schema(GenericResponse),
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Reports the connection pool status of the current worker."""
+        response = GenericResponse(
+            status="success",
+            message="Connection pool statistics retrieved successfully.",
+            data=postgres_db.pool_status()
+        )
+        return json(response.model_dump(), status=200)
+
+
+class AdminSlowQueryView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Recent slow queries (Admin only).",
+        description="Returns the slow statements captured by the worker serving the request, newest first, "
+                    "with redacted parameters, the calling repository method, the route and a sampled EXPLAIN plan. "
+                    "`limit` caps the number of records.",
+        response=Schema(GenericResponse),
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Lists the slow queries captured by the current worker."""
+        try:
+            limit = int(request.args.get("limit", 50))
+        except (ValueError, TypeError):
+            limit = 50
+
+        response = GenericResponse(
+            status="success",
+            message="Slow queries retrieved successfully.",
+            data=slow_query_log.snapshot(limit)
+        )
+        return json(response.model_dump(), status=200)
+
+
+class AdminRefreshCoalescingView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Refresh token coalescing counters (Admin only).",
+        description="Returns how many token refreshes the worker serving the request rotated itself, "
+                    "answered with a concurrent request's rotation, or gave up waiting on.",
+        response=Schema(GenericResponse),
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Reports the refresh coalescing counters of the current worker."""
+        response = GenericResponse(
+            status="success",
+            message="Refresh coalescing statistics retrieved successfully.",
+            data=refresh_coalescer.stats.as_dict()
+        )
+        return json(response.model_dump(), status=200)
+
+
+class AdminCacheStatsView(HTTPMethodView):
+    decorators = [protected(roles=["admin"])]
+
+    @openapi.definition(
+        summary="Cache statistics (Admin only).",
+        description="Returns the in-process (L1) and Redis (L2) hit/miss counters of the @cache decorator "
+                    "for the worker serving the request, and the L1 occupancy.",
+        response=Schema(GenericResponse),
+        tag="Admin"
+    )
+    async def get(self, request: Request):
+        """Reports the cache counters of the current worker."""
+        response = GenericResponse(
+            status="success",
+            message="Cache statistics retrieved successfully.",
+            data=tiered_cache.status()
+        )
+        return json(response.model_dump(), status=200)
@@ -17,7 +17,8 @@ class SessionsView(HTTPMethodView):
 
     @openapi.definition(
         summary="List all active sessions for the current user.",
-        description="Retrieves a paginated list of all devices and locations the user is currently logged into.",
+        description="Retrieves a paginated list of all devices and locations the user is currently logged into. "
+                    "Pass `pagination=cursor` or a `cursor` for keyset pagination.",
         response=Schema(PaginationResponse[SessionResponse]),
         tag="Auth"
     )
@@ -34,18 +35,24 @@ class SessionsView(HTTPMethodView):
             page = 1
             page_size = 10
 
+        # ?pagination=cursor (or any ?cursor=...) switches to keyset pagination
+        cursor = request.args.get("cursor")
+        use_cursor = request.args.get("pagination") == "cursor"
+
         paginated_result = await session_repo.list_sessions_for_user(
             user_id=user_id,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor,
+            use_cursor=use_cursor
         )
 
-        response = PaginationResponse(
+        response = PaginationResponse[SessionResponse](
             status="success",
             message="Successfully retrieved sessions.",
             data=paginated_result
         )
-        return json(response.model_dump(by_alias=True), status=200)
+        return json(response.model_dump(mode="json", by_alias=True), status=200)
 
     @openapi.definition(
         summary="Revoke a specific session.",
@@ -0,0 +1,106 @@
+# benchmarks/bulk_insert_benchmark.py
+"""
+Compares insert throughput (rows/sec) of BaseRepository.create, bulk_create
+(with and without RETURNING) and copy_insert on the `users` table.
+
+Every run happens in a transaction that is rolled back, so the database is
+left untouched. Usage (from the repository root, with the usual DB_* env):
+
+    python -m benchmarks.bulk_insert_benchmark --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from app.databases.postgresql_manager import postgres_db
+from app.databases.redis_manager import redis_manager
+from app.repositories.user_repository import UserRepository
+from config import PostgreSQLConfig, RedisConfig
+
+
+class _UserRow(BaseModel):
+    username: str
+    password: str
+    first_name: str
+    last_name: str
+    email: str
+
+
+def _make_rows(count: int) -> list[_UserRow]:
+    run = uuid.uuid4().hex[:8]
+    return [
+        _UserRow(
+            username=f"bench_{run}_{i}",
+            password="x" * 60,  # Roughly the size of a bcrypt hash
+            first_name="Bench",
+            last_name=f"User {i}",
+            email=f"bench_{run}_{i}@example.com",
+        )
+        for i in range(count)
+    ]
+
+
+async def _per_row(repo: UserRepository, rows: list[_UserRow]) -> None:
+    for row in rows:
+        await repo.create(row)
+
+
+async def _bulk_returning(repo: UserRepository, rows: list[_UserRow]) -> None:
+    await repo.bulk_create(rows)
+
+
+async def _bulk_no_returning(repo: UserRepository, rows: list[_UserRow]) -> None:
+    await repo.bulk_create(rows, returning=False)
+
+
+async def _copy(repo: UserRepository, rows: list[_UserRow]) -> None:
+    await repo.copy_insert(rows)
+
+
+STRATEGIES: dict[str, Callable[[UserRepository, list[_UserRow]], Awaitable[None]]] = {
+    "create (per row)": _per_row,
+    "bulk_create": _bulk_returning,
+    "bulk_create returning=False": _bulk_no_returning,
+    "copy_insert": _copy,
+}
+
+
+async def _time_strategy(strategy, count: int) -> float:
+    rows = _make_rows(count)
+    async with postgres_db.session_maker() as session:
+        repo = UserRepository(session)
+        started = time.perf_counter()
+        await strategy(repo, rows)
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    return count / elapsed
+
+
+async def main(sizes: list[int], per_row_max: int) -> None:
+    await postgres_db.setup(PostgreSQLConfig.DATABASE_URI)
+    redis_manager.setup(RedisConfig.REDIS_HOST, RedisConfig.REDIS_PORT, RedisConfig.REDIS_DB)
+    try:
+        print(f"{'strategy':<30}{'rows':>10}{'rows/sec':>14}")
+        for size in sizes:
+            for name, strategy in STRATEGIES.items():
+                if strategy is _per_row and size > per_row_max:
+                    print(f"{name:<30}{size:>10}{'skipped':>14}")
+                    continue
+                rate = await _time_strategy(strategy, size)
+                print(f"{name:<30}{size:>10}{rate:>14,.0f}")
+    finally:
+        await redis_manager.close()
+        await postgres_db.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--per-row-max", type=int, default=10000,
+                        help="Skip the per-row path above this many rows (it needs two round trips per row).")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.per_row_max))
@@ -0,0 +1,105 @@
+# benchmarks/cache_codec_benchmark.py
+"""
+Measures the cost of cache entries in Redis: bytes stored, and encode and
+decode time per entry (what a cache miss and a cache hit pay on top of the
+round trip), for a `UserRead` and for paginated lists of them, with
+
+  * text JSON (former) - model_dump_json, stored and read back as UTF-8 text
+  * each CacheCodec format/compression combination whose packages are
+    installed (msgpack, zstandard), compressing from --compress-min-bytes
+
+No Redis or database needed.
+
+    python -m benchmarks.cache_codec_benchmark --page-sizes 20 100 --repeat 2000
+"""
+import argparse
+import time
+from typing import Callable
+
+from pydantic import BaseModel
+
+from app.constants.user_role_constants import UserRole
+from app.schemas.response_schema import PaginatedData
+from app.schemas.users.user_schema import UserRead
+from app.utils import cache_codec as codec_module
+from app.utils.cache_codec import CacheCodec
+
+
+def _user(i: int) -> UserRead:
+    return UserRead(
+        user_id=i,
+        username=f"student{i}@university.example.edu",
+        user_role=UserRole.STUDENT,
+        is_active=True,
+        profile={
+            "user_role": UserRole.STUDENT,
+            "student_id": f"S{100000 + i}",
+            "major": "Computer Science",
+            "class_name": f"CS-{2020 + i % 5}-{i % 12:02d}",
+        },
+    )
+
+
+def _page(size: int) -> PaginatedData[UserRead]:
+    return PaginatedData[UserRead](
+        items=[_user(i) for i in range(size)], total_items=10_000, total_pages=10_000 // size,
+        current_page=1, page_size=size
+    )
+
+
+def _time_per_call(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # Warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def _text_json(value: BaseModel, repeat: int) -> tuple[int, float, float]:
+    schema = type(value)
+    raw = value.model_dump_json().encode()
+    encode = _time_per_call(lambda: value.model_dump_json().encode(), repeat)
+    decode = _time_per_call(lambda: schema.model_validate_json(raw.decode()), repeat)
+    return len(raw), encode, decode
+
+
+def _codec(codec: CacheCodec, value: BaseModel, repeat: int) -> tuple[int, float, float]:
+    schema = type(value)
+    raw = codec.encode(value, time.time() + 300, 0.01)
+    encode = _time_per_call(lambda: codec.encode(value, time.time() + 300, 0.01), repeat)
+    decode = _time_per_call(lambda: codec.decode(raw, schema), repeat)
+    return len(raw), encode, decode
+
+
+def _codecs(compress_min_bytes: int) -> dict[str, CacheCodec]:
+    formats = ["json"] + (["msgpack"] if codec_module.msgpack is not None else [])
+    compressions = ["none", "zlib"] + (["zstd"] if codec_module.zstandard is not None else [])
+    codecs = {}
+    for fmt in formats:
+        for compression in compressions:
+            codec = CacheCodec()
+            codec.configure(fmt, compression, compress_min_bytes)
+            codecs[f"{fmt} + {compression}"] = codec
+    return codecs
+
+
+def main(page_sizes: list[int], repeat: int, compress_min_bytes: int) -> None:
+    payloads: dict[str, BaseModel] = {"UserRead": _user(1)}
+    payloads.update({f"page of {size}": _page(size) for size in page_sizes})
+    codecs = _codecs(compress_min_bytes)
+
+    print(f"{'payload':<14}{'encoding':<22}{'bytes':>10}{'encode us':>12}{'decode us':>12}")
+    for payload_name, value in payloads.items():
+        runs = [("text JSON (former)", _text_json(value, repeat))]
+        runs += [(name, _codec(codec, value, repeat)) for name, codec in codecs.items()]
+        for name, (size, encode, decode) in runs:
+            print(f"{payload_name:<14}{name:<22}{size:>10,}{encode * 1e6:>12.1f}{decode * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--compress-min-bytes", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.page_sizes, args.repeat, args.compress_min_bytes)
@@ -0,0 +1,135 @@
+# benchmarks/cache_stampede_benchmark.py
+"""
+Expires a hot cached entry under --concurrency simultaneous requests and
+counts the SQL statements that follow, with latency percentiles, for
+
+  * cache-aside     - GET, and on a miss query and SET (no protection)
+  * @cache, expired - the key is gone: concurrent misses share one query
+  * @cache, stale   - the key is past its TTL but within `stale_ttl`: the
+                      stale value is served while one background task
+                      recomputes it
+
+Each request has its own lazy session, as in the app. The "query" is a
+`pg_sleep` of --query-ms standing in for an expensive read. L1 is not
+started, so every request goes to Redis. All runs happen in one process,
+so this shows the in-process coalescing; across workers the Redis lock
+plays the same part.
+
+    python -m benchmarks.cache_stampede_benchmark --concurrency 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.databases.postgresql_manager import postgres_db
+from app.databases.query_stats import start_query_stats
+from app.databases.redis_manager import redis_manager
+from app.decorators.cache import cache
+from app.utils.cache_codec import cache_codec
+from app.utils.tiered_cache import tiered_cache
+from config import PostgreSQLConfig, RedisConfig
+
+TTL = 60
+STALE_TTL = 30
+
+
+class _Row(BaseModel):
+    id: int
+
+
+class _Reader:
+    query_seconds = 0.05
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _query(self, row_id: int) -> dict:
+        result = await self.session.execute(
+            text("SELECT :id AS id FROM pg_sleep(:delay)"), {"id": row_id, "delay": self.query_seconds}
+        )
+        return {"id": result.scalar_one()}
+
+    async def cache_aside(self, key: str, row_id: int) -> _Row:
+        cached = await redis_manager.client.get(key)
+        if cached:
+            return _Row.model_validate_json(cached)
+        row = _Row.model_validate(await self._query(row_id))
+        await redis_manager.client.set(key, row.model_dump_json(), ex=TTL)
+        return row
+
+    @cache(schema=_Row, ttl=TTL, stale_ttl=STALE_TTL, prefix="stampede_benchmark", key=lambda self, key, row_id: key)
+    async def cached(self, key: str, row_id: int) -> dict:
+        return await self._query(row_id)
+
+
+async def _stampede(call, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+
+    async def one() -> None:
+        session = postgres_db.lazy_session()
+        started = time.perf_counter()
+        try:
+            await call(_Reader(session))
+            latencies.append(time.perf_counter() - started)
+        finally:
+            await session.finalize(commit=False)
+
+    stats = start_query_stats("cache_stampede_benchmark")  # Inherited by every request and background task
+    results = await asyncio.gather(*(one() for _ in range(concurrency)), return_exceptions=True)
+    while tiered_cache.refreshing:
+        await asyncio.sleep(0.01)
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "queries": stats.count,
+        "errors": sum(isinstance(result, Exception) for result in results),
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+async def main(concurrency: int, query_ms: int) -> None:
+    await postgres_db.setup(PostgreSQLConfig.DATABASE_URI)
+    redis_manager.setup(RedisConfig.REDIS_HOST, RedisConfig.REDIS_PORT, RedisConfig.REDIS_DB)
+    _Reader.query_seconds = query_ms / 1000
+    run_id = uuid.uuid4().hex[:8]
+    aside_key = f"stampede_benchmark_aside:{run_id}"
+    cached_key = f"stampede_benchmark:{run_id}"
+
+    async def expire_with_stale_window() -> None:
+        stale = cache_codec.encode(_Row(id=1), time.time() - 1, query_ms / 1000)
+        await tiered_cache.set_l2(cached_key, stale, STALE_TTL)
+
+    variants = (
+        ("cache-aside", lambda: redis_manager.client.delete(aside_key),
+         lambda reader: reader.cache_aside(aside_key, 1)),
+        ("@cache, expired", lambda: redis_manager.client.delete(cached_key),
+         lambda reader: reader.cached(run_id, 1)),
+        ("@cache, stale", expire_with_stale_window,
+         lambda reader: reader.cached(run_id, 1)),
+    )
+    try:
+        print(f"{'variant':<20}{'requests':>10}{'queries':>10}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, expire, call in variants:
+            await expire()
+            result = await _stampede(call, concurrency)
+            print(f"{name:<20}{concurrency:>10,}{result['queries']:>10,}{result['errors']:>8,}"
+                  f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+    finally:
+        await redis_manager.client.delete(aside_key, cached_key)
+        await redis_manager.close()
+        await postgres_db.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--query-ms", type=int, default=50, help="Duration of the stand-in query.")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.query_ms))
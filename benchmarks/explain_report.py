@@ -0,0 +1,131 @@
+# benchmarks/explain_report.py
+"""
+Prints EXPLAIN (ANALYZE, BUFFERS) for the hot repository queries, once with
+the hot-path indexes in place ("after") and once with them dropped ("before").
+
+Everything runs in a single transaction that is rolled back: the optional
+seed data, the DROP INDEX statements and the queries themselves. The indexes
+are dropped without CONCURRENTLY, which takes an exclusive lock on the tables
+until the rollback, so run this against a development database.
+
+    python -m benchmarks.explain_report --seed-users 100000 --sessions-per-user 5
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.databases.postgresql_manager import postgres_db
+from app.databases.redis_manager import redis_manager
+from app.models.course import Course
+from app.models.course_registration import CourseRegistration
+from app.models.timetable import Timetable
+from app.models.user_session import UserSession
+from app.repositories.user_repository import UserRepository, _by_username_stmt
+from app.repositories.user_session_repository import UserSessionRepository
+from config import PostgreSQLConfig, RedisConfig
+
+HOT_PATH_INDEXES = [
+    "ix_users_username_lower",
+    "ix_user_sessions_user_id_last_active",
+    "ix_course_registrations_course_id",
+    "ix_course_registrations_student_id",
+    "ix_timetables_course_id",
+    "ix_timetables_classroom_id",
+    "ix_courses_semester",
+]
+
+
+async def _seed(session, users: int, sessions_per_user: int) -> tuple[str, int]:
+    """Inserts users and sessions with COPY; returns a sample username and user id."""
+    run = uuid.uuid4().hex[:8]
+    user_repo = UserRepository(session)
+    await user_repo.copy_insert([
+        {
+            "username": f"explain_{run}_{i}@example.com", "password": "x" * 60,
+            "first_name": "Explain", "last_name": str(i), "email": f"explain_{run}_{i}@example.com",
+        }
+        for i in range(users)
+    ])
+    user_ids = (await session.execute(
+        text("SELECT user_id FROM users WHERE username LIKE :prefix"), {"prefix": f"explain_{run}_%"}
+    )).scalars().all()
+
+    now = datetime.now(UTC)
+    await UserSessionRepository(session).copy_insert([
+        {
+            "user_id": user_id, "jti": uuid.uuid4().hex, "revoked": random.random() < 0.3,
+            "expires_at": now + timedelta(days=7), "last_active": now - timedelta(minutes=random.randint(0, 10_000)),
+        }
+        for user_id in user_ids
+        for _ in range(sessions_per_user)
+    ])
+    await session.execute(text("ANALYZE users"))
+    await session.execute(text("ANALYZE user_sessions"))
+    return f"explain_{run}_{users // 2}@example.com", user_ids[len(user_ids) // 2]
+
+
+def _queries(username: str, user_id: int) -> dict[str, object]:
+    session_repo = UserSessionRepository(None)
+    return {
+        "UserRepository.get_by_username": _by_username_stmt(False).params(username=username),
+        "UserSessionRepository.list_sessions_for_user (active)": session_repo._apply_filters_and_sort(
+            select(UserSession), {"user_id": user_id, "revoked": False}, ["-last_active", "-session_id"]
+        ).limit(11),
+        "UserSessionRepository.list_sessions_for_user (admin)": session_repo._apply_filters_and_sort(
+            select(UserSession), {"user_id": user_id}, ["-last_active", "-session_id"]
+        ).limit(11),
+        "registrations by course": select(CourseRegistration).where(CourseRegistration.course_id == 1),
+        "registrations by student": select(CourseRegistration).where(CourseRegistration.student_id == "S0001"),
+        "registrations by semester (export)": select(CourseRegistration.registration_id)
+            .join(Course, Course.course_id == CourseRegistration.course_id)
+            .where(Course.semester == "HK1-2025"),
+        "timetables by course": select(Timetable).where(Timetable.course_id == 1),
+        "timetables by classroom": select(Timetable).where(Timetable.classroom_id == 1),
+    }
+
+
+async def _explain(session, stmt) -> str:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    rows = (await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))).scalars().all()
+    return "\n".join(rows)
+
+
+async def main(seed_users: int, sessions_per_user: int) -> None:
+    await postgres_db.setup(PostgreSQLConfig.DATABASE_URI)
+    redis_manager.setup(RedisConfig.REDIS_HOST, RedisConfig.REDIS_PORT, RedisConfig.REDIS_DB)
+    try:
+        async with postgres_db.session_maker() as session:
+            username, user_id = "nobody@example.com", 0
+            if seed_users:
+                username, user_id = await _seed(session, seed_users, sessions_per_user)
+
+            queries = _queries(username, user_id)
+            after = {name: await _explain(session, stmt) for name, stmt in queries.items()}
+            for index in HOT_PATH_INDEXES:
+                await session.execute(text(f'DROP INDEX IF EXISTS "{index}"'))
+            before = {name: await _explain(session, stmt) for name, stmt in queries.items()}
+            await session.rollback()
+
+        for name in queries:
+            print(f"=== {name} ===")
+            print("--- before ---")
+            print(before[name])
+            print("--- after ---")
+            print(after[name])
+            print()
+    finally:
+        await redis_manager.close()
+        await postgres_db.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-users", type=int, default=0, help="Users to insert before explaining (rolled back).")
+    parser.add_argument("--sessions-per-user", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.seed_users, args.sessions_per_user))
@@ -0,0 +1,91 @@
+# benchmarks/login_benchmark.py
+"""
+Compares the database part of a successful login before and after the
+fused login statement: logins/sec and SQL statements per login.
+
+The bcrypt check is skipped by default, as it costs far more CPU than the
+database work and would hide the difference (pass --with-bcrypt to include
+it). Everything runs in one transaction that is rolled back.
+
+    python -m benchmarks.login_benchmark --logins 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from pydantic import SecretStr
+
+from app.databases.postgresql_manager import postgres_db
+from app.databases.query_stats import start_query_stats
+from app.databases.redis_manager import redis_manager
+from app.models.user_session import UserSession
+from app.repositories.user_repository import UserRepository
+from app.repositories.user_session_repository import UserSessionRepository
+from app.utils.password_utils import hash_password, verify_password
+from config import PostgreSQLConfig, RedisConfig
+
+PASSWORD = "Benchmark1"
+
+
+async def _legacy_login(user_repo: UserRepository, session_repo: UserSessionRepository,
+                        username: str, with_bcrypt: bool) -> None:
+    """The login path before the fused statement."""
+    user = await user_repo.get_by_username(username)
+    if with_bcrypt:
+        await verify_password(SecretStr(PASSWORD), user.password)
+    await user_repo.update_last_login(user.user_id)
+    session = UserSession(user_id=user.user_id, jti=uuid.uuid4().hex, expires_at=datetime.now(UTC) + timedelta(days=7))
+    session_repo.session.add(session)
+    await session_repo.session.flush()
+    await session_repo.session.refresh(session)
+
+
+async def _fused_login(user_repo: UserRepository, session_repo: UserSessionRepository,
+                       username: str, with_bcrypt: bool) -> None:
+    """The current login path (see AuthService.login); last_login is written behind."""
+    user = await user_repo.get_by_username(username)
+    if with_bcrypt:
+        await verify_password(SecretStr(PASSWORD), user.password)
+    await session_repo.open_session_for_login(
+        user_id=user.user_id, jti=uuid.uuid4().hex, expires_at=datetime.now(UTC) + timedelta(days=7),
+        ip_address="127.0.0.1", user_agent="login-benchmark"
+    )
+
+
+async def main(logins: int, with_bcrypt: bool) -> None:
+    await postgres_db.setup(PostgreSQLConfig.DATABASE_URI)
+    redis_manager.setup(RedisConfig.REDIS_HOST, RedisConfig.REDIS_PORT, RedisConfig.REDIS_DB)
+    try:
+        async with postgres_db.session_maker() as session:
+            user_repo = UserRepository(session)
+            session_repo = UserSessionRepository(session)
+            username = f"login_bench_{uuid.uuid4().hex[:8]}@example.com"
+            await user_repo.create({
+                "username": username, "password": hash_password(PASSWORD),
+                "first_name": "Login", "last_name": "Bench", "email": username, "is_active": True,
+            })
+
+            print(f"{'path':<10}{'logins/sec':>12}{'statements/login':>18}")
+            for name, login in (("legacy", _legacy_login), ("fused", _fused_login)):
+                stats = start_query_stats()
+                started = time.perf_counter()
+                for _ in range(logins):
+                    await login(user_repo, session_repo, username, with_bcrypt)
+                elapsed = time.perf_counter() - started
+                print(f"{name:<10}{logins / elapsed:>12,.0f}{stats.count / logins:>18.1f}")
+                session.expunge_all()  # Keep the identity map from growing between runs
+
+            await session.rollback()
+    finally:
+        await redis_manager.close()
+        await postgres_db.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--with-bcrypt", action="store_true", help="Include the bcrypt password check.")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.with_bcrypt))
@@ -0,0 +1,114 @@
+# benchmarks/revocation_memory_report.py
+"""
+Compares the Redis memory cost per revocation of the former layout (one
+string key with a TTL per revoked JTI / per user-wide revocation) with
+RevocationStore (per-expiry-minute hashes and a single user hash).
+
+Revoked access tokens are spread over --lifetime-minutes expiry minutes, as
+a steady stream of logouts would be. All keys are written under a throwaway
+namespace and deleted afterwards.
+
+    python -m benchmarks.revocation_memory_report --counts 10000 100000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.databases.redis_manager import redis_manager
+from app.utils.revocation_store import RevocationStore, LEGACY_JTI_KEY_PREFIX, LEGACY_USER_KEY_PREFIX
+from config import RedisConfig
+
+_PIPELINE_BATCH = 1000
+
+
+async def _memory_of(pattern: str) -> tuple[int, int]:
+    """(keys, bytes) of the keys matching `pattern`, from MEMORY USAGE."""
+    client = redis_manager.client
+    keys = [key async for key in client.scan_iter(match=pattern, count=1000)]
+    total = 0
+    for start in range(0, len(keys), _PIPELINE_BATCH):
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys[start:start + _PIPELINE_BATCH]:
+                pipe.memory_usage(key, samples=0)
+            total += sum(size or 0 for size in await pipe.execute())
+    return len(keys), total
+
+
+async def _delete(pattern: str) -> None:
+    client = redis_manager.client
+    keys = [key async for key in client.scan_iter(match=pattern, count=1000)]
+    for start in range(0, len(keys), _PIPELINE_BATCH):
+        await client.delete(*keys[start:start + _PIPELINE_BATCH])
+
+
+async def _legacy_jtis(namespace: str, count: int, lifetime_minutes: int) -> None:
+    client = redis_manager.client
+    for start in range(0, count, _PIPELINE_BATCH):
+        async with client.pipeline(transaction=False) as pipe:
+            for i in range(start, min(start + _PIPELINE_BATCH, count)):
+                ttl = 60 + (i % lifetime_minutes) * 60
+                pipe.setex(f"{namespace}{LEGACY_JTI_KEY_PREFIX}{uuid.uuid4()}", ttl, "revoked")
+            await pipe.execute()
+
+
+async def _bucketed_jtis(store: RevocationStore, count: int, lifetime_minutes: int) -> None:
+    now = time.time()
+    for start in range(0, count, _PIPELINE_BATCH):
+        await asyncio.gather(*(
+            store.revoke_jti(str(uuid.uuid4()), now + 60 + (i % lifetime_minutes) * 60)
+            for i in range(start, min(start + _PIPELINE_BATCH, count))
+        ))
+
+
+async def _legacy_users(namespace: str, count: int) -> None:
+    client = redis_manager.client
+    revoked_at = int(time.time())
+    for start in range(0, count, _PIPELINE_BATCH):
+        async with client.pipeline(transaction=False) as pipe:
+            for user_id in range(start, min(start + _PIPELINE_BATCH, count)):
+                pipe.set(f"{namespace}{LEGACY_USER_KEY_PREFIX}{user_id}", revoked_at, ex=31 * 24 * 3600)
+            await pipe.execute()
+
+
+async def _hashed_users(store: RevocationStore, count: int) -> None:
+    revoked_at = int(time.time())
+    for start in range(0, count, _PIPELINE_BATCH):
+        await asyncio.gather(*(
+            store.revoke_user(str(user_id), revoked_at)
+            for user_id in range(start, min(start + _PIPELINE_BATCH, count))
+        ))
+
+
+async def main(counts: list[int], lifetime_minutes: int) -> None:
+    redis_manager.setup(RedisConfig.REDIS_HOST, RedisConfig.REDIS_PORT, RedisConfig.REDIS_DB)
+    try:
+        print(f"{'layout':<34}{'revocations':>12}{'keys':>8}{'bytes':>14}{'bytes/revocation':>18}")
+        for count in counts:
+            namespace = f"memreport:{uuid.uuid4().hex[:8]}:"
+            store = RevocationStore(namespace)
+            runs = (
+                ("JTI string keys (former)", lambda: _legacy_jtis(namespace, count, lifetime_minutes)),
+                ("JTI minute buckets", lambda: _bucketed_jtis(store, count, lifetime_minutes)),
+                ("revoke-all string keys (former)", lambda: _legacy_users(namespace, count)),
+                ("revoke-all hash", lambda: _hashed_users(store, count)),
+            )
+            try:
+                for name, write in runs:
+                    await write()
+                    keys, size = await _memory_of(f"{namespace}*")
+                    print(f"{name:<34}{count:>12,}{keys:>8,}{size:>14,}{size / count:>18.1f}")
+                    await _delete(f"{namespace}*")
+            finally:
+                await _delete(f"{namespace}*")
+    finally:
+        await redis_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lifetime-minutes", type=int, default=15,
+                        help="Access token lifetime; revocations are spread over this many buckets.")
+    args = parser.parse_args()
+    asyncio.run(main(args.counts, args.lifetime_minutes))
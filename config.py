@@ -31,6 +31,21 @@ class Config:
 
     REFRESH_TOKEN_EXPIRE_DAYS = os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', DEFAULT_REFRESH_TOKEN_EXPIRE_DAYS)
 
+    # Per-worker cache of "not revoked" verdicts for access tokens. The TTL is how long a
+    # token revoked on another worker may still be accepted here; 0 disables the cache.
+    JWT_REVOCATION_CACHE_MS = int(os.getenv('JWT_REVOCATION_CACHE_MS', 0))
+    JWT_REVOCATION_CACHE_SIZE = int(os.getenv('JWT_REVOCATION_CACHE_SIZE', 10000))
+    # In-memory copy of all revocations per worker, kept current over Redis pub/sub, so
+    # token checks skip Redis entirely. Above MAX_ENTRIES the worker falls back to Redis.
+    JWT_REVOCATION_SNAPSHOT = os.getenv('JWT_REVOCATION_SNAPSHOT', 'true').lower() == 'true'
+    JWT_REVOCATION_SNAPSHOT_MAX_ENTRIES = int(os.getenv('JWT_REVOCATION_SNAPSHOT_MAX_ENTRIES', 1000000))
+
+    # Concurrent refreshes with the same token (several tabs) share one rotation: requests
+    # within the grace window get the same new token pair, waiting up to WAIT_MS for it.
+    # A grace of 0 disables coalescing.
+    AUTH_REFRESH_GRACE_SECONDS = int(os.getenv('AUTH_REFRESH_GRACE_SECONDS', 10))
+    AUTH_REFRESH_WAIT_MS = int(os.getenv('AUTH_REFRESH_WAIT_MS', 3000))
+
 class PostgreSQLConfig:
     DB_DRIVER = os.getenv('DB_DRIVER')
     DB_USER = os.getenv('DB_USER')
@@ -40,12 +55,74 @@ class PostgreSQLConfig:
     DB_PORT = os.getenv('DB_PORT')
     DATABASE_URI = f'{DB_DRIVER}://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
+    # Read replicas: comma-separated URIs. GET requests and explicitly read-only
+    # repositories read from a replica, except for users who wrote recently.
+    DB_REPLICA_URIS = [uri.strip() for uri in os.getenv('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+    DB_READ_YOUR_WRITES_SECONDS = int(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+
+    # Connection pool (per worker and per engine)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_POOL_WARMUP = os.getenv('DB_POOL_WARMUP', 'true').lower() == 'true'
+
+    # asyncpg driver settings
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 500))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 10000))
+    DB_JIT = os.getenv('DB_JIT', 'false').lower() == 'true'
+
+    # Per-request SQL instrumentation: a warning is logged when a request runs more
+    # statements than its budget, or the same statement N_PLUS_ONE_THRESHOLD times.
+    # DB_QUERY_BUDGETS overrides the default per route: "/api/v1/auth/login=6,/api/v1/users/me=2"
+    DB_QUERY_BUDGET = int(os.getenv('DB_QUERY_BUDGET', 20))
+    DB_QUERY_BUDGETS = {
+        route.strip(): int(budget)
+        for route, _, budget in (item.rpartition('=') for item in os.getenv('DB_QUERY_BUDGETS', '').split(','))
+        if route.strip()
+    }
+    DB_N_PLUS_ONE_THRESHOLD = int(os.getenv('DB_N_PLUS_ONE_THRESHOLD', 3))
+
+    # Slow query capture: statements slower than DB_SLOW_QUERY_MS are kept in a per-worker
+    # ring buffer (admin endpoint) and appended to DB_SLOW_QUERY_LOG_FILE (off by default).
+    # A sample of them (0.0-1.0) is EXPLAINed on a separate connection.
+    DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))
+    DB_SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv('DB_SLOW_QUERY_EXPLAIN_SAMPLE', 0.1))
+    DB_SLOW_QUERY_BUFFER = int(os.getenv('DB_SLOW_QUERY_BUFFER', 200))
+    DB_SLOW_QUERY_LOG_FILE = os.getenv('DB_SLOW_QUERY_LOG_FILE', '')
+
+    # Write-behind of informational columns (users.last_login): touches are batched per
+    # worker and flushed every DB_WRITE_BEHIND_INTERVAL seconds, when DB_WRITE_BEHIND_MAX_PENDING
+    # rows are waiting, and on shutdown.
+    DB_WRITE_BEHIND_INTERVAL = float(os.getenv('DB_WRITE_BEHIND_INTERVAL', 5))
+    DB_WRITE_BEHIND_MAX_PENDING = int(os.getenv('DB_WRITE_BEHIND_MAX_PENDING', 5000))
+
+    # Startup schema check against the Alembic head: 'strict' refuses to start
+    # when the database lags the code, 'warn' only logs, 'off' skips the check.
+    DB_SCHEMA_CHECK = os.getenv('DB_SCHEMA_CHECK', 'warn').lower()
+    # Create missing tables with create_all at startup (a no-op once `python -m app.databases.migrate`
+    # has run, as the Docker image does before starting the server)
+    DB_CREATE_TABLES = os.getenv('DB_CREATE_TABLES', 'true').lower() == 'true'
+
 class RedisConfig:
     """Redis configuration."""
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
     REDIS_DB = int(os.getenv('REDIS_DB', 0))
 
+    # In-process (L1) tier of the @cache decorator, per worker, in front of Redis (L2).
+    # Invalidations reach every worker over Redis pub/sub.
+    CACHE_L1_ENABLED = os.getenv('CACHE_L1_ENABLED', 'true').lower() == 'true'
+    CACHE_L1_MAX_ENTRIES = int(os.getenv('CACHE_L1_MAX_ENTRIES', 10000))
+
+    # Encoding of @cache entries in Redis: 'json' or 'msgpack' (needs the msgpack package),
+    # compressed with 'zlib', 'zstd' (needs zstandard) or 'none' from CACHE_COMPRESS_MIN_BYTES up.
+    # Existing entries stay readable after a change.
+    CACHE_CODEC = os.getenv('CACHE_CODEC', 'json').lower()
+    CACHE_COMPRESSION = os.getenv('CACHE_COMPRESSION', 'zlib').lower()
+    CACHE_COMPRESS_MIN_BYTES = int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 1024))
+
 class EmailConfig:
     # Email server configuration (for Gmail)
     EMAIL_HOST = "smtp.gmail.com"
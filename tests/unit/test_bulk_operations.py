@@ -0,0 +1,144 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.databases.lazy_session import PENDING_COUNT_TABLES
+from app.exceptions import BadRequest
+from app.models.user import User
+from app.repositories import BaseRepository
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+        self.rowcount = len(rows)
+
+    def all(self):
+        return self._rows
+
+
+class _RawConnection:
+    def __init__(self):
+        self.copied = None
+
+    async def copy_records_to_table(self, table_name, schema_name, columns, records):
+        self.copied = (table_name, columns, records)
+        return f"COPY {len(records)}"
+
+
+class _Connection:
+    def __init__(self, raw):
+        self._raw = raw
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=self._raw)
+
+
+class _Session:
+    """Records the statements and parameter sets it is given; echoes the parameters back as rows."""
+
+    def __init__(self):
+        self.info = {}
+        self.sync_session = SimpleNamespace(info={})
+        self.calls = []
+        self.raw = _RawConnection()
+
+    async def scalars(self, stmt, params=None, execution_options=None):
+        self.calls.append((stmt, params))
+        return _Result(list(params or []))
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((stmt, params))
+        return _Result(list(params or [None]))
+
+    async def connection(self):
+        return _Connection(self.raw)
+
+
+def _users(count, **extra):
+    return [{"username": f"u{i}@example.com", "first_name": "F", "last_name": "L", **extra} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_inserts_in_chunks_and_queues_count_invalidation():
+    session = _Session()
+    repo = BaseRepository(User, session)
+
+    created = await repo.bulk_create(_users(5), chunk_size=2)
+
+    assert [len(params) for _, params in session.calls] == [2, 2, 1]
+    assert len(created) == 5
+    assert session.info[PENDING_COUNT_TABLES] == {"users"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_without_returning_counts_rows():
+    session = _Session()
+    repo = BaseRepository(User, session)
+
+    assert await repo.bulk_create(_users(3), returning=False, chunk_size=2) == 3
+    assert await repo.bulk_create([], returning=False) == 0
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_keeps_the_last_row_per_conflict_key():
+    session = _Session()
+    repo = BaseRepository(User, session)
+    rows = _users(2) + [{"username": "u0@example.com", "first_name": "Second", "last_name": "L"}]
+
+    upserted = await repo.bulk_upsert(rows, conflict_columns=["username"])
+
+    assert len(upserted) == 2
+    (_, params), = session.calls
+    assert [row["first_name"] for row in params] == ["Second", "F"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_requires_the_conflict_columns():
+    repo = BaseRepository(User, _Session())
+
+    with pytest.raises(BadRequest):
+        await repo.bulk_upsert([{"first_name": "F"}], conflict_columns=["username"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_groups_rows_by_updated_columns():
+    session = _Session()
+    repo = BaseRepository(User, session)
+    items = [
+        {"user_id": 1, "first_name": "A"},
+        {"user_id": 2, "is_active": False},
+        {"user_id": 3, "first_name": "C"},
+        {"user_id": 4},  # Nothing to update
+    ]
+
+    await repo.bulk_update(items)
+
+    assert len(session.calls) == 2  # One UPDATE ... FROM (VALUES ...) per column set
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_requires_the_primary_key():
+    repo = BaseRepository(User, _Session())
+
+    with pytest.raises(BadRequest):
+        await repo.bulk_update([{"first_name": "A"}])
+
+
+@pytest.mark.asyncio
+async def test_copy_insert_fills_python_side_defaults():
+    session = _Session()
+    repo = BaseRepository(User, session)
+
+    assert await repo.copy_insert(_users(2, password="x")) == 2
+
+    table_name, columns, records = session.raw.copied
+    assert table_name == "users"
+    assert {"user_role", "is_active", "created_at", "last_login"} <= set(columns)
+    record = dict(zip(columns, records[0]))
+    assert record["user_role"] == "STUDENT"  # Enum members are copied by name
+    assert record["is_active"] is True
+    assert record["created_at"] is not None
+    assert session.sync_session.info["wrote"] is True
+    assert session.info[PENDING_COUNT_TABLES] == {"users"}
@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+
+from app.constants.cache_constants import CacheCompression
+from app.utils.cache_codec import CacheCodec
+from app.utils.tiered_cache import NegativeEntry
+
+
+class _Item(BaseModel):
+    id: int
+    name: str
+
+
+class _Page(BaseModel):
+    items: list[_Item]
+
+
+def test_codec_round_trips_and_compresses_large_values():
+    codec = CacheCodec()
+    codec.configure("json", "zlib", compress_min_bytes=256)
+    page = _Page(items=[_Item(id=i, name=f"user {i}") for i in range(100)])
+
+    raw = codec.encode(page, fresh_until=1000.5, delta=0.25)
+
+    assert len(raw) < len(page.model_dump_json())
+    assert raw[4] == CacheCompression.ZLIB
+    assert codec.decode(raw, _Page) == (page, 1000.5, 0.25)
+
+
+def test_codec_keeps_small_values_uncompressed():
+    codec = CacheCodec()
+    raw = codec.encode(_Item(id=1, name="a"), fresh_until=1000.0, delta=0.0)
+
+    assert raw[4] == CacheCompression.NONE
+    assert codec.decode(raw, _Item)[0] == _Item(id=1, name="a")
+
+
+def test_codec_reads_negative_and_former_text_entries():
+    codec = CacheCodec()
+    negative, _, _ = codec.decode(codec.encode(NegativeEntry(("KeyError", "gone")), 1000.0, 0.0), _Item)
+    assert negative.error == ("KeyError", "gone")
+
+    assert codec.decode(b'{"id": 1, "name": "a"}', _Item) == (_Item(id=1, name="a"), float("inf"), 0.0)
+    assert codec.decode(b'e1|1000.000|0.0100|{"id": 2, "name": "b"}', _Item) == (_Item(id=2, name="b"), 1000.0, 0.01)
+
+
+def test_codec_skips_entries_of_an_unknown_header_version():
+    codec = CacheCodec()
+    raw = bytearray(codec.encode(_Item(id=1, name="a"), 1000.0, 0.0))
+    raw[2] = 99
+
+    assert codec.decode(bytes(raw), _Item)[0] is None
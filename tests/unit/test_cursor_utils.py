@@ -0,0 +1,53 @@
+from datetime import datetime, UTC
+
+import pytest
+
+from app.constants.user_role_constants import UserRole
+from app.exceptions import BadRequest
+from app.utils.cursor_utils import encode_cursor, decode_cursor, coerce_cursor_values
+
+
+def test_cursor_round_trip_preserves_sort_key_types():
+    last_active = datetime(2025, 10, 1, 12, 30, tzinfo=UTC)
+    cursor = encode_cursor([last_active, UserRole.ADMIN, "alice", 42], "next")
+
+    values, direction = decode_cursor(cursor)
+
+    assert values == [last_active, "ADMIN", "alice", 42]
+    assert direction == "next"
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(["a/b+c?d", 1], "prev")
+    assert all(ch.isalnum() or ch in "-_" for ch in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(BadRequest):
+        decode_cursor(cursor)
+
+
+def test_cursor_values_are_checked_against_sort_column_types():
+    last_active = datetime(2025, 10, 1, 12, 30, tzinfo=UTC)
+    values = [last_active, "ADMIN", "alice", 42]
+
+    assert coerce_cursor_values(values, [datetime, UserRole, str, int]) == values
+
+
+@pytest.mark.parametrize("values", [
+    ["2025-10-01", 42],   # String where a datetime is expected
+    [datetime(2025, 10, 1, tzinfo=UTC), "42"],
+    [datetime(2025, 10, 1, tzinfo=UTC), True],
+    [datetime(2025, 10, 1, tzinfo=UTC), None],
+    [datetime(2025, 10, 1, tzinfo=UTC), {"$x": 1}],
+    [datetime(2025, 10, 1, tzinfo=UTC)],
+])
+def test_forged_cursor_values_are_rejected(values):
+    with pytest.raises(BadRequest):
+        coerce_cursor_values(values, [datetime, int])
+
+
+def test_unknown_enum_member_in_cursor_is_rejected():
+    with pytest.raises(BadRequest):
+        coerce_cursor_values(["ROOT"], [UserRole])
@@ -0,0 +1,29 @@
+from app.utils.jwt_utils import RevocationVerdictCache
+
+
+def test_verdict_cache_disabled_with_zero_ttl():
+    cache = RevocationVerdictCache(ttl_ms=0)
+    assert not cache.enabled
+
+
+def test_verdict_cache_forgets_revoked_tokens_and_users():
+    cache = RevocationVerdictCache(ttl_ms=60_000)
+    cache.remember_valid("jti-1", "7")
+    cache.remember_valid("jti-2", "7")
+    cache.remember_valid("jti-3", "8")
+
+    cache.forget("jti-1")
+    assert not cache.is_known_valid("jti-1")
+
+    cache.forget_user(7)
+    assert not cache.is_known_valid("jti-2")
+    assert cache.is_known_valid("jti-3")
+
+
+def test_verdict_cache_is_bounded():
+    cache = RevocationVerdictCache(ttl_ms=60_000, max_entries=2)
+    for jti in ("a", "b", "c"):
+        cache.remember_valid(jti, "1")
+
+    assert not cache.is_known_valid("a")
+    assert cache.is_known_valid("b") and cache.is_known_valid("c")
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from app.databases.lazy_session import (
+    COMMITTED_CACHE_TAGS, COMMITTED_COUNT_TABLES, PENDING_CACHE_TAGS, invalidate_on_commit,
+    invalidate_counts_on_commit, _commit_cache_tags, _drop_cache_tags
+)
+
+
+def test_cache_tags_wait_for_the_commit():
+    session = SimpleNamespace(info={})
+    invalidate_on_commit(session, "user:1", "account:a@example.com")
+    assert COMMITTED_CACHE_TAGS not in session.info
+
+    _commit_cache_tags(session)
+
+    assert session.info[COMMITTED_CACHE_TAGS] == {"user:1", "account:a@example.com"}
+    assert PENDING_CACHE_TAGS not in session.info
+
+
+def test_cache_tags_are_dropped_on_rollback():
+    session = SimpleNamespace(info={})
+    invalidate_on_commit(session, "user:1")
+    _commit_cache_tags(session)
+    invalidate_on_commit(session, "user:2")
+
+    _drop_cache_tags(session)
+    _commit_cache_tags(session)
+
+    assert session.info[COMMITTED_CACHE_TAGS] == {"user:1"}
+
+
+def test_count_invalidation_waits_for_the_commit():
+    session = SimpleNamespace(info={})
+    invalidate_counts_on_commit(session, "users")
+    assert COMMITTED_COUNT_TABLES not in session.info
+
+    _commit_cache_tags(session)
+    invalidate_counts_on_commit(session, "user_sessions")
+    _drop_cache_tags(session)
+
+    assert session.info[COMMITTED_COUNT_TABLES] == {"users"}
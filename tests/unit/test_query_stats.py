@@ -0,0 +1,24 @@
+from app.databases.query_stats import QueryStats, fingerprint
+
+
+def test_fingerprint_ignores_literals_and_placeholders():
+    first = fingerprint("SELECT * FROM users WHERE user_id = $1::INTEGER AND username = 'alice' LIMIT 10")
+    second = fingerprint("SELECT *  FROM users\nWHERE user_id = $7::INTEGER AND username = 'bob' LIMIT 1")
+
+    assert first == second == "SELECT * FROM users WHERE user_id = ?::INTEGER AND username = ? LIMIT ?"
+
+
+def test_fingerprint_collapses_in_and_values_lists():
+    assert fingerprint("SELECT 1 FROM t WHERE id IN ($1, $2, $3)") == fingerprint("SELECT 1 FROM t WHERE id IN ($1)")
+    assert fingerprint("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == "INSERT INTO t (a, b) VALUES (...)"
+
+
+def test_query_stats_flags_repeated_statements():
+    stats = QueryStats()
+    for user_id in range(3):
+        stats.record(f"SELECT * FROM addresses WHERE user_id = {user_id}", 0.001)
+    stats.record("SELECT * FROM users", 0.002)
+
+    assert stats.count == 4
+    assert stats.repeated(threshold=3) == {"SELECT * FROM addresses WHERE user_id = ?": 3}
+    assert stats.server_timing() == 'db;dur=5.0;desc="4 queries"'
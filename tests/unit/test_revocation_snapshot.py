@@ -0,0 +1,36 @@
+import time
+
+from app.utils.revocation_snapshot import RevocationSnapshot
+
+
+def test_snapshot_rejects_revoked_jtis_and_older_tokens_of_revoked_users():
+    snapshot = RevocationSnapshot()
+    later = time.time() + 60
+    snapshot.apply_jti("jti-1", later)
+    snapshot.apply_user("7", revoked_at=1_000, expires_at=later)
+
+    assert snapshot.check("jti-1", "8", issued_at=2_000) == "Token has been revoked."
+    assert snapshot.check("jti-2", "7", issued_at=999) == "Token has been revoked by a security event."
+    assert snapshot.check("jti-2", "7", issued_at=1_000) is None
+
+
+def test_snapshot_keeps_the_latest_revoke_all_and_prunes_expired_entries():
+    snapshot = RevocationSnapshot()
+    snapshot.apply_user("7", revoked_at=2_000, expires_at=time.time() + 60)
+    snapshot.apply_user("7", revoked_at=1_000, expires_at=time.time() + 60)
+    assert snapshot.check("jti", "7", issued_at=1_500) is not None
+
+    snapshot.apply_jti("expired", time.time() - 1)
+    snapshot._jtis["stale"] = time.time() - 1
+    snapshot.prune()
+    assert len(snapshot) == 1
+
+
+def test_full_snapshot_is_not_trusted():
+    snapshot = RevocationSnapshot()
+    snapshot.configure(enabled=True, max_entries=1)
+    snapshot.ready = True
+    snapshot.apply_jti("a", time.time() + 60)
+    snapshot.apply_jti("b", time.time() + 60)
+
+    assert not snapshot.ready
@@ -0,0 +1,61 @@
+import time
+
+from app.utils.tiered_cache import LocalCache, NegativeEntry, decode_entry, refresh_due
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == (True, 1)  # "a" is now the most recently used
+
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1) and cache.get("c") == (True, 3)
+    assert cache.evictions == 1
+
+
+def test_local_cache_expires_entries():
+    cache = LocalCache()
+    cache.set("a", 1, ttl=60)
+    cache._entries["a"] = (time.monotonic() - 1, 1, ())
+
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_local_cache_deletes_entries_by_tag():
+    cache = LocalCache()
+    cache.set("user_profile:1", "one", ttl=60, tags=("user:1",))
+    cache.set("user_courses:1", "courses", ttl=60, tags=("user:1",))
+    cache.set("user_profile:2", "two", ttl=60, tags=("user:2",))
+
+    cache.delete_tags(["user:1"])
+
+    assert len(cache) == 1
+    assert cache.get("user_profile:2") == (True, "two")
+    assert cache._tags == {"user:2": {"user_profile:2"}}
+
+
+def test_text_entries_decode_and_bare_payloads_stay_fresh():
+    assert decode_entry('e1|1000.500|0.2500|{"a": "x|y"}') == ('{"a": "x|y"}', 1000.5, 0.25)
+    assert decode_entry('{"a": 1}') == ('{"a": 1}', float("inf"), 0.0)
+
+
+def test_refresh_due_grows_likelier_near_expiry():
+    # -log(0.5) * delta * beta ~= 0.69s ahead of expiry
+    assert not refresh_due(now=98.0, fresh_until=100.0, delta=1.0, beta=1.0, rand=0.5)
+    assert refresh_due(now=99.5, fresh_until=100.0, delta=1.0, beta=1.0, rand=0.5)
+    assert not refresh_due(now=99.9, fresh_until=100.0, delta=1.0, beta=0.0, rand=0.5)
+    assert not refresh_due(now=99.9, fresh_until=100.0, delta=0.0, beta=1.0, rand=0.5)
+
+
+def test_negative_entries_round_trip_and_never_match_values():
+    missing = NegativeEntry.decode(NegativeEntry().encode())
+    assert missing is not None and missing.error is None
+
+    error = NegativeEntry.decode(NegativeEntry.from_exception(KeyError("nope")).encode())
+    assert error.error == ("KeyError", "'nope'")
+
+    assert NegativeEntry.decode('{"user_id": 1}') is None